@@ -1,18 +1,28 @@
 import os
-from fastapi import APIRouter, UploadFile, File, HTTPException, Depends
-from fastapi.responses import StreamingResponse
+from fastapi import APIRouter, UploadFile, File, Form, HTTPException, Depends
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from starlette.concurrency import run_in_threadpool
 from shutil import copyfileobj
 
 from app.schemas.models import (
     QuestionRequest,
     QuestionResponse,
-    UploadResponse
+    BatchQuestionRequest,
+    BatchQuestionResponse,
+    UploadResponse,
+    JobStatusResponse,
+    BulkIngestRequest
 )
 from app.ingestion.pipeline import IngestionPipeline
 from app.vectorstore.faiss_store import FAISSVectorStore
 from app.retrieval.retriever import SemanticRetriever
 from app.llm.pipeline import RAGPipeline
+from app.jobs.ingestion_jobs import IngestionJob, IngestionJobManager
+from app.jobs.bulk_ingest import BulkIngestor
+from app.config import settings
+from app.memory.session_store import SessionStore
 from app.security.auth import verify_api_key
+from app.monitoring.metrics import CONTENT_TYPE, QUERY_STAGES, REGISTRY
 
 
 router = APIRouter()
@@ -23,7 +33,8 @@ class AppContainer:
     vector_store: FAISSVectorStore = None
     retriever: SemanticRetriever = None
     rag_pipeline: RAGPipeline = None
-    sessions = {}
+    jobs: IngestionJobManager = None
+    sessions: SessionStore = SessionStore()
 
 
 container = AppContainer()
@@ -37,53 +48,172 @@ def health():
 @router.post("/upload", response_model=UploadResponse)
 async def upload_document(
     file: UploadFile = File(...),
+    tags: str = Form(""),
     api_key: str = Depends(verify_api_key)
 ):
 
+    if container.jobs is None:
+        raise HTTPException(status_code=400, detail="System not initialized.")
+
     try:
         save_path = f"data/documents/{file.filename}"
         os.makedirs("data/documents", exist_ok=True)
 
-        with open(save_path, "wb") as buffer:
-            copyfileobj(file.file, buffer)
-
-        chunks = container.ingestion.ingest(save_path)
+        def save_file():
+            with open(save_path, "wb") as buffer:
+                copyfileobj(file.file, buffer)
 
-        if container.vector_store.index is None:
-            container.vector_store.create_index(chunks)
-        else:
-            container.vector_store.add_documents(chunks)
+        await run_in_threadpool(save_file)
 
-        container.vector_store.save_index()
+        job = container.jobs.submit(
+            save_path,
+            tags=[tag.strip() for tag in tags.split(",") if tag.strip()]
+        )
 
         return UploadResponse(
-            message="Document processed successfully.",
-            total_chunks=len(chunks)
+            message="Document queued for processing.",
+            job_id=job.job_id,
+            status=job.status
         )
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post("/ingest/bulk", response_model=UploadResponse)
+def bulk_ingest(
+    request: BulkIngestRequest,
+    api_key: str = Depends(verify_api_key)
+):
+
+    if container.jobs is None:
+        raise HTTPException(status_code=400, detail="System not initialized.")
+
+    # Only directories below BULK_INGEST_ROOT may be read
+    root = os.path.realpath(settings.BULK_INGEST_ROOT)
+    directory = os.path.realpath(request.directory)
+
+    if os.path.commonpath([root, directory]) != root:
+        raise HTTPException(status_code=403, detail="Directory outside the ingestion root.")
+
+    if not os.path.isdir(directory):
+        raise HTTPException(status_code=404, detail="Directory not found.")
+
+    ingestor = BulkIngestor(
+        container.vector_store,
+        executor=container.jobs.parse_pool
+    )
+
+    job = container.jobs.submit_task(
+        IngestionJob(directory),
+        lambda job: ingestor.run(directory, job=job)
+    )
+
+    return UploadResponse(
+        message="Directory queued for processing.",
+        job_id=job.job_id,
+        status=job.status
+    )
+
+
+@router.get("/jobs/{job_id}", response_model=JobStatusResponse)
+def job_status(
+    job_id: str,
+    api_key: str = Depends(verify_api_key)
+):
+
+    job = container.jobs.get(job_id) if container.jobs else None
+
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found.")
+
+    return JobStatusResponse(**job.to_dict())
+
+
+@router.get("/documents")
+def list_documents(api_key: str = Depends(verify_api_key)):
+
+    if container.vector_store is None:
+        raise HTTPException(status_code=400, detail="System not initialized.")
+
+    return {"documents": container.vector_store.list_documents()}
+
+
+@router.delete("/documents/{doc_id}")
+async def delete_document(
+    doc_id: str,
+    api_key: str = Depends(verify_api_key)
+):
+
+    if container.vector_store is None:
+        raise HTTPException(status_code=400, detail="System not initialized.")
+
+    def delete():
+        removed = container.vector_store.delete_document(doc_id)
+
+        if removed:
+            container.vector_store.save_index()
+
+        return removed
+
+    removed = await run_in_threadpool(delete)
+
+    if not removed:
+        raise HTTPException(status_code=404, detail="Document not found.")
+
+    return {"message": "Document deleted.", "doc_id": doc_id, "chunks_removed": removed}
+
+
+def _filters(request):
+    if request.filters is None:
+        return None
+
+    return request.filters.model_dump(exclude_none=True) or None
+
+
 @router.post("/ask", response_model=QuestionResponse)
 async def ask_question(
     request: QuestionRequest,
     api_key: str = Depends(verify_api_key)
 ):
 
-    if container.retriever is None:
+    if container.rag_pipeline is None:
         raise HTTPException(status_code=400, detail="System not initialized.")
 
-    session_id = request.session_id
+    memory = container.sessions.get_or_create(request.session_id)
 
-    if session_id not in container.sessions:
-        container.sessions[session_id] = RAGPipeline(container.retriever)
+    result = await container.rag_pipeline.ask_async(
+        request.question,
+        memory,
+        filters=_filters(request)
+    )
 
-    pipeline = container.sessions[session_id]
+    return QuestionResponse(**result)
 
-    result = await pipeline.ask_async(request.question)
 
-    return QuestionResponse(**result)
+@router.post("/ask-batch", response_model=BatchQuestionResponse)
+async def ask_batch(
+    request: BatchQuestionRequest,
+    api_key: str = Depends(verify_api_key)
+):
+
+    if container.rag_pipeline is None:
+        raise HTTPException(status_code=400, detail="System not initialized.")
+
+    if len(request.questions) > settings.ASK_BATCH_MAX_QUESTIONS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {settings.ASK_BATCH_MAX_QUESTIONS} questions per batch."
+        )
+
+    results = await container.rag_pipeline.ask_batch(
+        request.questions,
+        filters=_filters(request)
+    )
+
+    return BatchQuestionResponse(
+        results=[QuestionResponse(**result) for result in results]
+    )
 
 
 @router.post("/ask-stream")
@@ -92,15 +222,17 @@ async def ask_stream(
     api_key: str = Depends(verify_api_key)
 ):
 
-    session_id = request.session_id
-
-    if session_id not in container.sessions:
-        container.sessions[session_id] = RAGPipeline(container.retriever)
+    if container.rag_pipeline is None:
+        raise HTTPException(status_code=400, detail="System not initialized.")
 
-    pipeline = container.sessions[session_id]
+    memory = container.sessions.get_or_create(request.session_id)
 
     async def token_generator():
-        async for token in pipeline.ask_stream(request.question):
+        async for token in container.rag_pipeline.ask_stream(
+            request.question,
+            memory,
+            filters=_filters(request)
+        ):
             yield token
 
     return StreamingResponse(
@@ -115,11 +247,44 @@ async def clear_memory(
     api_key: str = Depends(verify_api_key)
 ):
 
-    session_id = request.session_id
+    memory = container.sessions.get(request.session_id)
 
-    if session_id in container.sessions:
-        container.sessions[session_id].memory.clear()
+    if memory is not None:
+        memory.clear()
 
     return {"message": "Conversation memory cleared."}
 
+
+@router.get("/metrics", response_class=PlainTextResponse)
+def metrics():
+    # Prometheus text format; latency histograms only, left open like /health for scrapers
+    return PlainTextResponse(REGISTRY.render(), media_type=CONTENT_TYPE)
+
+
+@router.get("/sessions/metrics")
+def session_metrics(api_key: str = Depends(verify_api_key)):
+    return container.sessions.metrics()
+
+
+@router.get("/embeddings/metrics")
+def embedding_metrics(api_key: str = Depends(verify_api_key)):
+    stats = container.vector_store.embeddings.stats()
+
+    cache = container.vector_store.embedding_cache
+    stats["cache"] = cache.stats() if cache is not None else None
+
+    return stats
+
+
+@router.get("/retrieval/metrics")
+def retrieval_metrics(api_key: str = Depends(verify_api_key)):
+    return {
+        "index": container.vector_store.index_info(),
+        "cache": container.retriever.cache_stats(),
+        "rerank": container.retriever.rerank_stats(),
+        "answers": container.rag_pipeline.answer_cache_stats(),
+        "coalescing": container.rag_pipeline.coalescing_stats(),
+        "stages": QUERY_STAGES.summary(),
+    }
+
 # app/api/routes.py
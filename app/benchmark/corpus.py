@@ -0,0 +1,132 @@
+import hashlib
+import os
+from typing import Iterator, List, Tuple
+
+import numpy as np
+from langchain_core.documents import Document
+
+_ONSETS = ["b", "c", "d", "f", "g", "l", "m", "n", "p", "r", "s", "t", "v", "pr", "st", "tr", "cl"]
+_VOWELS = ["a", "e", "i", "o", "u", "ai", "ea", "io"]
+_CODAS = ["", "n", "r", "s", "t", "l", "m", "nt", "st"]
+
+
+class SyntheticCorpus:
+    """
+    Deterministic contract-like text for benchmarks.
+    Chunk i is generated from (seed, i), so any chunk can be
+    regenerated to build queries with a known relevant chunk.
+    Word frequencies follow a Zipf distribution, like real text.
+    """
+
+    def __init__(
+        self,
+        seed: int = 0,
+        vocabulary_size: int = 5000,
+        chunk_words: int = 120,
+        chunks_per_page: int = 4,
+        pages_per_document: int = 10
+    ):
+        self.seed = seed
+        self.chunk_words = chunk_words
+        self.chunks_per_page = chunks_per_page
+        self.pages_per_document = pages_per_document
+
+        rng = np.random.default_rng(seed)
+        words = set()
+
+        while len(words) < vocabulary_size:
+            syllables = rng.integers(1, 4)
+            words.add("".join(
+                _ONSETS[rng.integers(len(_ONSETS))]
+                + _VOWELS[rng.integers(len(_VOWELS))]
+                + _CODAS[rng.integers(len(_CODAS))]
+                for _ in range(syllables)
+            ))
+
+        self.vocabulary = sorted(words)
+
+        weights = 1.0 / np.arange(1, vocabulary_size + 1)
+        self._weights = weights / weights.sum()
+
+    def chunk_text(self, i: int) -> str:
+        rng = np.random.default_rng((self.seed, i))
+        ids = rng.choice(len(self.vocabulary), size=self.chunk_words, p=self._weights)
+        return " ".join(self.vocabulary[j] for j in ids)
+
+    def location(self, i: int) -> Tuple[str, int]:
+        """
+        (document id, page) of chunk i.
+        """
+        per_document = self.chunks_per_page * self.pages_per_document
+        document, offset = divmod(i, per_document)
+        return f"synthetic-{document:06d}.pdf", offset // self.chunks_per_page + 1
+
+    def documents(self, count: int, batch_size: int = 256, start: int = 0) -> Iterator[List[Document]]:
+        """
+        Chunks start..start+count as tagged Documents, in batches.
+        """
+        for offset in range(start, start + count, batch_size):
+            batch = []
+
+            for i in range(offset, min(offset + batch_size, start + count)):
+                doc_id, page = self.location(i)
+                batch.append(Document(
+                    page_content=self.chunk_text(i),
+                    metadata={
+                        "source": doc_id,
+                        "doc_id": doc_id,
+                        "page": page,
+                        "content_hash": hashlib.sha256(doc_id.encode("utf-8")).hexdigest(),
+                        "chunk": i,
+                    }
+                ))
+
+            yield batch
+
+    def queries(self, count: int, chunks: int, words: int = 12) -> List[Tuple[str, int]]:
+        """
+        (query, relevant chunk) pairs: a run of words taken from a random chunk.
+        """
+        # A stream distinct from every chunk's (seed, i)
+        rng = np.random.default_rng((self.seed, 1 << 40))
+        pairs = []
+
+        for i in rng.integers(0, chunks, size=count).tolist():
+            text = self.chunk_text(i).split()
+            begin = int(rng.integers(0, max(1, len(text) - words)))
+            pairs.append((" ".join(text[begin:begin + words]), i))
+
+        return pairs
+
+    def write_pdfs(self, directory: str, files: int, pages: int) -> List[str]:
+        """
+        PDF files for end-to-end ingestion (load + split) benchmarks.
+        """
+        import fitz
+
+        os.makedirs(directory, exist_ok=True)
+        paths = []
+        chunk = 0
+
+        for f in range(files):
+            path = os.path.join(directory, f"synthetic-{f:04d}.pdf")
+            pdf = fitz.open()
+
+            for _ in range(pages):
+                text = "\n\n".join(self.chunk_text(chunk + j) for j in range(self.chunks_per_page))
+                chunk += self.chunks_per_page
+
+                page = pdf.new_page()
+
+                # insert_textbox writes nothing when the text overflows the box
+                for fontsize in (7, 6, 5, 4):
+                    if page.insert_textbox(page.rect + (36, 36, -36, -36), text, fontsize=fontsize) >= 0:
+                        break
+
+            pdf.save(path)
+            pdf.close()
+            paths.append(path)
+
+        return paths
+
+# app/benchmark/corpus.py
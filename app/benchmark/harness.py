@@ -0,0 +1,229 @@
+import os
+import platform
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from app.benchmark.corpus import SyntheticCorpus
+from app.benchmark.stats import latency_summary
+from app.benchmark.stubs import HashingEmbeddingEngine
+from app.ingestion.pipeline import IngestionPipeline
+from app.monitoring.metrics import resident_memory_bytes
+from app.retrieval.retriever import SemanticRetriever
+from app.vectorstore.faiss_store import FAISSVectorStore
+from app.vectorstore.index_factory import IndexConfig
+
+
+def directory_size(path: str) -> int:
+    total = 0
+
+    for dirpath, _, filenames in os.walk(path):
+        for filename in filenames:
+            total += os.path.getsize(os.path.join(dirpath, filename))
+
+    return total
+
+
+def rss_mb() -> Optional[float]:
+    rss = resident_memory_bytes()
+    return round(rss / 2 ** 20, 1) if rss is not None else None
+
+
+def environment() -> Dict[str, str]:
+    import faiss
+
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "processor": platform.processor() or platform.machine(),
+        "cpus": str(os.cpu_count()),
+        "numpy": np.__version__,
+        "faiss": getattr(faiss, "__version__", "unknown"),
+    }
+
+
+class RetrievalBenchmark:
+    """
+    Offline benchmark of ingestion and retrieval on a synthetic corpus.
+    Embeddings come from HashingEmbeddingEngine, so the numbers cover
+    this repo's own code paths (parsing, splitting, indexing, search),
+    not model inference; no LLM is involved.
+    """
+
+    def __init__(
+        self,
+        workdir: str,
+        chunks: int = 10000,
+        dimension: int = 384,
+        index_config: Optional[IndexConfig] = None,
+        batch_size: int = 256,
+        seed: int = 0,
+        chunk_words: int = 120,
+        top_k: int = 4,
+        mode: str = "vector"
+    ):
+        # Stores and files of an earlier run would be mixed into the results
+        if os.path.isdir(workdir) and os.listdir(workdir):
+            raise ValueError(f"Benchmark workdir is not empty: {workdir}")
+
+        self.workdir = workdir
+        self.chunks = chunks
+        self.batch_size = batch_size
+        self.top_k = top_k
+        self.mode = mode
+        self.index_config = index_config or IndexConfig()
+
+        self.corpus = SyntheticCorpus(seed=seed, chunk_words=chunk_words)
+        self.embedder = HashingEmbeddingEngine(dimension=dimension, seed=seed)
+        self.store: Optional[FAISSVectorStore] = None
+
+    def ingestion(self, files: int, pages: int) -> Dict:
+        """
+        IngestionPipeline.ingest (load + split) over generated PDFs.
+        """
+        paths = self.corpus.write_pdfs(os.path.join(self.workdir, "files"), files, pages)
+        pipeline = IngestionPipeline()
+
+        chunks = 0
+        per_file = []
+        start = time.perf_counter()
+
+        for path in paths:
+            file_start = time.perf_counter()
+            chunks += len(pipeline.ingest(path))
+            per_file.append(time.perf_counter() - file_start)
+
+        elapsed = time.perf_counter() - start
+
+        return {
+            "files": files,
+            "pages": files * pages,
+            "chunks": chunks,
+            "bytes": sum(os.path.getsize(path) for path in paths),
+            "seconds": round(elapsed, 3),
+            "pages_per_second": round(files * pages / elapsed, 1) if elapsed else 0.0,
+            "chunks_per_second": round(chunks / elapsed, 1) if elapsed else 0.0,
+            "per_file": latency_summary(per_file),
+        }
+
+    def embedding(self, sample: int = 10000) -> Dict:
+        """
+        Stub embedder throughput; a baseline for the indexing numbers.
+        """
+        texts = [
+            doc.page_content
+            for batch in self.corpus.documents(min(sample, self.chunks), self.batch_size)
+            for doc in batch
+        ]
+
+        start = time.perf_counter()
+        for offset in range(0, len(texts), self.batch_size):
+            self.embedder.embed(texts[offset:offset + self.batch_size])
+        elapsed = time.perf_counter() - start
+
+        return {
+            "model": self.embedder.model_name,
+            "texts": len(texts),
+            "seconds": round(elapsed, 3),
+            "texts_per_second": round(len(texts) / elapsed, 1) if elapsed else 0.0,
+        }
+
+    def index_build(self, lexical: bool = False) -> Dict:
+        """
+        Incremental build through index_documents, then save_index.
+        """
+        import faiss
+
+        rss_before = rss_mb()
+
+        self.store = FAISSVectorStore(
+            persist_path=os.path.join(self.workdir, "index"),
+            embeddings=self.embedder,
+            index_config=self.index_config,
+            lexical_index=lexical
+        )
+
+        start = time.perf_counter()
+        for batch in self.corpus.documents(self.chunks, self.batch_size):
+            self.store.index_documents(batch)
+        added = time.perf_counter()
+
+        self.store.wait_for_promotion()
+        promoted = time.perf_counter()
+
+        self.store.save_index()
+        saved = time.perf_counter()
+
+        index = self.store.index.index
+
+        return {
+            "chunks": self.chunks,
+            "index_type": self.store.index_info()["type"],
+            "add_seconds": round(added - start, 3),
+            "promotion_wait_seconds": round(promoted - added, 3),
+            "save_seconds": round(saved - promoted, 3),
+            "total_seconds": round(saved - start, 3),
+            "chunks_per_second": round(self.chunks / (added - start), 1) if added > start else 0.0,
+            "disk_bytes": directory_size(self.store.persist_path),
+            "index_bytes": int(faiss.serialize_index(index).nbytes),
+            "rss_mb_before": rss_before,
+            "rss_mb_after": rss_mb(),
+        }
+
+    def retrieval(
+        self,
+        queries: int = 1000,
+        concurrency: Sequence[int] = (1, 4, 16),
+        nprobe: Optional[int] = None,
+        ef_search: Optional[int] = None
+    ) -> List[Dict]:
+        """
+        SemanticRetriever.retrieve latency and QPS per concurrency level.
+        Query and result caches are off, so every call embeds and searches.
+        """
+        if self.store is None:
+            raise ValueError("Build the index first.")
+
+        pairs = self.corpus.queries(queries, self.chunks)
+        results = []
+
+        for workers in concurrency:
+            retriever = SemanticRetriever(
+                self.store,
+                top_k=self.top_k,
+                score_threshold=float("inf"),
+                query_cache_size=0,
+                result_cache_size=0,
+                nprobe=nprobe,
+                ef_search=ef_search,
+                mode=self.mode,
+                workers=1
+            )
+
+            def run(pair):
+                query, expected = pair
+                start = time.perf_counter()
+                docs = retriever.retrieve(query)
+                elapsed = time.perf_counter() - start
+                return elapsed, any(doc.metadata.get("chunk") == expected for doc in docs)
+
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                start = time.perf_counter()
+                measured = list(pool.map(run, pairs))
+                wall = time.perf_counter() - start
+
+            retriever.shutdown()
+
+            results.append({
+                "concurrency": workers,
+                "queries": len(pairs),
+                "qps": round(len(pairs) / wall, 1) if wall else 0.0,
+                "hit_rate_at_k": round(sum(hit for _, hit in measured) / len(pairs), 3),
+                **latency_summary([elapsed for elapsed, _ in measured]),
+            })
+
+        return results
+
+# app/benchmark/harness.py
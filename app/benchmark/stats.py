@@ -0,0 +1,24 @@
+from typing import Dict, Sequence
+
+import numpy as np
+
+
+def latency_summary(seconds: Sequence[float]) -> Dict[str, float]:
+    """
+    p50/p95/p99/mean/max in milliseconds.
+    """
+    if not len(seconds):
+        return {"p50_ms": 0.0, "p95_ms": 0.0, "p99_ms": 0.0, "mean_ms": 0.0, "max_ms": 0.0}
+
+    ms = np.asarray(seconds, dtype="float64") * 1000
+    p50, p95, p99 = np.percentile(ms, [50, 95, 99])
+
+    return {
+        "p50_ms": round(float(p50), 3),
+        "p95_ms": round(float(p95), 3),
+        "p99_ms": round(float(p99), 3),
+        "mean_ms": round(float(ms.mean()), 3),
+        "max_ms": round(float(ms.max()), 3),
+    }
+
+# app/benchmark/stats.py
@@ -0,0 +1,86 @@
+import time
+import zlib
+from threading import Lock
+from typing import Dict, List
+
+import numpy as np
+
+from app.vectorstore.embeddings import EmbeddingEngine
+
+
+class HashingEmbeddingEngine(EmbeddingEngine):
+    """
+    Offline stand-in for the sentence-transformers engine.
+    A text's vector is the normalized sum of fixed random vectors of its
+    (hashed) words, so texts sharing words land close together and
+    retrieval quality on a synthetic corpus stays measurable.
+    Deterministic for a given seed; no model download.
+    """
+
+    def __init__(
+        self,
+        dimension: int = 384,
+        buckets: int = 16384,
+        seed: int = 0,
+        batch_size: int = 256
+    ):
+        # The model-loading parent constructor is deliberately not called
+        self.model_name = f"stub-hashing-{dimension}"
+        self.batch_size = batch_size
+        self.normalize = True
+        self.num_workers = 1
+        self.model = None
+
+        self._dimension = dimension
+        self._buckets = buckets
+        self._table = np.random.default_rng(seed).standard_normal((buckets, dimension)).astype("float32")
+        self._word_ids: Dict[str, int] = {}
+
+        self._pool = None
+        self._pool_lock = Lock()
+
+        self._stats_lock = Lock()
+        self._total_texts = 0
+        self._total_seconds = 0.0
+        self._last_throughput = 0.0
+
+    @property
+    def dimension(self) -> int:
+        return self._dimension
+
+    def _word_id(self, word: str) -> int:
+        word_id = self._word_ids.get(word)
+
+        if word_id is None:
+            word_id = zlib.crc32(word.encode("utf-8")) % self._buckets
+            self._word_ids[word] = word_id
+
+        return word_id
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        if not texts:
+            return np.zeros((0, self._dimension), dtype="float32")
+
+        start = time.perf_counter()
+
+        ids = []
+        offsets = []
+
+        for text in texts:
+            offsets.append(len(ids))
+            words = text.casefold().split() or [""]
+            ids.extend(self._word_id(word) for word in words)
+
+        vectors = np.add.reduceat(self._table[np.asarray(ids)], np.asarray(offsets), axis=0)
+
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        vectors /= np.maximum(norms, 1e-12)
+
+        self._record(len(texts), time.perf_counter() - start)
+
+        return vectors.astype("float32", copy=False)
+
+    def close(self) -> None:
+        pass
+
+# app/benchmark/stubs.py
@@ -5,6 +5,7 @@ class Settings(BaseSettings):
 
     # Application
     APP_NAME: str = "RAG Document Assistant"
+    LOG_LEVEL: str = "INFO"   # DEBUG logs per-hit retrieval scores
     ENVIRONMENT: str = "development"
 
     # Security
@@ -12,18 +13,66 @@ class Settings(BaseSettings):
 
     # Vector Store
     VECTORSTORE_PATH: str = "data/vectorstore"
+    VECTORSTORE_MAX_SEGMENTS: int = 16   # compact in the background beyond this
+    VECTORSTORE_SNAPSHOT_INTERVAL: int = 100000
+    VECTORSTORE_MMAP: bool = False   # memory-map the index snapshot, read documents lazily; a stale snapshot is rewritten on load
+    VECTORSTORE_INDEX_TYPE: str = "auto"   # auto | flat | ivf_flat | ivf_pq | hnsw
+    VECTORSTORE_AUTO_ANN_THRESHOLD: int = 100000   # auto: flat -> ivf_flat beyond this
+    VECTORSTORE_NLIST: int = 0   # 0 picks ~4*sqrt(n)
+    VECTORSTORE_PQ_M: int = 16
+    VECTORSTORE_HNSW_M: int = 32
+    VECTORSTORE_NPROBE: int = 16
+    VECTORSTORE_EF_SEARCH: int = 64
     EMBEDDING_MODEL: str = "sentence-transformers/all-MiniLM-L6-v2"
+    EMBEDDING_BATCH_SIZE: int = 64
+    EMBEDDING_NORMALIZE: bool = False
+    EMBEDDING_NUM_WORKERS: int = 1   # >1 fans out across a process pool
+    EMBEDDING_NUM_THREADS: int = 0   # 0 keeps the torch default
+    EMBEDDING_CACHE_ENABLED: bool = True
+    EMBEDDING_CACHE_PATH: str = "data/embedding_cache.sqlite3"
+    EMBEDDING_CACHE_MAX_ENTRIES: int = 500000
 
     # Ingestion
     CHUNK_SIZE: int = 1000
     CHUNK_OVERLAP: int = 200
+    INGESTION_PARSE_WORKERS: int = 2
+    INGESTION_EMBED_WORKERS: int = 2
+    INGESTION_BATCH_SIZE: int = 64
+    INGESTION_MAX_JOBS: int = 1000
+    INGESTION_STREAMING: bool = True
+    INGESTION_MAX_IN_FLIGHT_BATCHES: int = 4
+    INGESTION_FLUSH_CHUNKS: int = 10000
+    BULK_INGEST_ROOT: str = "data"   # /ingest/bulk only reads below this directory
+    BULK_INGEST_MANIFEST_DIR: str = "data/ingest_manifests"
 
     # Retrieval
     TOP_K: int = 4
     SCORE_THRESHOLD: float = 3.0
+    RETRIEVAL_MODE: str = "vector"   # vector | hybrid (BM25 + vector, RRF-fused)
+    LEXICAL_INDEX_ENABLED: bool = False   # BM25 index; always built when RETRIEVAL_MODE is hybrid
+    HYBRID_CANDIDATES: int = 20   # per-ranker candidates fused in hybrid mode
+    RRF_K: int = 60
+    RERANK_ENABLED: bool = False
+    RERANK_MODEL: str = "cross-encoder/ms-marco-MiniLM-L-6-v2"
+    RERANK_CANDIDATES: int = 20   # fetched, then cut back to TOP_K
+    RERANK_BATCH_SIZE: int = 16
+    RERANK_TIME_BUDGET_MS: float = 300   # beyond it, unscored candidates keep vector order
+    CONTEXT_MAX_TOKENS: int = 3000   # prompt budget: instructions + context + history + question
+    CONTEXT_CHARS_PER_TOKEN: float = 4.0
+    ASK_BATCH_MAX_QUESTIONS: int = 64
+    ASK_BATCH_MAX_CONCURRENCY: int = 4   # concurrent LLM calls per /ask-batch
+    COALESCE_REQUESTS: bool = True   # single-flight identical in-flight questions
+    ANSWER_CACHE_ENABLED: bool = True
+    ANSWER_CACHE_SIZE: int = 1024
+    ANSWER_CACHE_TTL_SECONDS: int = 3600
+    ANSWER_CACHE_SIMILARITY: float = 0.95   # cosine between question embeddings
+    RETRIEVAL_WORKERS: int = 4   # threads for query embedding + index search
+    RETRIEVAL_MAX_CONCURRENCY: int = 16   # retrievals queued or running; more wait on the event loop
+    QUERY_EMBEDDING_CACHE_SIZE: int = 1024
+    RETRIEVAL_CACHE_SIZE: int = 1024
 
     # LLM Provider Mode
-    LLM_PROVIDER: str = "auto"   # auto | gemini | ollama
+    LLM_PROVIDER: str = "auto"   # auto | gemini | ollama | stub
 
     # Gemini
     GEMINI_API_KEY: str | None = None
@@ -33,6 +82,17 @@ class Settings(BaseSettings):
     OLLAMA_MODEL: str = "llama3.1:8b"
     OLLAMA_BASE_URL: str = "http://localhost:11434"
 
+    # Stub LLM (LLM_PROVIDER=stub)
+    STUB_LLM_FIRST_TOKEN_MS: float = 200
+    STUB_LLM_TOKENS_PER_SECOND: float = 50
+    STUB_LLM_MAX_TOKENS: int = 64
+
+    # Sessions
+    SESSION_MAX_COUNT: int = 10000
+    SESSION_TTL_SECONDS: int = 3600
+    SESSION_HISTORY_MAX_MESSAGES: int = 6
+    SESSION_EVICTION_INTERVAL_SECONDS: int = 60
+
     # File Upload
     MAX_FILE_SIZE_MB: int = 10
     ALLOWED_EXTENSIONS: list[str] = [".pdf", ".docx"]
@@ -1,6 +1,95 @@
-from typing import List, Dict
+import json
+import math
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Optional
 from statistics import mean
+from langchain_core.documents import Document
 from app.retrieval.retriever import SemanticRetriever
+from app.benchmark.stats import latency_summary
+
+
+class LabelledQuestion:
+    """
+    A question with the chunks that answer it. Each relevant item
+    is a dict matched against retrieved chunks on the keys it has:
+    - "source": document id or file name
+    - "page": page number
+    - "text": substring of the chunk (case-insensitive)
+    """
+
+    __slots__ = ("question", "relevant")
+
+    def __init__(self, question: str, relevant: List[Dict]):
+        self.question = question
+        self.relevant = relevant
+
+    @staticmethod
+    def matches(doc: Document, item: Dict) -> bool:
+        metadata = doc.metadata
+
+        if "source" in item:
+            sources = {
+                str(metadata.get("doc_id")),
+                os.path.basename(str(metadata.get("source") or "")),
+            }
+            if str(item["source"]) not in sources:
+                return False
+
+        if "page" in item and str(metadata.get("page")) != str(item["page"]):
+            return False
+
+        if "text" in item and str(item["text"]).casefold() not in doc.page_content.casefold():
+            return False
+
+        return True
+
+
+def load_dataset(path: str) -> List[LabelledQuestion]:
+    """
+    JSONL (one {"question", "relevant": [...]} per line) or a JSON list.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        if path.endswith(".jsonl"):
+            records = [json.loads(line) for line in f if line.strip()]
+        else:
+            records = json.load(f)
+
+    return [LabelledQuestion(record["question"], record["relevant"]) for record in records]
+
+
+def ranking_metrics(docs: List[Document], relevant: List[Dict], k: int) -> Dict[str, float]:
+    """
+    recall@k, hit@k, reciprocal rank and nDCG@k (binary gains) for one ranking.
+    A chunk counts once, for the first relevant item it matches that
+    no earlier chunk matched.
+    """
+    found = set()
+    gains = []
+
+    for doc in docs[:k]:
+        gain = 0
+
+        for i, item in enumerate(relevant):
+            if i not in found and LabelledQuestion.matches(doc, item):
+                found.add(i)
+                gain = 1
+                break
+
+        gains.append(gain)
+
+    first = next((rank for rank, gain in enumerate(gains, start=1) if gain), None)
+
+    dcg = sum(gain / math.log2(rank + 1) for rank, gain in enumerate(gains, start=1))
+    idcg = sum(1 / math.log2(rank + 1) for rank in range(1, min(len(relevant), k) + 1))
+
+    return {
+        "recall": len(found) / len(relevant) if relevant else 0.0,
+        "hit": 1.0 if found else 0.0,
+        "reciprocal_rank": 1.0 / first if first else 0.0,
+        "ndcg": dcg / idcg if idcg else 0.0,
+    }
 
 
 class RetrievalEvaluator:
@@ -10,6 +99,9 @@ class RetrievalEvaluator:
     - Hit Rate
     - Average Similarity Score
     - Empty Retrieval Rate
+
+    With a labelled dataset (evaluate_labelled): recall@k, MRR,
+    nDCG@k and per-query latency, queries run in parallel.
     """
 
     def __init__(self, retriever: SemanticRetriever):
@@ -28,11 +120,10 @@ class RetrievalEvaluator:
         empty_count = 0
         similarity_scores = []
 
-        for question in questions:
-
-            # Retrieve with scores
-            results = self.retriever.retrieve_with_scores(question)
+        # One embedding call and one index search for all questions
+        batch = self.retriever.retrieve_batch_with_scores(questions)
 
+        for results in batch:
             if not results:
                 empty_count += 1
                 continue
@@ -53,4 +144,49 @@ class RetrievalEvaluator:
             "empty_retrieval_rate": round(empty_rate, 3),
             "average_similarity_score": round(avg_score, 3),
         }
+
+    def evaluate_labelled(
+        self,
+        dataset: List[LabelledQuestion],
+        k: Optional[int] = None,
+        workers: int = 4
+    ) -> Dict[str, float]:
+        """
+        recall, hit rate and nDCG at k (default: the retriever's top_k),
+        MRR, and per-query latency.
+        Each question is retrieved on its own, as /ask does.
+        """
+        if not dataset:
+            raise ValueError("No questions provided for evaluation.")
+
+        k = self.retriever.top_k if k is None else k
+
+        def run(item: LabelledQuestion):
+            start = time.perf_counter()
+            results = self.retriever.retrieve_with_scores(item.question)
+            elapsed = time.perf_counter() - start
+
+            docs = [doc for doc, _ in results]
+            return ranking_metrics(docs, item.relevant, k), elapsed, not docs
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+            measured = list(pool.map(run, dataset))
+        wall = time.perf_counter() - start
+
+        scores = [metrics for metrics, _, _ in measured]
+        total = len(dataset)
+
+        return {
+            "total_questions": total,
+            "k": k,
+            "recall": round(mean(m["recall"] for m in scores), 4),
+            "hit_rate": round(mean(m["hit"] for m in scores), 4),
+            "mrr": round(mean(m["reciprocal_rank"] for m in scores), 4),
+            "ndcg": round(mean(m["ndcg"] for m in scores), 4),
+            "empty_retrieval_rate": round(sum(empty for _, _, empty in measured) / total, 3),
+            "qps": round(total / wall, 2) if wall else 0.0,
+            **latency_summary([elapsed for _, elapsed, _ in measured]),
+        }
+
 # app/evaluation/evaluator.py
@@ -0,0 +1,176 @@
+import itertools
+import os
+import time
+from typing import Dict, List, Optional, Sequence
+
+from app.evaluation.evaluator import LabelledQuestion, RetrievalEvaluator
+from app.ingestion.loader import DocumentLoader
+from app.ingestion.pipeline import parse_document
+from app.retrieval.retriever import SemanticRetriever
+from app.vectorstore.embeddings import EmbeddingEngine
+from app.vectorstore.faiss_store import FAISSVectorStore
+from app.vectorstore.index_factory import IndexConfig
+from app.config import settings
+
+
+def pareto_front(rows: List[Dict], quality: str = "recall", latency: str = "p95_ms") -> List[Dict]:
+    """
+    Mark rows that no other row beats on both quality (higher)
+    and latency (lower); returns the rows sorted by latency.
+    """
+    for row in rows:
+        row["pareto"] = not any(
+            other[quality] >= row[quality]
+            and other[latency] <= row[latency]
+            and (other[quality] > row[quality] or other[latency] < row[latency])
+            for other in rows
+        )
+
+    return sorted(rows, key=lambda row: (row[latency], -row[quality]))
+
+
+def format_table(rows: List[Dict], columns: Sequence[str]) -> str:
+    """
+    Markdown table of the given columns.
+    """
+    lines = [
+        "| " + " | ".join(columns) + " |",
+        "|" + "|".join("---" for _ in columns) + "|",
+    ]
+
+    for row in rows:
+        cells = []
+        for column in columns:
+            value = row.get(column)
+            cells.append("*" if value is True else "" if value in (None, False) else str(value))
+        lines.append("| " + " | ".join(cells) + " |")
+
+    return "\n".join(lines)
+
+
+class RetrievalSweep:
+    """
+    Evaluates a labelled dataset over a grid of retrieval settings.
+    - chunk size / overlap: documents_dir is re-chunked and indexed into
+      a scratch store per pair (without documents_dir, the given store
+      is evaluated as it is)
+    - k, nprobe, score threshold: a fresh retriever per combination,
+      with query/result caches off so latencies are not cache hits
+    """
+
+    def __init__(
+        self,
+        dataset: List[LabelledQuestion],
+        workdir: str,
+        embeddings: Optional[EmbeddingEngine] = None,
+        index_config: Optional[IndexConfig] = None,
+        documents_dir: Optional[str] = None,
+        vector_store: Optional[FAISSVectorStore] = None,
+        workers: int = 4
+    ):
+        if documents_dir is None and vector_store is None:
+            raise ValueError("Either documents_dir or vector_store is required.")
+
+        self.dataset = dataset
+        self.workdir = workdir
+        self.documents_dir = documents_dir
+        self.vector_store = vector_store
+        self.workers = workers
+        self.index_config = index_config or IndexConfig()
+        self.embeddings = embeddings or (vector_store.embeddings if vector_store is not None else EmbeddingEngine())
+
+    def _files(self) -> List[str]:
+        files = []
+
+        for dirpath, dirnames, filenames in os.walk(self.documents_dir):
+            dirnames.sort()
+            for filename in sorted(filenames):
+                if os.path.splitext(filename)[1].lower() in DocumentLoader.SUPPORTED_EXTENSIONS:
+                    files.append(os.path.join(dirpath, filename))
+
+        return files
+
+    def build_store(self, chunk_size: int, chunk_overlap: int) -> Dict:
+        """
+        Index documents_dir with the given chunking; returns the store and build stats.
+        """
+        store = FAISSVectorStore(
+            persist_path=os.path.join(self.workdir, f"chunks-{chunk_size}-{chunk_overlap}"),
+            embeddings=self.embeddings,
+            index_config=self.index_config
+        )
+
+        start = time.perf_counter()
+        chunks = 0
+
+        for path in self._files():
+            doc_id = os.path.relpath(path, self.documents_dir).replace(os.sep, "/")
+            _, documents, _ = parse_document(path, chunk_size, chunk_overlap, doc_id=doc_id)
+
+            for offset in range(0, len(documents), settings.INGESTION_BATCH_SIZE):
+                store.index_documents(documents[offset:offset + settings.INGESTION_BATCH_SIZE])
+
+            chunks += len(documents)
+
+        store.wait_for_promotion()
+
+        return {
+            "store": store,
+            "chunks": chunks,
+            "build_seconds": round(time.perf_counter() - start, 2),
+        }
+
+    def run(
+        self,
+        chunk_sizes: Sequence[int] = (settings.CHUNK_SIZE,),
+        chunk_overlaps: Sequence[int] = (settings.CHUNK_OVERLAP,),
+        ks: Sequence[int] = (settings.TOP_K,),
+        nprobes: Sequence[Optional[int]] = (None,),
+        thresholds: Sequence[float] = (settings.SCORE_THRESHOLD,)
+    ) -> List[Dict]:
+        rows = []
+
+        if self.documents_dir is None:
+            chunkings = [(settings.CHUNK_SIZE, settings.CHUNK_OVERLAP)]
+        else:
+            chunkings = [(size, overlap) for size, overlap in itertools.product(chunk_sizes, chunk_overlaps) if overlap < size]
+
+        for chunk_size, chunk_overlap in chunkings:
+            if self.documents_dir is None:
+                built = {"store": self.vector_store, "chunks": None, "build_seconds": None}
+            else:
+                built = self.build_store(chunk_size, chunk_overlap)
+
+            store = built["store"]
+
+            for k, nprobe, threshold in itertools.product(ks, nprobes, thresholds):
+                retriever = SemanticRetriever(
+                    store,
+                    top_k=k,
+                    score_threshold=threshold,
+                    query_cache_size=0,
+                    result_cache_size=0,
+                    nprobe=nprobe,
+                    workers=1
+                )
+
+                try:
+                    metrics = RetrievalEvaluator(retriever).evaluate_labelled(self.dataset, k, self.workers)
+                finally:
+                    retriever.shutdown()
+
+                rows.append({
+                    "chunk_size": chunk_size,
+                    "chunk_overlap": chunk_overlap,
+                    "k": k,
+                    "nprobe": nprobe or store.index_config.nprobe,
+                    "threshold": threshold,
+                    "index_type": store.index_info()["type"],
+                    "chunks": built["chunks"],
+                    "build_seconds": built["build_seconds"],
+                    **metrics,
+                })
+
+        return rows
+
+# app/evaluation/sweep.py
@@ -1,5 +1,5 @@
 from pathlib import Path
-from typing import List
+from typing import Iterator, List
 from langchain_core.documents import Document
 from langchain_community.document_loaders import PyMuPDFLoader, Docx2txtLoader
 
@@ -12,21 +12,29 @@ class DocumentLoader:
 
     SUPPORTED_EXTENSIONS = [".pdf", ".docx"]
 
-    def load(self, file_path: str) -> List[Document]:
-        """
-        Load document and return list of LangChain Documents.
-        """
+    def _loader(self, file_path: str):
         path = Path(file_path)
 
         if path.suffix.lower() not in self.SUPPORTED_EXTENSIONS:
             raise ValueError(f"Unsupported file type: {path.suffix}")
 
         if path.suffix.lower() == ".pdf":
-            loader = PyMuPDFLoader(file_path)
-        else:
-            loader = Docx2txtLoader(file_path)
+            return PyMuPDFLoader(file_path)
+
+        return Docx2txtLoader(file_path)
 
-        documents = loader.load()
+    def load(self, file_path: str) -> List[Document]:
+        """
+        Load document and return list of LangChain Documents.
+        """
+        documents = self._loader(file_path).load()
 
         return documents
+
+    def lazy_load(self, file_path: str) -> Iterator[Document]:
+        """
+        Yield the document page by page (PDF) without holding
+        the whole file in memory.
+        """
+        return self._loader(file_path).lazy_load()
 # app/ingestion/loader.py
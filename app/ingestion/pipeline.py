@@ -1,13 +1,39 @@
-from typing import List
+import hashlib
+import os
+import queue
+import time
+from threading import Event, Thread
+from typing import Dict, Iterable, Iterator, List, Tuple
 from langchain_core.documents import Document
 from app.ingestion.loader import DocumentLoader
 from app.ingestion.splitter import DocumentSplitter
+from app.monitoring.metrics import INGESTION_STAGES
+
+
+def document_id(file_path: str) -> str:
+    """
+    Stable document id: uploads with the same file name replace each other.
+    """
+    return os.path.basename(file_path)
+
+
+def file_hash(file_path: str) -> str:
+    """
+    SHA-256 of the file contents, used to skip re-ingesting identical files.
+    """
+    digest = hashlib.sha256()
+
+    with open(file_path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+
+    return digest.hexdigest()
 
 
 class IngestionPipeline:
     """
     Full ingestion pipeline:
-    Load → Split → Return chunks
+    Load → Split → Tag → Return chunks
     """
 
     def __init__(
@@ -26,10 +52,169 @@ class IngestionPipeline:
         Execute ingestion pipeline.
         """
         # Step 1: Load raw document
-        documents = self.loader.load(file_path)
+        with INGESTION_STAGES.time("parse"):
+            documents = self.loader.load(file_path)
 
         # Step 2: Split into chunks
-        chunks = self.splitter.split(documents)
+        with INGESTION_STAGES.time("split"):
+            chunks = self.splitter.split(documents)
+
+        # Step 3: Tag chunks with their document id and content hash
+        self.tag(chunks, file_path)
 
         return chunks
+
+    def stream(
+        self,
+        file_path: str,
+        batch_size: int = 64,
+        content_hash: str = None,
+        tags: List[str] = None
+    ) -> Iterator[Tuple[int, List[Document]]]:
+        """
+        Streaming pipeline: Load page → Split → Tag → Batch.
+        Yields (pages parsed so far, chunk batch); only the current
+        page and batch are held in memory. The last batch may be empty.
+        """
+        content_hash = content_hash or file_hash(file_path)
+
+        pages = 0
+        batch: List[Document] = []
+
+        loaded = self.loader.lazy_load(file_path)
+
+        while True:
+            # Pages are parsed lazily, so each one is timed as it is pulled
+            with INGESTION_STAGES.time("parse"):
+                page = next(loaded, None)
+
+            if page is None:
+                break
+
+            pages += 1
+
+            with INGESTION_STAGES.time("split"):
+                chunks = list(self.splitter.split_lazy([page]))
+            self.tag(chunks, file_path, content_hash, tags=tags)
+
+            for chunk in chunks:
+                batch.append(chunk)
+
+                if len(batch) >= batch_size:
+                    yield pages, batch
+                    batch = []
+
+        yield pages, batch
+
+    @staticmethod
+    def tag(
+        chunks: List[Document],
+        file_path: str,
+        content_hash: str = None,
+        doc_id: str = None,
+        tags: List[str] = None
+    ) -> None:
+        doc_id = doc_id or document_id(file_path)
+        content_hash = content_hash or file_hash(file_path)
+
+        for chunk in chunks:
+            chunk.metadata["doc_id"] = doc_id
+            chunk.metadata["content_hash"] = content_hash
+
+            if tags:
+                chunk.metadata["tags"] = list(tags)
+
+
+def parse_document(
+    file_path: str,
+    chunk_size: int = 1000,
+    chunk_overlap: int = 200,
+    content_hash: str = None,
+    doc_id: str = None,
+    tags: List[str] = None
+) -> Tuple[int, List[Document], Dict[str, float]]:
+    """
+    Load and split a file, returning (pages parsed, chunks, stage timings).
+    Module-level so it can run inside a process pool; timings are
+    returned for the parent to record, as worker metrics are not exported.
+    """
+    pipeline = IngestionPipeline(
+        chunk_size=chunk_size,
+        chunk_overlap=chunk_overlap
+    )
+
+    start = time.perf_counter()
+    documents = pipeline.loader.load(file_path)
+
+    parsed = time.perf_counter()
+    chunks = pipeline.splitter.split(documents)
+    pipeline.tag(chunks, file_path, content_hash, doc_id, tags)
+
+    timings = {
+        "parse": parsed - start,
+        "split": time.perf_counter() - parsed,
+    }
+
+    return len(documents), chunks, timings
+
+
+class _Failure:
+
+    __slots__ = ("error",)
+
+    def __init__(self, error: BaseException):
+        self.error = error
+
+
+_DONE = object()
+
+
+def prefetch(items: Iterable, max_in_flight: int = 4) -> Iterator:
+    """
+    Produce items in a background thread, at most max_in_flight ahead
+    of the consumer. A full buffer blocks the producer (backpressure),
+    so parsing overlaps with embedding without running ahead of it.
+    Producer errors are re-raised in the consumer.
+    """
+    buffer = queue.Queue(maxsize=max(1, max_in_flight))
+    stop = Event()
+
+    def put(item) -> bool:
+        while not stop.is_set():
+            try:
+                buffer.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+
+        return False
+
+    def produce():
+        try:
+            for item in items:
+                if not put(item):
+                    return
+        except BaseException as e:
+            put(_Failure(e))
+            return
+
+        put(_DONE)
+
+    Thread(target=produce, name="ingestion-prefetch", daemon=True).start()
+
+    try:
+        while True:
+            item = buffer.get()
+
+            if item is _DONE:
+                return
+
+            if isinstance(item, _Failure):
+                raise item.error
+
+            yield item
+
+    finally:
+        # Consumer stopped early or failed: release the producer
+        stop.set()
 # app/ingestion/pipeline.py
@@ -1,4 +1,4 @@
-from typing import List
+from typing import Iterable, Iterator, List
 from langchain_core.documents import Document
 from langchain_text_splitters import RecursiveCharacterTextSplitter
 
@@ -24,4 +24,11 @@ class DocumentSplitter:
         """
         chunks = self.splitter.split_documents(documents)
         return chunks
+
+    def split_lazy(self, documents: Iterable[Document]) -> Iterator[Document]:
+        """
+        Split documents one at a time, yielding chunks as they are produced.
+        """
+        for document in documents:
+            yield from self.splitter.split_documents([document])
 # app/ingestion/splitter.py
@@ -0,0 +1,320 @@
+import hashlib
+import json
+import os
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Executor, ProcessPoolExecutor, wait
+from typing import Dict, List, Optional
+
+from app.ingestion.loader import DocumentLoader
+from app.ingestion.pipeline import file_hash, parse_document
+from app.jobs.ingestion_jobs import IngestionJob
+from app.vectorstore.faiss_store import FAISSVectorStore
+from app.monitoring.metrics import INGESTION_STAGES
+from app.config import settings
+
+
+def default_manifest_path(directory: str) -> str:
+    """
+    Per-directory manifest location under BULK_INGEST_MANIFEST_DIR.
+    """
+    key = hashlib.sha1(os.path.abspath(directory).encode("utf-8")).hexdigest()[:16]
+    return os.path.join(settings.BULK_INGEST_MANIFEST_DIR, f"{key}.jsonl")
+
+
+class BulkManifest:
+    """
+    Append-only record of files whose chunks are saved in the index.
+    A file is identified by its relative path, size and mtime, so
+    an edited file is ingested again on the next run.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._completed = set()
+
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                for line in f:
+                    line = line.strip()
+                    if line:
+                        record = json.loads(line)
+                        self._completed.add((record["path"], record["size"], record["mtime_ns"]))
+
+    @staticmethod
+    def record(root: str, file_path: str) -> Dict:
+        stat = os.stat(file_path)
+
+        return {
+            "path": os.path.relpath(file_path, root).replace(os.sep, "/"),
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+        }
+
+    def is_completed(self, record: Dict) -> bool:
+        return (record["path"], record["size"], record["mtime_ns"]) in self._completed
+
+    def mark(self, records: List[Dict]) -> None:
+        if not records:
+            return
+
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+
+        with open(self.path, "a", encoding="utf-8") as f:
+            for record in records:
+                f.write(json.dumps(record) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+        for record in records:
+            self._completed.add((record["path"], record["size"], record["mtime_ns"]))
+
+
+class _FileState:
+
+    __slots__ = ("record", "doc_id", "content_hash", "remaining", "previous")
+
+    def __init__(self, record: Dict, content_hash: str):
+        self.record = record
+        self.doc_id = record["path"]
+        self.content_hash = content_hash
+        self.remaining = 0
+        self.previous: List[List[int]] = []
+
+
+class BulkIngestor:
+    """
+    Ingests every supported file below a directory:
+    - files are parsed in a process pool, a bounded number at a time
+    - chunks are embedded and written to the index one batch at a time
+    - files are committed in the index and recorded in a manifest only
+      once all their chunks are saved, so an interrupted run resumes
+      where it stopped; a file cut short is indexed again from scratch
+
+    Document ids are paths relative to the directory.
+    """
+
+    def __init__(
+        self,
+        vector_store: FAISSVectorStore,
+        chunk_size: int = None,
+        chunk_overlap: int = None,
+        workers: int = None,
+        batch_size: int = None,
+        flush_chunks: int = None,
+        executor: Optional[Executor] = None
+    ):
+        self.vector_store = vector_store
+        self.chunk_size = settings.CHUNK_SIZE if chunk_size is None else chunk_size
+        self.chunk_overlap = settings.CHUNK_OVERLAP if chunk_overlap is None else chunk_overlap
+        self.workers = settings.INGESTION_PARSE_WORKERS if workers is None else workers
+        self.batch_size = settings.INGESTION_BATCH_SIZE if batch_size is None else batch_size
+        self.flush_chunks = settings.INGESTION_FLUSH_CHUNKS if flush_chunks is None else flush_chunks
+        self.executor = executor
+
+    @staticmethod
+    def discover(directory: str) -> List[str]:
+        extensions = DocumentLoader.SUPPORTED_EXTENSIONS
+        files = []
+
+        for dirpath, dirnames, filenames in os.walk(directory):
+            dirnames.sort()
+
+            for filename in sorted(filenames):
+                if os.path.splitext(filename)[1].lower() in extensions:
+                    files.append(os.path.join(dirpath, filename))
+
+        return files
+
+    def run(
+        self,
+        directory: str,
+        manifest_path: str = None,
+        job: Optional[IngestionJob] = None
+    ) -> IngestionJob:
+        """
+        Ingest the directory, reporting progress on job.
+        """
+        root = os.path.abspath(directory)
+
+        if not os.path.isdir(root):
+            raise ValueError(f"Not a directory: {directory}")
+
+        job = job or IngestionJob(directory)
+        manifest = BulkManifest(manifest_path or default_manifest_path(root))
+
+        files = self.discover(root)
+        job.files_total = len(files)
+
+        executor = self.executor or ProcessPoolExecutor(max_workers=self.workers)
+
+        try:
+            self._ingest(root, files, manifest, job, executor)
+        finally:
+            if self.executor is None:
+                executor.shutdown()
+
+        return job
+
+    def _ingest(
+        self,
+        root: str,
+        files: List[str],
+        manifest: BulkManifest,
+        job: IngestionJob,
+        executor: Executor
+    ) -> None:
+        store = self.vector_store
+
+        buffer: List[tuple] = []
+        unsaved_records: List[Dict] = []
+        unsaved_chunks = 0
+        seen_hashes = set()
+
+        # content_hash -> (file_path, record) of copies of a file still being indexed
+        duplicates: Dict[str, List[tuple]] = {}
+        pending = deque(files)
+
+        # Files begun in the index, and those of them fully indexed but not yet saved
+        begun: Dict[str, _FileState] = {}
+        finished: List[_FileState] = []
+
+        def save() -> None:
+            nonlocal unsaved_chunks
+
+            if store.index is not None:
+                store.save_index()
+
+            # A file counts as indexed only once all its chunks are saved;
+            # its old version goes in the same update
+            for state in finished:
+                store.commit_document(state.doc_id, state.previous)
+                begun.pop(state.doc_id, None)
+                unsaved_records.append(state.record)
+
+                # Copies are done once the content they duplicate is
+                copies = duplicates.pop(state.content_hash, [])
+                job.files_skipped += len(copies)
+                unsaved_records.extend(record for _, record in copies)
+
+            if finished and store.index is not None:
+                store.save_index()
+
+            finished.clear()
+
+            manifest.mark(unsaved_records)
+            unsaved_records.clear()
+            unsaved_chunks = 0
+
+        def write_batch(entries: List[tuple]) -> None:
+            nonlocal unsaved_chunks
+
+            store.index_documents([chunk for _, chunk in entries])
+            job.chunks_embedded += len(entries)
+            unsaved_chunks += len(entries)
+
+            for state, _ in entries:
+                state.remaining -= 1
+                if state.remaining == 0:
+                    finished.append(state)
+                    job.files_completed += 1
+
+            if unsaved_chunks >= self.flush_chunks:
+                save()
+
+        def collect(future) -> None:
+            state = in_flight.pop(future)
+
+            try:
+                pages, chunks, timings = future.result()
+            except Exception as e:
+                job.files_failed += 1
+                job.error = f"{state.record['path']}: {e}"
+
+                # Its copies are ingested as files of their own
+                seen_hashes.discard(state.content_hash)
+                pending.extendleft(reversed([path for path, _ in duplicates.pop(state.content_hash, [])]))
+                return
+
+            INGESTION_STAGES.record(timings)
+
+            job.pages_parsed += pages
+            job.total_chunks += len(chunks)
+
+            # Drops the partial chunks of an earlier interrupted attempt
+            store.begin_document(state.doc_id, state.content_hash)
+            begun[state.doc_id] = state
+
+            state.remaining = len(chunks)
+            state.previous = store.document_ranges(state.doc_id)
+
+            if not chunks:
+                finished.append(state)
+                job.files_completed += 1
+                return
+
+            buffer.extend((state, chunk) for chunk in chunks)
+
+            while len(buffer) >= self.batch_size:
+                write_batch(buffer[:self.batch_size])
+                del buffer[:self.batch_size]
+
+        in_flight: Dict = {}
+        max_in_flight = max(1, self.workers) * 2
+
+        job.status = IngestionJob.EMBEDDING
+
+        try:
+            while pending or in_flight:
+                # Bound parsed-but-unindexed documents held in memory
+                if not pending or len(in_flight) >= max_in_flight:
+                    done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        collect(future)
+                    continue
+
+                file_path = pending.popleft()
+                record = BulkManifest.record(root, file_path)
+
+                if manifest.is_completed(record):
+                    job.files_skipped += 1
+                    continue
+
+                content_hash = file_hash(file_path)
+
+                # Same content already indexed (e.g. a copy under another name)
+                if store.find_document_by_hash(content_hash) is not None:
+                    job.files_skipped += 1
+                    unsaved_records.append(record)
+                    continue
+
+                # Same content still being indexed: recorded once that file is committed
+                if content_hash in seen_hashes:
+                    duplicates.setdefault(content_hash, []).append((file_path, record))
+                    continue
+
+                seen_hashes.add(content_hash)
+
+                future = executor.submit(
+                    parse_document,
+                    file_path,
+                    self.chunk_size,
+                    self.chunk_overlap,
+                    content_hash,
+                    record["path"]
+                )
+                in_flight[future] = _FileState(record, content_hash)
+
+            if buffer:
+                write_batch(buffer)
+                buffer.clear()
+
+            save()
+
+        except Exception:
+            # Files not committed are dropped from the index; the next run redoes
+            # them, and their copies
+            for doc_id in begun:
+                store.abort_document(doc_id)
+            raise
+
+# app/jobs/bulk_ingest.py
@@ -0,0 +1,272 @@
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from threading import Lock
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
+
+from langchain_core.documents import Document
+
+from app.ingestion.pipeline import (
+    IngestionPipeline,
+    document_id,
+    file_hash,
+    parse_document,
+    prefetch
+)
+from app.vectorstore.faiss_store import FAISSVectorStore
+from app.monitoring.metrics import INGESTION_STAGES
+from app.config import settings
+
+
+class IngestionJob:
+    """
+    Status and progress of a single background ingestion.
+    """
+
+    QUEUED = "queued"
+    PARSING = "parsing"
+    EMBEDDING = "embedding"
+    COMPLETED = "completed"
+    SKIPPED = "skipped"
+    FAILED = "failed"
+
+    def __init__(self, file_path: str, tags: Optional[List[str]] = None):
+        self.job_id = uuid.uuid4().hex
+        self.file_path = file_path
+        self.tags = tags or []
+        self.status = self.QUEUED
+        self.pages_parsed = 0
+        self.total_chunks = 0
+        self.chunks_embedded = 0
+
+        # Bulk (directory) jobs only
+        self.files_total = 0
+        self.files_completed = 0
+        self.files_skipped = 0
+        self.files_failed = 0
+
+        self.error: Optional[str] = None
+        self.created_at = time.time()
+        self.finished_at: Optional[float] = None
+
+    @property
+    def done(self) -> bool:
+        return self.status in (self.COMPLETED, self.SKIPPED, self.FAILED)
+
+    def to_dict(self) -> Dict:
+        return {
+            "job_id": self.job_id,
+            "file_path": self.file_path,
+            "status": self.status,
+            "pages_parsed": self.pages_parsed,
+            "total_chunks": self.total_chunks,
+            "chunks_embedded": self.chunks_embedded,
+            "files_total": self.files_total,
+            "files_completed": self.files_completed,
+            "files_skipped": self.files_skipped,
+            "files_failed": self.files_failed,
+            "error": self.error,
+            "created_at": self.created_at,
+            "finished_at": self.finished_at,
+        }
+
+
+class IngestionJobManager:
+    """
+    Runs document ingestion off the event loop:
+    - PDF/DOCX parsing and splitting in a process pool, or page by page
+      in a prefetch thread when streaming
+    - Embedding and index writes in a thread pool
+
+    Files whose content is already indexed are skipped; a new version
+    of an indexed document replaces the old one once fully embedded.
+    """
+
+    def __init__(
+        self,
+        vector_store: FAISSVectorStore,
+        chunk_size: int = None,
+        chunk_overlap: int = None,
+        parse_workers: int = None,
+        embed_workers: int = None,
+        batch_size: int = None,
+        max_jobs: int = None,
+        streaming: bool = None,
+        max_in_flight: int = None,
+        flush_chunks: int = None
+    ):
+        self.vector_store = vector_store
+        self.chunk_size = settings.CHUNK_SIZE if chunk_size is None else chunk_size
+        self.chunk_overlap = settings.CHUNK_OVERLAP if chunk_overlap is None else chunk_overlap
+        self.batch_size = settings.INGESTION_BATCH_SIZE if batch_size is None else batch_size
+        self.max_jobs = settings.INGESTION_MAX_JOBS if max_jobs is None else max_jobs
+
+        # Streaming keeps memory flat: at most max_in_flight parsed batches
+        # wait for embedding, and unsaved chunks are flushed every flush_chunks
+        self.streaming = settings.INGESTION_STREAMING if streaming is None else streaming
+        self.max_in_flight = (
+            settings.INGESTION_MAX_IN_FLIGHT_BATCHES if max_in_flight is None else max_in_flight
+        )
+        self.flush_chunks = settings.INGESTION_FLUSH_CHUNKS if flush_chunks is None else flush_chunks
+
+        self._parse_pool = ProcessPoolExecutor(
+            max_workers=settings.INGESTION_PARSE_WORKERS if parse_workers is None else parse_workers
+        )
+        self._embed_pool = ThreadPoolExecutor(
+            max_workers=settings.INGESTION_EMBED_WORKERS if embed_workers is None else embed_workers,
+            thread_name_prefix="ingestion"
+        )
+
+        self._jobs: "OrderedDict[str, IngestionJob]" = OrderedDict()
+        self._lock = Lock()
+
+    # Submission
+
+    def submit(self, file_path: str, tags: Optional[List[str]] = None) -> IngestionJob:
+        """
+        Queue a file for ingestion and return its job immediately.
+        Tags are attached to every chunk, for search filters.
+        """
+        return self.submit_task(IngestionJob(file_path, tags), self._ingest_file)
+
+    def submit_task(self, job: IngestionJob, task: Callable[[IngestionJob], None]) -> IngestionJob:
+        """
+        Run a custom ingestion task (e.g. a bulk directory import)
+        as a tracked background job.
+        """
+        with self._lock:
+            self._jobs[job.job_id] = job
+            self._trim_finished()
+
+        self._embed_pool.submit(self._run, job, task)
+
+        return job
+
+    @property
+    def parse_pool(self) -> ProcessPoolExecutor:
+        return self._parse_pool
+
+    def get(self, job_id: str) -> Optional[IngestionJob]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def _trim_finished(self) -> None:
+        # Caller holds the lock; drop the oldest finished jobs first
+        overflow = len(self._jobs) - self.max_jobs
+
+        if overflow <= 0:
+            return
+
+        for job_id in [j.job_id for j in self._jobs.values() if j.done][:overflow]:
+            del self._jobs[job_id]
+
+    # Execution
+
+    def _run(self, job: IngestionJob, task: Callable[[IngestionJob], None]) -> None:
+        try:
+            task(job)
+
+            if job.status != IngestionJob.SKIPPED:
+                job.status = IngestionJob.COMPLETED
+
+        except Exception as e:
+            job.error = str(e)
+            job.status = IngestionJob.FAILED
+
+        finally:
+            job.finished_at = time.time()
+
+    def _ingest_file(self, job: IngestionJob) -> None:
+        content_hash = file_hash(job.file_path)
+
+        if self.vector_store.find_document_by_hash(content_hash) is not None:
+            job.status = IngestionJob.SKIPPED
+            return
+
+        job.status = IngestionJob.PARSING
+
+        if self.streaming:
+            self._index_batches(job, self._stream(job, content_hash), content_hash)
+            return
+
+        pages, chunks, timings = self._parse_pool.submit(
+            parse_document,
+            job.file_path,
+            self.chunk_size,
+            self.chunk_overlap,
+            content_hash,
+            None,
+            job.tags
+        ).result()
+
+        INGESTION_STAGES.record(timings)
+
+        job.pages_parsed = pages
+        job.total_chunks = len(chunks)
+        job.status = IngestionJob.EMBEDDING
+
+        self._index_batches(job, (
+            chunks[start:start + self.batch_size]
+            for start in range(0, len(chunks), self.batch_size)
+        ), content_hash)
+
+    def _stream(self, job: IngestionJob, content_hash: str) -> Iterator[List[Document]]:
+        pipeline = IngestionPipeline(
+            chunk_size=self.chunk_size,
+            chunk_overlap=self.chunk_overlap
+        )
+
+        batches = pipeline.stream(job.file_path, self.batch_size, content_hash, job.tags)
+
+        for pages, batch in prefetch(batches, self.max_in_flight):
+            job.pages_parsed = pages
+            job.total_chunks += len(batch)
+            job.status = IngestionJob.EMBEDDING
+
+            yield batch
+
+    def _index_batches(self, job: IngestionJob, batches: Iterable[List[Document]], content_hash: str) -> None:
+        store = self.vector_store
+        doc_id = document_id(job.file_path)
+
+        # Flushed chunks are saved as an incomplete version, which a
+        # restart drops; the previous version stays until the commit
+        store.begin_document(doc_id, content_hash)
+        previous = store.document_ranges(doc_id)
+        unsaved = 0
+
+        try:
+            for batch in batches:
+                if not batch:
+                    continue
+
+                store.index_documents(batch)
+
+                job.chunks_embedded += len(batch)
+
+                # Bound the unsaved vectors/chunks held in memory
+                unsaved += len(batch)
+                if unsaved >= self.flush_chunks:
+                    store.save_index()
+                    unsaved = 0
+
+            if store.index is not None:
+                store.save_index()
+
+        except Exception:
+            # Nothing of a failed version stays searchable or counts as indexed
+            store.abort_document(doc_id)
+            raise
+
+        # Only a fully saved version is marked indexed
+        store.commit_document(doc_id, previous)
+
+        if store.index is not None:
+            store.save_index()
+
+    def shutdown(self) -> None:
+        self._embed_pool.shutdown(wait=False)
+        self._parse_pool.shutdown(wait=False)
+
+# app/jobs/ingestion_jobs.py
@@ -0,0 +1,172 @@
+import copy
+import hashlib
+import itertools
+import time
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Dict, Hashable, List, Optional
+
+import numpy as np
+from langchain_core.documents import Document
+
+from app.config import settings
+
+
+def context_key(docs: List[Document], history: str = "") -> str:
+    """
+    Digest of the chunks (and history) an answer was generated from.
+    """
+    digest = hashlib.sha1(history.encode("utf-8"))
+
+    for doc in docs:
+        metadata = doc.metadata
+        digest.update(b"\x00")
+        digest.update(str(metadata.get("doc_id") or metadata.get("source")).encode("utf-8"))
+        digest.update(b"\x00")
+        digest.update(str(metadata.get("page")).encode("utf-8"))
+        digest.update(b"\x00")
+        digest.update(doc.page_content.encode("utf-8"))
+
+    return digest.hexdigest()
+
+
+class _Entry:
+
+    __slots__ = ("key", "vector", "value", "expires_at")
+
+    def __init__(self, key: Hashable, vector: np.ndarray, value: Any, expires_at: float):
+        self.key = key
+        self.vector = vector
+        self.value = value
+        self.expires_at = expires_at
+
+
+class SemanticAnswerCache:
+    """
+    Answers reused for near-identical questions:
+    - an entry matches when the retrieved context (see context_key) is the
+      same and the question embeddings' cosine similarity is >= threshold
+    - entries expire after ttl_seconds; the least recently used go first
+      beyond max_size
+    - everything is dropped when the index version changes
+    """
+
+    def __init__(
+        self,
+        max_size: int = None,
+        ttl_seconds: float = None,
+        threshold: float = None
+    ):
+        self.max_size = settings.ANSWER_CACHE_SIZE if max_size is None else max_size
+        self.ttl_seconds = settings.ANSWER_CACHE_TTL_SECONDS if ttl_seconds is None else ttl_seconds
+        self.threshold = settings.ANSWER_CACHE_SIMILARITY if threshold is None else threshold
+
+        self._entries: "OrderedDict[int, _Entry]" = OrderedDict()
+        self._buckets: Dict[Hashable, List[int]] = {}
+        self._ids = itertools.count()
+        self._version = None
+        self._lock = Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.evictions = 0
+
+    @staticmethod
+    def _unit(vector: np.ndarray) -> np.ndarray:
+        vector = np.asarray(vector, dtype="float32").ravel()
+        norm = float(np.linalg.norm(vector))
+        return vector / norm if norm else vector
+
+    def _check_version(self, version: int) -> None:
+        if version != self._version:
+            self._entries.clear()
+            self._buckets.clear()
+            self._version = version
+
+    def _remove(self, entry_id: int) -> None:
+        entry = self._entries.pop(entry_id)
+        bucket = self._buckets[entry.key]
+        bucket.remove(entry_id)
+
+        if not bucket:
+            del self._buckets[entry.key]
+
+    def get(self, key: Hashable, vector: np.ndarray, version: int) -> Optional[Any]:
+        """
+        Best cached answer for key within the similarity threshold.
+        """
+        vector = self._unit(vector)
+        now = time.monotonic()
+
+        with self._lock:
+            self._check_version(version)
+
+            best_id = None
+            best_similarity = self.threshold
+
+            for entry_id in list(self._buckets.get(key, ())):
+                entry = self._entries[entry_id]
+
+                if entry.expires_at <= now:
+                    self._remove(entry_id)
+                    self.expired += 1
+                    continue
+
+                similarity = float(np.dot(entry.vector, vector))
+                if similarity >= best_similarity:
+                    best_id, best_similarity = entry_id, similarity
+
+            if best_id is None:
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(best_id)
+            self.hits += 1
+
+            return copy.deepcopy(self._entries[best_id].value)
+
+    def put(self, key: Hashable, vector: np.ndarray, version: int, value: Any) -> None:
+        if self.max_size <= 0:
+            return
+
+        vector = self._unit(vector)
+        entry = _Entry(key, vector, copy.deepcopy(value), time.monotonic() + self.ttl_seconds)
+
+        with self._lock:
+            self._check_version(version)
+
+            entry_id = next(self._ids)
+            self._entries[entry_id] = entry
+            self._buckets.setdefault(key, []).append(entry_id)
+
+            while len(self._entries) > self.max_size:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._buckets.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            lookups = self.hits + self.misses
+
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "ttl_seconds": self.ttl_seconds,
+                "similarity_threshold": self.threshold,
+                "hits": self.hits,
+                "misses": self.misses,
+                "expired": self.expired,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            }
+
+# app/llm/answer_cache.py
@@ -0,0 +1,133 @@
+import asyncio
+from collections import OrderedDict
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Hashable, List, Optional
+
+# Keys whose saved-call counts are kept for metrics
+TRACKED_KEYS = 256
+
+
+class _Broadcast:
+    """
+    Tokens of one streamed generation, replayed to every subscriber.
+    """
+
+    def __init__(self):
+        self.tokens: List[str] = []
+        self.done = False
+        self.error: Optional[BaseException] = None
+        self.changed = asyncio.Condition()
+
+    async def publish(self, source: AsyncIterator[str]) -> None:
+        try:
+            async for token in source:
+                async with self.changed:
+                    self.tokens.append(token)
+                    self.changed.notify_all()
+        except Exception as e:
+            self.error = e
+        finally:
+            async with self.changed:
+                self.done = True
+                self.changed.notify_all()
+
+    async def subscribe(self) -> AsyncIterator[str]:
+        position = 0
+
+        while True:
+            async with self.changed:
+                await self.changed.wait_for(lambda: self.done or len(self.tokens) > position)
+                tokens = self.tokens[position:]
+                finished = self.done
+
+            for token in tokens:
+                yield token
+            position += len(tokens)
+
+            if finished and position == len(self.tokens):
+                break
+
+        if self.error is not None:
+            raise self.error
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls with the same key: the first caller
+    starts the work, later callers wait for its result (or, for
+    streams, receive its tokens from the start) instead of repeating it.
+
+    The work runs as its own task, so a caller that disconnects does
+    not cancel it for the others. Keys are only shared while in flight;
+    nothing is kept once the call completes.
+    """
+
+    def __init__(self):
+        self._calls: Dict[Hashable, asyncio.Future] = {}
+        self._streams: Dict[Hashable, _Broadcast] = {}
+
+        self.calls = 0
+        self.executions = 0
+        self._saved: "OrderedDict[str, int]" = OrderedDict()
+
+    def _record(self, label: str, shared: bool) -> None:
+        self.calls += 1
+
+        if not shared:
+            self.executions += 1
+            return
+
+        self._saved[label] = self._saved.get(label, 0) + 1
+        self._saved.move_to_end(label)
+
+        while len(self._saved) > TRACKED_KEYS:
+            self._saved.popitem(last=False)
+
+    @staticmethod
+    def _forget(flights: Dict, key: Hashable, flight: Any) -> None:
+        if flights.get(key) is flight:
+            del flights[key]
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]], label: str = None) -> Any:
+        future = self._calls.get(key)
+        self._record(label or str(key), shared=future is not None)
+
+        if future is None:
+            future = asyncio.ensure_future(fn())
+            self._calls[key] = future
+            future.add_done_callback(lambda done: self._forget(self._calls, key, done))
+
+        return await asyncio.shield(future)
+
+    async def stream(
+        self,
+        key: Hashable,
+        fn: Callable[[], AsyncIterator[str]],
+        label: str = None
+    ) -> AsyncIterator[str]:
+        broadcast = self._streams.get(key)
+        self._record(label or str(key), shared=broadcast is not None)
+
+        if broadcast is None:
+            broadcast = _Broadcast()
+            self._streams[key] = broadcast
+
+            task = asyncio.ensure_future(broadcast.publish(fn()))
+            task.add_done_callback(lambda _: self._forget(self._streams, key, broadcast))
+
+        async for token in broadcast.subscribe():
+            yield token
+
+    def stats(self) -> dict:
+        saved = self.calls - self.executions
+        top = sorted(self._saved.items(), key=lambda item: item[1], reverse=True)[:10]
+
+        return {
+            "calls": self.calls,
+            "executions": self.executions,
+            "saved": saved,
+            "saved_rate": round(saved / self.calls, 3) if self.calls else 0.0,
+            "in_flight": len(self._calls) + len(self._streams),
+            "top_keys": [{"key": label, "saved": count} for label, count in top],
+        }
+
+# app/llm/coalescing.py
@@ -0,0 +1,168 @@
+import math
+from typing import Dict, List, Tuple
+
+from langchain_core.documents import Document
+
+from app.config import settings
+
+
+NO_CONTEXT = "No relevant information found."
+NO_HISTORY = "No previous conversation."
+
+# Shortest suffix/prefix match treated as splitter overlap
+MIN_OVERLAP_CHARS = 20
+
+
+def count_tokens(text: str) -> int:
+    """
+    Approximate token count (~4 characters per token for English
+    subword vocabularies); cheap enough to run on every request.
+    """
+    return math.ceil(len(text) / settings.CONTEXT_CHARS_PER_TOKEN)
+
+
+def _overlap(first: str, second: str, max_overlap: int) -> int:
+    """
+    Length of the longest suffix of first that is a prefix of second.
+    """
+    limit = min(len(first), len(second), max_overlap)
+
+    if limit < MIN_OVERLAP_CHARS:
+        return 0
+
+    probe = second[:MIN_OVERLAP_CHARS]
+    position = first.find(probe, len(first) - limit)
+
+    while position != -1:
+        length = len(first) - position
+        if second.startswith(first[position:]) and length >= MIN_OVERLAP_CHARS:
+            return length
+        position = first.find(probe, position + 1)
+
+    return 0
+
+
+class _Section:
+    """
+    Text from one page of one source, assembled from retrieved chunks.
+    """
+
+    __slots__ = ("page", "parts", "docs")
+
+    def __init__(self, page, doc: Document):
+        self.page = page
+        self.parts = [doc.page_content.strip()]
+        self.docs = [doc]
+
+    def absorb(self, doc: Document, max_overlap: int) -> None:
+        text = doc.page_content.strip()
+
+        for i, part in enumerate(self.parts):
+            # Duplicate or fully contained chunk
+            if text in part:
+                return
+
+            # Adjacent chunks overlapping on either side are stitched together
+            overlap = _overlap(part, text, max_overlap)
+            if overlap:
+                self.parts[i] = part + text[overlap:]
+                self.docs.append(doc)
+                return
+
+            overlap = _overlap(text, part, max_overlap)
+            if overlap:
+                self.parts[i] = text + part[overlap:]
+                self.docs.append(doc)
+                return
+
+        self.parts.append(text)
+        self.docs.append(doc)
+
+    @property
+    def text(self) -> str:
+        return "\n...\n".join(self.parts)
+
+
+class ContextBuilder:
+    """
+    Assembles the prompt's context and history under a token budget:
+    - duplicate and overlapping chunks are removed
+    - chunks from the same page are merged into one section
+    - history is trimmed first (oldest messages go first), then the
+      lowest-ranked sections, then the last section is truncated
+    """
+
+    def __init__(self, max_tokens: int = None, max_overlap: int = None):
+        self.max_tokens = settings.CONTEXT_MAX_TOKENS if max_tokens is None else max_tokens
+        self.max_overlap = settings.CHUNK_OVERLAP if max_overlap is None else max_overlap
+
+    def sections(self, docs: List[Document]) -> List[_Section]:
+        """
+        Group chunks per (source, page) in order of their best rank.
+        """
+        sections: Dict[Tuple, _Section] = {}
+
+        for doc in docs:
+            metadata = doc.metadata
+            key = (metadata.get("doc_id") or metadata.get("source"), metadata.get("page"))
+
+            if key in sections:
+                sections[key].absorb(doc, self.max_overlap)
+            else:
+                sections[key] = _Section(metadata.get("page", "Unknown"), doc)
+
+        return list(sections.values())
+
+    def build(
+        self,
+        docs: List[Document],
+        history: List[Dict],
+        reserved_tokens: int = 0
+    ) -> Tuple[str, str, List[Document]]:
+        """
+        Return (context, history text, documents used).
+        reserved_tokens covers the fixed prompt text and the question.
+        """
+        budget = max(self.max_tokens - reserved_tokens, 0)
+
+        blocks = []
+        used_docs = []
+
+        for section in self.sections(docs):
+            header = f"[Source {len(blocks) + 1} - Page {section.page}]\n"
+            block = header + section.text
+            tokens = count_tokens(block) + 1
+
+            if tokens > budget:
+                # Truncate the last section that partly fits
+                room = (budget - count_tokens(header) - 1) * settings.CONTEXT_CHARS_PER_TOKEN
+                if room >= MIN_OVERLAP_CHARS * 4:
+                    blocks.append(header + section.text[:int(room)])
+                    used_docs.extend(section.docs)
+                    budget = 0
+                break
+
+            blocks.append(block)
+            used_docs.extend(section.docs)
+            budget -= tokens
+
+        lines = []
+
+        # Newest messages first, as many as the remaining budget allows
+        for msg in reversed(history):
+            role = "User" if msg["role"] == "user" else "Assistant"
+            line = f"{role}: {msg['content']}"
+            tokens = count_tokens(line) + 1
+
+            if tokens > budget:
+                break
+
+            lines.append(line)
+            budget -= tokens
+
+        context = "\n\n".join(blocks) if blocks else NO_CONTEXT
+        history_text = "\n".join(reversed(lines)) if lines else NO_HISTORY
+
+        return context, history_text, used_docs
+
+# app/llm/context.py
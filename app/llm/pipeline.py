@@ -1,4 +1,6 @@
-from typing import List, Dict, AsyncIterator
+import asyncio
+import time
+from typing import List, Dict, AsyncIterator, Optional, Tuple
 from langchain_core.documents import Document
 from langchain_community.chat_models import ChatOllama
 from langchain_google_genai import ChatGoogleGenerativeAI
@@ -6,12 +8,44 @@ from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.output_parsers import StrOutputParser
 from app.retrieval.retriever import SemanticRetriever
 from app.memory.conversation import ConversationManager
+from app.llm.context import ContextBuilder, count_tokens
+from app.llm.answer_cache import SemanticAnswerCache, context_key
+from app.llm.coalescing import SingleFlight
+from app.llm.stub import StubChatModel
+from app.monitoring.logger import get_logger
+from app.monitoring.metrics import QUERY_STAGES
 from app.config import settings
-class RAGPipeline:
 
-    def __init__(self, retriever: SemanticRetriever):
+
+logger = get_logger(__name__)
+
+
+class RAGPipeline:
+    """
+    Stateless answering engine shared by every session.
+    Conversation state is passed in per call, so the LLM client
+    (and its connection pool) is built once per process.
+    """
+
+    def __init__(
+        self,
+        retriever: SemanticRetriever,
+        context_builder: ContextBuilder = None,
+        answer_cache: Optional[SemanticAnswerCache] = None
+    ):
         self.retriever = retriever
-        self.memory = ConversationManager()
+
+        # Token-budgeted context and history assembly
+        self.context_builder = context_builder or ContextBuilder()
+
+        # Answers reused for near-identical questions over the same context
+        if answer_cache is None and settings.ANSWER_CACHE_ENABLED:
+            answer_cache = SemanticAnswerCache()
+        self.answer_cache = answer_cache
+
+        # Concurrent identical questions share retrieval and generation
+        self.retrieval_flights = SingleFlight() if settings.COALESCE_REQUESTS else None
+        self.answer_flights = SingleFlight() if settings.COALESCE_REQUESTS else None
 
         # Initialize LLM once with fallback
         self.llm = self._initialize_llm()
@@ -34,6 +68,12 @@ Conversation history:
 
         self.chain = self.prompt | self.llm | StrOutputParser()
 
+        # Fixed prompt text counts against the context budget
+        self._template_tokens = sum(
+            count_tokens(message.prompt.template)
+            for message in self.prompt.messages
+        )
+
     #  LLM Initialization (Auto Fallback)
 
     def _initialize_llm(self):
@@ -41,20 +81,29 @@ Conversation history:
         # AUTO MODE
         if settings.LLM_PROVIDER == "auto":
             if settings.GEMINI_API_KEY:
-                print("Using Gemini model")
+                logger.info("Using Gemini model")
                 return ChatGoogleGenerativeAI(
                     model=settings.GEMINI_MODEL,
                     google_api_key=settings.GEMINI_API_KEY,
                     temperature=0.1
                 )
             else:
-                print("Using Ollama (fallback)")
+                logger.info("Using Ollama (fallback)")
                 return ChatOllama(
                     model=settings.OLLAMA_MODEL,
                     base_url=settings.OLLAMA_BASE_URL,
                     temperature=0.1
                 )
 
+        # LOCAL STUB (load tests, no API quota)
+        if settings.LLM_PROVIDER == "stub":
+            logger.info("Using stub LLM")
+            return StubChatModel(
+                first_token_latency=settings.STUB_LLM_FIRST_TOKEN_MS / 1000.0,
+                tokens_per_second=settings.STUB_LLM_TOKENS_PER_SECOND,
+                max_tokens=settings.STUB_LLM_MAX_TOKENS
+            )
+
         # FORCE GEMINI
         if settings.LLM_PROVIDER == "gemini":
             return ChatGoogleGenerativeAI(
@@ -72,29 +121,62 @@ Conversation history:
 
     # Formatting Helpers
 
-    def _format_documents(self, docs: List[Document]) -> str:
-        if not docs:
-            return "No relevant information found."
+    def _build_inputs(
+        self,
+        question: str,
+        docs: List[Document],
+        history: List[Dict]
+    ) -> Tuple[Dict, List[Document]]:
+        """
+        Prompt inputs within the token budget, and the chunks that made it in.
+        Sessions keep SESSION_HISTORY_MAX_MESSAGES; the budget decides how
+        many of those fit.
+        """
+        with QUERY_STAGES.time("prompt_build"):
+            context, history_text, used_docs = self.context_builder.build(
+                docs,
+                history,
+                reserved_tokens=self._template_tokens + count_tokens(question)
+            )
 
-        context_parts = []
-        for i, doc in enumerate(docs, 1):
-            page = str(doc.metadata.get("page", "Unknown"))
-            content = doc.page_content.strip()
-            context_parts.append(f"[Source {i} - Page {page}]\n{content}")
+        inputs = {
+            "context": context,
+            "history": history_text,
+            "question": question
+        }
 
-        return "\n\n".join(context_parts)
+        return inputs, used_docs
 
-    def _format_history(self) -> str:
-        history = self.memory.get_history()
-        if not history:
-            return "No previous conversation."
+    async def _cache_lookup(self, question: str, digest: str):
+        """
+        (cache key, cached answer or None); the key is None without a cache.
+        """
+        if self.answer_cache is None:
+            return None, None
 
-        formatted = []
-        for msg in history[-6:]:
-            role = "User" if msg["role"] == "user" else "Assistant"
-            formatted.append(f"{role}: {msg['content']}")
+        key = (
+            digest,
+            await self.retriever.aembed_query(question),
+            self.retriever.vector_store.version
+        )
 
-        return "\n".join(formatted)
+        return key, self.answer_cache.get(*key)
+
+    def _cache_store(self, key, result: Dict) -> None:
+        if key is not None:
+            self.answer_cache.put(*key, result)
+
+    def answer_cache_stats(self) -> Optional[dict]:
+        return self.answer_cache.stats() if self.answer_cache is not None else None
+
+    def coalescing_stats(self) -> Optional[dict]:
+        if self.answer_flights is None:
+            return None
+
+        return {
+            "retrieval": self.retrieval_flights.stats(),
+            "generation": self.answer_flights.stats(),
+        }
 
     def _extract_sources(self, docs: List[Document]) -> List[Dict]:
         return [
@@ -107,48 +189,176 @@ Conversation history:
 
     # Ask
 
-    async def ask_async(self, question: str) -> Dict:
+    async def _retrieve(self, question: str, filters: Optional[Dict] = None) -> List[Document]:
+        if self.retrieval_flights is None:
+            return await self.retriever.aretrieve(question, filters)
 
-        docs = self.retriever.retrieve(question)
+        normalized = self.retriever.normalize_query(question)
 
-        print(f"Retrieved {len(docs)} documents")
+        return await self.retrieval_flights.do(
+            (normalized, self.retriever.filter_key(filters)),
+            lambda: self.retriever.aretrieve(question, filters),
+            label=normalized
+        )
 
-        context = self._format_documents(docs)
-        history = self._format_history()
+    async def ask_async(
+        self,
+        question: str,
+        memory: ConversationManager,
+        filters: Optional[Dict] = None
+    ) -> Dict:
 
-        answer = await self.chain.ainvoke({
-            "context": context,
-            "history": history,
-            "question": question
-        })
+        with QUERY_STAGES.time("ask_total"):
+            docs = await self._retrieve(question, filters)
 
-        self.memory.add_user_message(question)
-        self.memory.add_ai_message(answer)
+            logger.debug("Retrieved %d documents", len(docs))
 
-        return {
+            result = await self._answer(question, docs, memory.get_history())
+
+            with QUERY_STAGES.time("memory_update"):
+                memory.add_user_message(question)
+                memory.add_ai_message(result["answer"])
+
+        return result
+
+    async def ask_batch(
+        self,
+        questions: List[str],
+        filters: Optional[Dict] = None,
+        max_concurrency: int = None
+    ) -> List[Dict]:
+        """
+        Answer independent questions (no conversation history).
+        Retrieval runs as one batch; LLM calls run concurrently,
+        at most max_concurrency at a time.
+        """
+        max_concurrency = settings.ASK_BATCH_MAX_CONCURRENCY if max_concurrency is None else max_concurrency
+
+        batch_docs = await self.retriever.aretrieve_batch(questions, filters)
+
+        semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+        async def answer(question: str, docs: List[Document]) -> Dict:
+            async with semaphore:
+                return await self._answer(question, docs, [])
+
+        return await asyncio.gather(*(
+            answer(question, docs) for question, docs in zip(questions, batch_docs)
+        ))
+
+    async def _answer(self, question: str, docs: List[Document], history: List[Dict]) -> Dict:
+        inputs, used_docs = self._build_inputs(question, docs, history)
+        digest = context_key(used_docs, inputs["history"])
+
+        if self.answer_flights is None:
+            return await self._generate(question, docs, inputs, used_docs, digest)
+
+        # Same question over the same context: one LLM call for all waiters
+        normalized = self.retriever.normalize_query(question)
+
+        result = await self.answer_flights.do(
+            (normalized, digest),
+            lambda: self._generate(question, docs, inputs, used_docs, digest),
+            label=normalized
+        )
+
+        return dict(result)
+
+    async def _generate(
+        self,
+        question: str,
+        docs: List[Document],
+        inputs: Dict,
+        used_docs: List[Document],
+        digest: str
+    ) -> Dict:
+        key, cached = await self._cache_lookup(question, digest)
+        if cached is not None:
+            return cached
+
+        with QUERY_STAGES.time("llm_total"):
+            answer = await self.chain.ainvoke(inputs)
+
+        result = {
             "answer": answer,
-            "sources": self._extract_sources(docs),
+            "sources": self._extract_sources(used_docs),
             "confidence": "high" if len(docs) >= 2 else "low"
         }
 
-    async def ask_stream(self, question: str) -> AsyncIterator[str]:
+        self._cache_store(key, result)
+
+        return result
+
+    async def ask_stream(
+        self,
+        question: str,
+        memory: ConversationManager,
+        filters: Optional[Dict] = None
+    ) -> AsyncIterator[str]:
+
+        start = time.perf_counter()
+
+        docs = await self._retrieve(question, filters)
+
+        inputs, used_docs = self._build_inputs(question, docs, memory.get_history())
+        digest = context_key(used_docs, inputs["history"])
 
-        docs = self.retriever.retrieve(question)
+        if self.answer_flights is None:
+            tokens = self._generate_stream(question, docs, inputs, used_docs, digest)
+        else:
+            # Waiters on the same question and context share one generation
+            normalized = self.retriever.normalize_query(question)
 
-        context = self._format_documents(docs)
-        history = self._format_history()
+            tokens = self.answer_flights.stream(
+                (normalized, digest),
+                lambda: self._generate_stream(question, docs, inputs, used_docs, digest),
+                label=normalized
+            )
 
         full_answer = ""
 
-        async for chunk in self.chain.astream({
-            "context": context,
-            "history": history,
-            "question": question
-        }):
+        async for chunk in tokens:
+            full_answer += chunk
+            yield chunk
+
+        with QUERY_STAGES.time("memory_update"):
+            memory.add_user_message(question)
+            memory.add_ai_message(full_answer)
+
+        QUERY_STAGES.observe("ask_stream_total", time.perf_counter() - start)
+
+    async def _generate_stream(
+        self,
+        question: str,
+        docs: List[Document],
+        inputs: Dict,
+        used_docs: List[Document],
+        digest: str
+    ) -> AsyncIterator[str]:
+        key, cached = await self._cache_lookup(question, digest)
+
+        if cached is not None:
+            yield cached["answer"]
+            return
+
+        full_answer = ""
+        first_token = True
+        start = time.perf_counter()
+
+        async for chunk in self.chain.astream(inputs):
+            if first_token:
+                QUERY_STAGES.observe("llm_first_token", time.perf_counter() - start)
+                first_token = False
+
             full_answer += chunk
             yield chunk
 
-        self.memory.add_user_message(question)
-        self.memory.add_ai_message(full_answer)
+        QUERY_STAGES.observe("llm_total", time.perf_counter() - start)
+
+        self._cache_store(key, {
+            "answer": full_answer,
+            "sources": self._extract_sources(used_docs),
+            "confidence": "high" if len(docs) >= 2 else "low"
+        })
 
 # app/llm/pipeline.py
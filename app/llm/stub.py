@@ -0,0 +1,84 @@
+import asyncio
+import time
+from typing import Any, AsyncIterator, Iterator, List, Optional
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+
+
+class StubChatModel(BaseChatModel):
+    """
+    Local fake LLM for load tests (LLM_PROVIDER=stub).
+    Waits first_token_latency seconds, then emits up to max_tokens
+    words of the prompt context at tokens_per_second, so /ask and
+    /ask-stream can be driven at full load without any API quota.
+    """
+
+    first_token_latency: float = 0.2
+    tokens_per_second: float = 50.0
+    max_tokens: int = 64
+
+    @property
+    def _llm_type(self) -> str:
+        return "stub"
+
+    def _tokens(self, messages: List[BaseMessage]) -> List[str]:
+        prompt = " ".join(str(message.content) for message in messages)
+        words = ["Stub", "answer:"] + prompt.split()
+        return [word + " " for word in words[:self.max_tokens]]
+
+    def _delay(self) -> float:
+        return 1.0 / self.tokens_per_second if self.tokens_per_second > 0 else 0.0
+
+    def _generate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Any = None,
+        **kwargs: Any
+    ) -> ChatResult:
+        tokens = self._tokens(messages)
+        time.sleep(self.first_token_latency + self._delay() * max(len(tokens) - 1, 0))
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content="".join(tokens)))])
+
+    async def _agenerate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Any = None,
+        **kwargs: Any
+    ) -> ChatResult:
+        tokens = self._tokens(messages)
+        await asyncio.sleep(self.first_token_latency + self._delay() * max(len(tokens) - 1, 0))
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content="".join(tokens)))])
+
+    def _stream(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Any = None,
+        **kwargs: Any
+    ) -> Iterator[ChatGenerationChunk]:
+        time.sleep(self.first_token_latency)
+
+        for i, token in enumerate(self._tokens(messages)):
+            if i:
+                time.sleep(self._delay())
+            yield ChatGenerationChunk(message=AIMessageChunk(content=token))
+
+    async def _astream(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Any = None,
+        **kwargs: Any
+    ) -> AsyncIterator[ChatGenerationChunk]:
+        await asyncio.sleep(self.first_token_latency)
+
+        for i, token in enumerate(self._tokens(messages)):
+            if i:
+                await asyncio.sleep(self._delay())
+            yield ChatGenerationChunk(message=AIMessageChunk(content=token))
+
+# app/llm/stub.py
@@ -4,10 +4,15 @@ from app.api.routes import router, container
 from app.ingestion.pipeline import IngestionPipeline
 from app.vectorstore.faiss_store import FAISSVectorStore
 from app.retrieval.retriever import SemanticRetriever
+from app.retrieval.reranker import CrossEncoderReranker
 from app.llm.pipeline import RAGPipeline
+from app.jobs.ingestion_jobs import IngestionJobManager
+from app.monitoring.logger import get_logger
 from app.config import settings
 
 
+logger = get_logger(__name__)
+
 app = FastAPI(title=settings.APP_NAME)
 
 
@@ -20,22 +25,25 @@ def initialize_app():
     )
 
     # Vector Store
-    vector_store = FAISSVectorStore(
-        embedding_model_name=settings.EMBEDDING_MODEL,
-        persist_path=settings.VECTORSTORE_PATH
-    )
+    vector_store = FAISSVectorStore.from_settings()
 
-    # Try loading existing index
-    try:
-        vector_store.load_index()
-    except:
-        pass
+    # Load the existing index. Load errors stop startup: serving an empty
+    # store over a saved one would overwrite its manifest on the next save.
+    if vector_store.index_exists():
+        try:
+            vector_store.load_index()
+        except Exception:
+            logger.exception("Failed to load the vector index from %s", settings.VECTORSTORE_PATH)
+            raise
+    else:
+        logger.info("No saved vector index in %s; starting empty", settings.VECTORSTORE_PATH)
 
     # Retriever
     retriever = SemanticRetriever(
         vector_store=vector_store,
         top_k=settings.TOP_K,
-        score_threshold=settings.SCORE_THRESHOLD
+        score_threshold=settings.SCORE_THRESHOLD,
+        reranker=CrossEncoderReranker() if settings.RERANK_ENABLED else None
     )
 
     # RAG Pipeline
@@ -43,14 +51,33 @@ def initialize_app():
         retriever=retriever
     )
 
+    # Background ingestion jobs
+    jobs = IngestionJobManager(
+        vector_store=vector_store,
+        chunk_size=settings.CHUNK_SIZE,
+        chunk_overlap=settings.CHUNK_OVERLAP
+    )
+
     # Inject into container
     container.ingestion = ingestion
     container.vector_store = vector_store
     container.retriever = retriever
     container.rag_pipeline = rag_pipeline
+    container.jobs = jobs
+
+    # Expire idle sessions in the background
+    container.sessions.start_eviction()
 
 
 initialize_app()
 app.include_router(router)
 
+
+@app.on_event("shutdown")
+def shutdown_app():
+    container.jobs.shutdown()
+    container.retriever.shutdown()
+    container.vector_store.embeddings.close()
+    container.sessions.stop_eviction()
+
 # app/main.py
@@ -1,11 +1,18 @@
+import sys
+from collections import deque
+from typing import Optional
+
+
 class ConversationManager:
     """
     Simple in-memory conversation manager.
-    Stores chat history per session.
+    Stores chat history per session as a ring buffer,
+    keeping only the most recent messages.
     """
 
-    def __init__(self):
-        self.history = []
+    def __init__(self, max_messages: Optional[int] = None):
+        self.max_messages = max_messages
+        self.history = deque(maxlen=max_messages)
 
     def add_user_message(self, content: str):
         self.history.append({"role": "user", "content": content})
@@ -14,8 +21,22 @@ class ConversationManager:
         self.history.append({"role": "assistant", "content": content})
 
     def get_history(self):
-        return self.history
+        return list(self.history)
 
     def clear(self):
-        self.history = []
+        self.history.clear()
+
+    def approximate_size(self) -> int:
+        """
+        Approximate number of bytes held by the history.
+        """
+        size = sys.getsizeof(self.history)
+
+        # Messages are appended without a lock; iterate a snapshot so a
+        # concurrent append cannot mutate the deque mid-iteration
+        for msg in tuple(self.history):
+            size += sys.getsizeof(msg)
+            size += sys.getsizeof(msg["role"]) + sys.getsizeof(msg["content"])
+
+        return size
 # app/memory/conversation.py
@@ -0,0 +1,169 @@
+import sys
+import time
+from collections import OrderedDict
+from threading import Event, Lock, Thread
+from typing import Dict, Optional
+
+from app.memory.conversation import ConversationManager
+from app.config import settings
+
+
+class SessionStore:
+    """
+    Bounded per-session state store.
+    Maps session_id to its conversation memory so that a single
+    shared RAGPipeline can serve every session.
+
+    - LRU eviction once max_sessions is reached
+    - Idle sessions expire after ttl_seconds
+    - Each history is a ring buffer of max_history messages
+    """
+
+    def __init__(
+        self,
+        max_sessions: int = None,
+        ttl_seconds: float = None,
+        max_history: int = None
+    ):
+        self.max_sessions = settings.SESSION_MAX_COUNT if max_sessions is None else max_sessions
+        self.ttl_seconds = settings.SESSION_TTL_SECONDS if ttl_seconds is None else ttl_seconds
+        self.max_history = settings.SESSION_HISTORY_MAX_MESSAGES if max_history is None else max_history
+
+        # session_id -> memory, ordered from least to most recently used
+        self._sessions: "OrderedDict[str, ConversationManager]" = OrderedDict()
+        self._last_access: Dict[str, float] = {}
+        self._lock = Lock()
+
+        self._evicted_lru = 0
+        self._evicted_ttl = 0
+
+        self._stop_event = Event()
+        self._eviction_thread: Optional[Thread] = None
+
+    # Access
+
+    def get_or_create(self, session_id: str) -> ConversationManager:
+        """
+        Return the memory for a session, creating it on first use.
+        """
+        with self._lock:
+            memory = self._sessions.get(session_id)
+
+            if memory is None:
+                memory = ConversationManager(max_messages=self.max_history)
+                self._sessions[session_id] = memory
+                self._evict_overflow()
+            else:
+                self._sessions.move_to_end(session_id)
+
+            self._last_access[session_id] = time.monotonic()
+
+            return memory
+
+    def get(self, session_id: str) -> Optional[ConversationManager]:
+        with self._lock:
+            memory = self._sessions.get(session_id)
+
+            if memory is not None:
+                self._sessions.move_to_end(session_id)
+                self._last_access[session_id] = time.monotonic()
+
+            return memory
+
+    def delete(self, session_id: str) -> None:
+        with self._lock:
+            self._sessions.pop(session_id, None)
+            self._last_access.pop(session_id, None)
+
+    def __contains__(self, session_id: str) -> bool:
+        with self._lock:
+            return session_id in self._sessions
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._sessions)
+
+    # Eviction
+
+    def _evict_overflow(self) -> None:
+        # Caller holds the lock
+        while len(self._sessions) > self.max_sessions:
+            session_id, _ = self._sessions.popitem(last=False)
+            self._last_access.pop(session_id, None)
+            self._evicted_lru += 1
+
+    def evict_expired(self) -> int:
+        """
+        Drop sessions idle for longer than ttl_seconds.
+        Returns the number of evicted sessions.
+        """
+        cutoff = time.monotonic() - self.ttl_seconds
+        evicted = 0
+
+        with self._lock:
+            # Oldest sessions come first, so stop at the first live one
+            while self._sessions:
+                session_id = next(iter(self._sessions))
+
+                if self._last_access.get(session_id, 0.0) > cutoff:
+                    break
+
+                self._sessions.popitem(last=False)
+                self._last_access.pop(session_id, None)
+                evicted += 1
+
+            self._evicted_ttl += evicted
+
+        return evicted
+
+    def start_eviction(self, interval_seconds: float = None) -> None:
+        """
+        Start the background thread that expires idle sessions.
+        """
+        if self._eviction_thread is not None and self._eviction_thread.is_alive():
+            return
+
+        interval = settings.SESSION_EVICTION_INTERVAL_SECONDS if interval_seconds is None else interval_seconds
+
+        def run():
+            while not self._stop_event.wait(interval):
+                self.evict_expired()
+
+        self._stop_event.clear()
+        self._eviction_thread = Thread(
+            target=run,
+            name="session-eviction",
+            daemon=True
+        )
+        self._eviction_thread.start()
+
+    def stop_eviction(self) -> None:
+        self._stop_event.set()
+
+    # Metrics
+
+    def metrics(self) -> Dict[str, float]:
+        """
+        Report live sessions and approximate memory held.
+        """
+        with self._lock:
+            sessions = list(self._sessions.items())
+            evicted_lru = self._evicted_lru
+            evicted_ttl = self._evicted_ttl
+
+        approx_bytes = sys.getsizeof(self._sessions) + sys.getsizeof(self._last_access)
+
+        for session_id, memory in sessions:
+            approx_bytes += sys.getsizeof(session_id) + memory.approximate_size()
+
+        return {
+            "live_sessions": len(sessions),
+            "max_sessions": self.max_sessions,
+            "ttl_seconds": self.ttl_seconds,
+            "max_history_messages": self.max_history,
+            "approx_bytes": approx_bytes,
+            "evicted_lru": evicted_lru,
+            "evicted_ttl": evicted_ttl,
+        }
+
+# app/memory/session_store.py
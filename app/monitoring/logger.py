@@ -0,0 +1,27 @@
+import logging
+
+from app.config import settings
+
+_configured = False
+
+
+def get_logger(name: str) -> logging.Logger:
+    """
+    Module logger under the "rag" hierarchy, leveled by LOG_LEVEL.
+    """
+    global _configured
+
+    if not _configured:
+        handler = logging.StreamHandler()
+        handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+
+        root = logging.getLogger("rag")
+        root.addHandler(handler)
+        root.setLevel(settings.LOG_LEVEL.upper())
+        root.propagate = False
+
+        _configured = True
+
+    return logging.getLogger(f"rag.{name}")
+
+# app/monitoring/logger.py
@@ -0,0 +1,196 @@
+import bisect
+import os
+import sys
+import time
+from contextlib import contextmanager
+from threading import Lock
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Union
+
+# Seconds; spans range from sub-millisecond cache hits to multi-second LLM calls
+DEFAULT_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+    0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0
+)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _format(value: float) -> str:
+    return "+Inf" if value == float("inf") else repr(float(value))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+class Histogram:
+    """
+    Prometheus-style histogram with a single label (e.g. stage).
+    """
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        label: str = "stage",
+        buckets: Sequence[float] = DEFAULT_BUCKETS
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.label = label
+        self.buckets = tuple(sorted(buckets))
+
+        # label value -> (per-bucket counts, +Inf count last), sum, count
+        self._series: Dict[str, list] = {}
+        self._lock = Lock()
+
+    def observe(self, value: str, seconds: float) -> None:
+        position = bisect.bisect_left(self.buckets, seconds)
+
+        with self._lock:
+            series = self._series.get(value)
+
+            if series is None:
+                series = [[0] * (len(self.buckets) + 1), 0.0, 0]
+                self._series[value] = series
+
+            series[0][position] += 1
+            series[1] += seconds
+            series[2] += 1
+
+    def record(self, timings: Dict[str, float]) -> None:
+        for value, seconds in timings.items():
+            self.observe(value, seconds)
+
+    @contextmanager
+    def time(self, value: str) -> Iterator[None]:
+        """
+        Observe the duration of the block (also when it raises).
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(value, time.perf_counter() - start)
+
+    def render(self) -> List[str]:
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} histogram",
+        ]
+
+        with self._lock:
+            series = {value: (list(counts), total, count) for value, (counts, total, count) in self._series.items()}
+
+        for value in sorted(series):
+            counts, total, count = series[value]
+            label = f'{self.label}="{_escape(value)}"'
+            cumulative = 0
+
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += bucket_count
+                lines.append(f'{self.name}_bucket{{{label},le="{_format(bound)}"}} {cumulative}')
+
+            lines.append(f"{self.name}_sum{{{label}}} {total!r}")
+            lines.append(f"{self.name}_count{{{label}}} {count}")
+
+        return lines
+
+    def summary(self) -> Dict[str, dict]:
+        with self._lock:
+            return {
+                value: {
+                    "count": count,
+                    "average_ms": round(1000 * total / count, 3) if count else 0.0,
+                }
+                for value, (_, total, count) in sorted(self._series.items())
+            }
+
+
+class Gauge:
+    """
+    Value read from a callback at scrape time; omitted when it returns None.
+    """
+
+    def __init__(self, name: str, documentation: str, read: Callable[[], Optional[float]]):
+        self.name = name
+        self.documentation = documentation
+        self.read = read
+
+    def render(self) -> List[str]:
+        value = self.read()
+
+        if value is None:
+            return []
+
+        return [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} gauge",
+            f"{self.name} {float(value)!r}",
+        ]
+
+
+class MetricsRegistry:
+
+    def __init__(self):
+        self._metrics: List[Union[Histogram, Gauge]] = []
+
+    def histogram(self, name: str, documentation: str, label: str = "stage") -> Histogram:
+        metric = Histogram(name, documentation, label)
+        self._metrics.append(metric)
+        return metric
+
+    def gauge(self, name: str, documentation: str, read: Callable[[], Optional[float]]) -> Gauge:
+        metric = Gauge(name, documentation, read)
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+def resident_memory_bytes() -> Optional[int]:
+    """
+    Current resident set size (Linux), else peak RSS where available.
+    """
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        pass
+
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # KiB on Linux, bytes on macOS
+        return peak if sys.platform == "darwin" else peak * 1024
+    except ImportError:
+        return None
+
+
+REGISTRY = MetricsRegistry()
+
+REGISTRY.gauge(
+    "process_resident_memory_bytes",
+    "Resident memory size in bytes.",
+    resident_memory_bytes
+)
+
+# Query path: embed, search, threshold, rerank, prompt_build,
+# llm_first_token, llm_total, memory_update, ask_total
+QUERY_STAGES = REGISTRY.histogram(
+    "rag_query_stage_seconds",
+    "Time spent per question-answering stage."
+)
+
+# Ingestion: parse, split, embed, index_add, save
+INGESTION_STAGES = REGISTRY.histogram(
+    "rag_ingestion_stage_seconds",
+    "Time spent per ingestion stage."
+)
+
+# app/monitoring/metrics.py
@@ -0,0 +1,130 @@
+import time
+from threading import Lock
+from typing import List, Tuple
+
+from langchain_core.documents import Document
+
+from app.config import settings
+
+
+class CrossEncoderReranker:
+    """
+    Reorders retrieval candidates with a local cross-encoder.
+    - Scores (query, chunk) pairs in batches
+    - Stops at a per-request time budget: candidates not scored in time
+      keep their vector order after the scored ones, so a slow model
+      degrades to plain vector ranking instead of stalling the request
+    """
+
+    def __init__(
+        self,
+        model_name: str = None,
+        batch_size: int = None,
+        budget_ms: float = None,
+        max_length: int = 512
+    ):
+        from sentence_transformers import CrossEncoder
+
+        self.model_name = settings.RERANK_MODEL if model_name is None else model_name
+        self.batch_size = settings.RERANK_BATCH_SIZE if batch_size is None else batch_size
+        self.budget_ms = settings.RERANK_TIME_BUDGET_MS if budget_ms is None else budget_ms
+
+        self.model = CrossEncoder(self.model_name, max_length=max_length)
+
+        self._stats_lock = Lock()
+        self._requests = 0
+        self._pairs_scored = 0
+        self._over_budget = 0
+        self._total_seconds = 0.0
+
+    def rerank(
+        self,
+        query: str,
+        candidates: List[Tuple[Document, float]],
+        top_n: int,
+        budget_ms: float = None
+    ) -> List[Tuple[Document, float]]:
+        return self.rerank_batch([query], [candidates], top_n, budget_ms)[0]
+
+    def rerank_batch(
+        self,
+        queries: List[str],
+        candidates: List[List[Tuple[Document, float]]],
+        top_n: int,
+        budget_ms: float = None
+    ) -> List[List[Tuple[Document, float]]]:
+        """
+        Keep the top_n of each query's candidates (as given, e.g.
+        (doc, L2 distance)), best cross-encoder score first.
+        All pairs share the batches and one time budget.
+        """
+        budget = (self.budget_ms if budget_ms is None else budget_ms) / 1000.0
+
+        # Candidates are scored in vector order, rank by rank across queries,
+        # so an exhausted budget still leaves every query's best hits scored
+        pairs = []
+        depth = max((len(c) for c in candidates), default=0)
+
+        for rank in range(depth):
+            for q, query in enumerate(queries):
+                if rank < len(candidates[q]):
+                    pairs.append((q, rank, query, candidates[q][rank][0].page_content))
+
+        scores = {}
+        start = time.perf_counter()
+        last_batch = 0.0
+        over_budget = False
+
+        for offset in range(0, len(pairs), self.batch_size):
+            # Skip a batch that would likely not finish in time
+            if time.perf_counter() - start + last_batch > budget:
+                over_budget = True
+                break
+
+            batch = pairs[offset:offset + self.batch_size]
+            batch_start = time.perf_counter()
+
+            predicted = self.model.predict(
+                [(query, text) for _, _, query, text in batch],
+                batch_size=self.batch_size,
+                show_progress_bar=False
+            )
+
+            last_batch = time.perf_counter() - batch_start
+
+            for (q, rank, _, _), score in zip(batch, predicted):
+                scores[(q, rank)] = float(score)
+
+        results = []
+
+        for q, query_candidates in enumerate(candidates):
+            scored = sorted(
+                (rank for rank in range(len(query_candidates)) if (q, rank) in scores),
+                key=lambda rank: scores[(q, rank)],
+                reverse=True
+            )
+            unscored = [rank for rank in range(len(query_candidates)) if (q, rank) not in scores]
+
+            results.append([query_candidates[rank] for rank in (scored + unscored)[:top_n]])
+
+        with self._stats_lock:
+            self._requests += 1
+            self._pairs_scored += len(scores)
+            self._over_budget += int(over_budget)
+            self._total_seconds += time.perf_counter() - start
+
+        return results
+
+    def stats(self) -> dict:
+        with self._stats_lock:
+            return {
+                "model": self.model_name,
+                "requests": self._requests,
+                "pairs_scored": self._pairs_scored,
+                "over_budget": self._over_budget,
+                "average_ms": (
+                    round(1000 * self._total_seconds / self._requests, 2) if self._requests else 0.0
+                ),
+            }
+
+# app/retrieval/reranker.py
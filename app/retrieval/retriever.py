@@ -1,68 +1,378 @@
-from typing import List, Tuple
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
 from langchain_core.documents import Document
 from app.vectorstore.faiss_store import FAISSVectorStore
+from app.retrieval.cache import LRUCache
+from app.retrieval.reranker import CrossEncoderReranker
+from app.monitoring.logger import get_logger
+from app.monitoring.metrics import QUERY_STAGES
 from app.config import settings
 
+
+logger = get_logger(__name__)
+
+
+VECTOR = "vector"
+HYBRID = "hybrid"
+
+
+def reciprocal_rank_fusion(rankings: Sequence[Sequence[int]], k: int = 60) -> List[Tuple[int, float]]:
+    """
+    Fuse ranked id lists: score(id) = sum over rankings of 1 / (k + rank).
+    """
+    scores: Dict[int, float] = {}
+
+    for ranking in rankings:
+        for rank, item in enumerate(ranking, start=1):
+            scores[item] = scores.get(item, 0.0) + 1.0 / (k + rank)
+
+    return sorted(scores.items(), key=lambda pair: pair[1], reverse=True)
+
+
 class SemanticRetriever:
+    """
+    Dense retrieval over the vector store, or hybrid retrieval
+    (BM25 + dense, reciprocal-rank fused) with mode="hybrid".
+    With a reranker, rerank_candidates hits are fetched and the
+    cross-encoder keeps the best top_k.
+
+    The a* methods run retrieval on a dedicated thread pool so the
+    event loop is not blocked by query embedding and index search;
+    at most max_concurrency of them are queued or running at once.
+    """
 
     def __init__(
         self,
         vector_store: FAISSVectorStore,
         top_k: int = None,
-        score_threshold: float = None
+        score_threshold: float = None,
+        query_cache_size: int = None,
+        result_cache_size: int = None,
+        nprobe: int = None,
+        ef_search: int = None,
+        mode: str = None,
+        hybrid_candidates: int = None,
+        rrf_k: int = None,
+        reranker: Optional[CrossEncoderReranker] = None,
+        rerank_candidates: int = None,
+        workers: int = None,
+        max_concurrency: int = None
     ):
         self.vector_store = vector_store
         self.top_k = settings.TOP_K if top_k is None else top_k
         self.score_threshold = settings.SCORE_THRESHOLD if score_threshold is None else score_threshold
-        
 
-    def retrieve(self, query: str) -> List[Document]:
+        # ANN search effort; None uses the vector store defaults
+        self.nprobe = nprobe
+        self.ef_search = ef_search
+
+        self.mode = settings.RETRIEVAL_MODE if mode is None else mode
+        if self.mode not in (VECTOR, HYBRID):
+            raise ValueError(f"Unsupported retrieval mode: {self.mode}")
+
+        self.hybrid_candidates = (
+            settings.HYBRID_CANDIDATES if hybrid_candidates is None else hybrid_candidates
+        )
+        self.rrf_k = settings.RRF_K if rrf_k is None else rrf_k
+
+        # Over-fetch for the reranker, which cuts back to top_k
+        self.reranker = reranker
+        rerank_candidates = settings.RERANK_CANDIDATES if rerank_candidates is None else rerank_candidates
+        self.fetch_k = max(self.top_k, rerank_candidates) if reranker is not None else self.top_k
+
+        # normalized query -> embedding
+        self.query_cache = LRUCache(
+            settings.QUERY_EMBEDDING_CACHE_SIZE if query_cache_size is None else query_cache_size
+        )
+
+        # (mode, normalized query, filters, fetch_k, search params, index version) -> [(doc, score)]
+        self.result_cache = LRUCache(
+            settings.RETRIEVAL_CACHE_SIZE if result_cache_size is None else result_cache_size
+        )
+        self._cached_version = vector_store.version
+
+        # Async retrieval: bounded thread pool plus a cap on waiting requests
+        self.workers = settings.RETRIEVAL_WORKERS if workers is None else workers
+        self.max_concurrency = (
+            settings.RETRIEVAL_MAX_CONCURRENCY if max_concurrency is None else max_concurrency
+        )
+        self.executor = ThreadPoolExecutor(
+            max_workers=max(1, self.workers),
+            thread_name_prefix="retrieval"
+        )
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    @staticmethod
+    def normalize_query(query: str) -> str:
+        return " ".join(query.split()).casefold()
 
+    def embed_query(self, query: str) -> np.ndarray:
+        return self.embed_queries([query])[0]
+
+    def embed_queries(self, queries: List[str]) -> np.ndarray:
+        """
+        Embed queries as one matrix; cached queries are not re-embedded
+        and the rest go through the model in a single batch.
+        """
+        # The normalized text is only the cache key; the model sees the query as asked
+        keys = [self.normalize_query(query) for query in queries]
+        vectors = [self.query_cache.get(key) for key in keys]
+
+        missing = {}
+        for key, query, vector in zip(keys, queries, vectors):
+            if vector is None:
+                missing.setdefault(key, query)
+
+        if missing:
+            with QUERY_STAGES.time("embed"):
+                fresh = dict(zip(missing, self.vector_store.embed_queries(list(missing.values()))))
+
+            for key, vector in fresh.items():
+                self.query_cache.put(key, vector)
+
+            vectors = [fresh[key] if vector is None else vector for key, vector in zip(keys, vectors)]
+
+        return np.vstack(vectors).astype("float32", copy=False)
+
+    @staticmethod
+    def filter_key(filters: Optional[Dict]) -> tuple:
+        if not filters:
+            return ()
+
+        return tuple(sorted(
+            (name, tuple(value) if isinstance(value, list) else value)
+            for name, value in filters.items()
+        ))
+
+    def _search(self, query: str, filters: Optional[Dict] = None) -> List[Tuple[Document, float]]:
+        return self._search_batch([query], filters)[0]
+
+    def _search_batch(
+        self,
+        queries: List[str],
+        filters: Optional[Dict] = None
+    ) -> List[List[Tuple[Document, float]]]:
+        """
+        Search for every query; cache misses are embedded together
+        and answered by one batched index search.
+        """
         if self.vector_store.index is None:
             raise ValueError("Vector index not initialized.")
 
-        results: List[Tuple[Document, float]] = (
-            self.vector_store.index.similarity_search_with_score(
-                query,
-                k=self.top_k
+        version = self.vector_store.version
+
+        # Index changed via create_index/add_documents: drop stale results
+        if version != self._cached_version:
+            self.result_cache.clear()
+            self._cached_version = version
+
+        filter_key = self.filter_key(filters)
+        keys = [
+            (
+                self.mode,
+                self.normalize_query(query),
+                filter_key,
+                self.fetch_k,
+                self.nprobe,
+                self.ef_search,
+                version
             )
+            for query in queries
+        ]
+
+        results = [self.result_cache.get(key) for key in keys]
+        misses = [i for i, result in enumerate(results) if result is None]
+
+        if not misses:
+            return results
+
+        # Filters become an id set applied inside the index search
+        labels = self.vector_store.select_labels(**filters) if filters else None
+
+        miss_queries = [queries[i] for i in misses]
+        vectors = self.embed_queries(miss_queries)
+
+        with QUERY_STAGES.time("search"):
+            if self.mode == HYBRID:
+                found = self._hybrid_search(miss_queries, vectors, labels)
+            else:
+                found = self.vector_store.search_by_vectors(
+                    vectors,
+                    k=self.fetch_k,
+                    nprobe=self.nprobe,
+                    ef_search=self.ef_search,
+                    labels=labels
+                )
+
+        for i, result in zip(misses, found):
+            results[i] = result
+            self.result_cache.put(keys[i], result)
+
+        return results
+
+    def _hybrid_search(
+        self,
+        queries: List[str],
+        vectors: np.ndarray,
+        labels: Optional[np.ndarray] = None
+    ) -> List[List[Tuple[Document, float]]]:
+        """
+        Fuse dense hits within the score threshold with BM25 hits,
+        returning (doc, fused score) with higher scores first.
+        """
+        candidates = max(self.hybrid_candidates, self.fetch_k)
+
+        distances, hit_labels = self.vector_store.search_labels(
+            vectors,
+            k=candidates,
+            nprobe=self.nprobe,
+            ef_search=self.ef_search,
+            labels=labels
         )
 
+        results = []
+
+        for query, row_distances, row_labels in zip(queries, distances, hit_labels):
+            dense = [
+                label
+                for distance, label in zip(row_distances.tolist(), row_labels.tolist())
+                if label != -1 and distance <= self.score_threshold
+            ]
+            lexical = [
+                label for label, _ in self.vector_store.lexical_search(query, candidates, labels=labels)
+            ]
+
+            fused = reciprocal_rank_fusion([dense, lexical], k=self.rrf_k)[:self.fetch_k]
+            docs = self.vector_store.get_documents([label for label, _ in fused])
+
+            results.append([(doc, score) for doc, (_, score) in zip(docs, fused) if doc is not None])
+
+        return results
+
+    def _within_threshold(self, results: List[Tuple[Document, float]]) -> List[Tuple[Document, float]]:
+        # Fused hybrid scores are not L2 distances; their dense side is already thresholded
+        if self.mode == HYBRID:
+            return results
+
+        return [(doc, score) for doc, score in results if score <= self.score_threshold]
+
+    def _finalize(
+        self,
+        queries: List[str],
+        batch: List[List[Tuple[Document, float]]]
+    ) -> List[List[Tuple[Document, float]]]:
+        """
+        Threshold the candidates and, with a reranker, keep the best top_k.
+        Scores stay the retrieval scores; only the order changes.
+        """
+        with QUERY_STAGES.time("threshold"):
+            batch = [self._within_threshold(results) for results in batch]
+
+        if self.reranker is None:
+            return batch
+
+        with QUERY_STAGES.time("rerank"):
+            return self.reranker.rerank_batch(queries, batch, self.top_k)
+
+    def retrieve(self, query: str, filters: Optional[Dict] = None) -> List[Document]:
+
+        results: List[Tuple[Document, float]] = self._search(query, filters)
+
+        # Thresholded on the vector scores, then reranked, in one pass
+        if self.reranker is not None:
+            return [doc for doc, _ in self._finalize([query], [results])[0]]
+
+        # Fused scores are already thresholded rankings, not L2 distances
+        if self.mode == HYBRID:
+            return [doc for doc, _ in results]
+
         filtered_docs = []
 
-        for doc, score in results:
-            print("Score:", score)
-            print("Threshold:", self.score_threshold)
-            
-            # Fixed: This if statement is now INSIDE the loop
-            if score <= self.score_threshold:
-                filtered_docs.append(doc)
+        with QUERY_STAGES.time("threshold"):
+            for doc, score in results:
+                logger.debug("Score: %s (threshold %s)", score, self.score_threshold)
+
+                # Fixed: This if statement is now INSIDE the loop
+                if score <= self.score_threshold:
+                    filtered_docs.append(doc)
 
-        print("Retrieved docs count:", len(filtered_docs))
+        logger.debug("Retrieved docs count: %d", len(filtered_docs))
 
         return filtered_docs
 
-    def retrieve_with_scores(self, query: str) -> List[Tuple[Document, float]]:
+    def retrieve_with_scores(
+        self,
+        query: str,
+        filters: Optional[Dict] = None
+    ) -> List[Tuple[Document, float]]:
         """
-        Retrieve documents with their similarity scores.
+        Retrieve documents with their similarity scores
+        (L2 distances, or fused RRF scores in hybrid mode).
         Used for evaluation purposes.
         """
-        if self.vector_store.index is None:
-            raise ValueError("Vector index not initialized.")
+        results: List[Tuple[Document, float]] = self._search(query, filters)
 
-        results: List[Tuple[Document, float]] = (
-            self.vector_store.index.similarity_search_with_score(
-                query,
-                k=self.top_k
-            )
-        )
+        return self._finalize([query], [results])[0]
+
+    def retrieve_batch_with_scores(
+        self,
+        queries: List[str],
+        filters: Optional[Dict] = None
+    ) -> List[List[Tuple[Document, float]]]:
+        """
+        retrieve_with_scores for many queries: one embedding call
+        and one index search for the whole batch.
+        """
+        return self._finalize(queries, self._search_batch(queries, filters))
+
+    def retrieve_batch(
+        self,
+        queries: List[str],
+        filters: Optional[Dict] = None
+    ) -> List[List[Document]]:
+        return [
+            [doc for doc, _ in results]
+            for results in self.retrieve_batch_with_scores(queries, filters)
+        ]
+
+    # Async
+
+    async def _offload(self, fn: Callable, *args) -> Any:
+        # Created on first use, inside the serving event loop
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(max(1, self.max_concurrency))
+
+        async with self._semaphore:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self.executor, partial(fn, *args))
+
+    async def aembed_query(self, query: str) -> np.ndarray:
+        return await self._offload(self.embed_query, query)
+
+    async def aretrieve(self, query: str, filters: Optional[Dict] = None) -> List[Document]:
+        return await self._offload(self.retrieve, query, filters)
+
+    async def aretrieve_batch(
+        self,
+        queries: List[str],
+        filters: Optional[Dict] = None
+    ) -> List[List[Document]]:
+        return await self._offload(self.retrieve_batch, queries, filters)
+
+    def shutdown(self) -> None:
+        self.executor.shutdown(wait=False)
 
-        filtered_results = []
+    def cache_stats(self) -> dict:
+        return {
+            "query_embeddings": self.query_cache.stats(),
+            "results": self.result_cache.stats(),
+        }
 
-        for doc, score in results:
-            if score <= self.score_threshold:
-                filtered_results.append((doc, score))
+    def rerank_stats(self) -> Optional[dict]:
+        return self.reranker.stats() if self.reranker is not None else None
 
-        return filtered_results
-    
 # app/retrieval/retriever.py
@@ -5,9 +5,24 @@ from typing import List, Optional
 from pydantic import BaseModel
 from typing import List, Optional
 
+class SearchFilters(BaseModel):
+    sources: Optional[List[str]] = None   # doc ids / file names
+    tags: Optional[List[str]] = None   # any of
+    page_min: Optional[int] = None
+    page_max: Optional[int] = None
+    uploaded_after: Optional[float] = None   # unix time
+    uploaded_before: Optional[float] = None
+
+
 class QuestionRequest(BaseModel):
     question: str
     session_id: str
+    filters: Optional[SearchFilters] = None
+
+
+class BatchQuestionRequest(BaseModel):
+    questions: List[str]
+    filters: Optional[SearchFilters] = None
 
 
 class SourceItem(BaseModel):
@@ -21,9 +36,34 @@ class QuestionResponse(BaseModel):
     confidence: str
 
 
+class BatchQuestionResponse(BaseModel):
+    results: List[QuestionResponse]
+
+
 class UploadResponse(BaseModel):
     message: str
+    job_id: str
+    status: str
+
+
+class BulkIngestRequest(BaseModel):
+    directory: str
+
+
+class JobStatusResponse(BaseModel):
+    job_id: str
+    file_path: str
+    status: str
+    pages_parsed: int
     total_chunks: int
+    chunks_embedded: int
+    files_total: int = 0
+    files_completed: int = 0
+    files_skipped: int = 0
+    files_failed: int = 0
+    error: Optional[str]
+    created_at: float
+    finished_at: Optional[float]
 
     
 # app/schemas/models.py
@@ -0,0 +1,91 @@
+import argparse
+import json
+import os
+import shutil
+import tempfile
+import time
+
+from app.benchmark.harness import RetrievalBenchmark, environment
+from app.vectorstore.index_factory import IndexConfig
+from app.config import settings
+
+
+parser = argparse.ArgumentParser(
+    description="Offline ingestion/retrieval benchmark on a synthetic corpus (stub embedder, no LLM)."
+)
+parser.add_argument("--chunks", type=int, default=10000, help="corpus size in chunks (10k-1M)")
+parser.add_argument("--dimension", type=int, default=384)
+parser.add_argument("--index-type", default=settings.VECTORSTORE_INDEX_TYPE)
+parser.add_argument("--nprobe", type=int, default=settings.VECTORSTORE_NPROBE)
+parser.add_argument("--ef-search", type=int, default=settings.VECTORSTORE_EF_SEARCH)
+parser.add_argument("--mode", default="vector", choices=["vector", "hybrid"])
+parser.add_argument("--top-k", type=int, default=settings.TOP_K)
+parser.add_argument("--queries", type=int, default=1000)
+parser.add_argument("--concurrency", default="1,4,16", help="comma-separated thread counts")
+parser.add_argument("--files", type=int, default=10, help="PDFs for the ingestion benchmark (0 skips it)")
+parser.add_argument("--pages", type=int, default=20, help="pages per PDF")
+parser.add_argument("--seed", type=int, default=0)
+parser.add_argument("--workdir", default=None, help="kept after the run when given; must be empty or missing")
+parser.add_argument("--output", default="benchmark-report.json")
+args = parser.parse_args()
+
+if args.workdir and os.path.isdir(args.workdir) and os.listdir(args.workdir):
+    parser.error(f"--workdir {args.workdir} is not empty; remove it or pick a new directory")
+
+workdir = args.workdir or tempfile.mkdtemp(prefix="rag-benchmark-")
+
+benchmark = RetrievalBenchmark(
+    workdir,
+    chunks=args.chunks,
+    dimension=args.dimension,
+    index_config=IndexConfig(
+        index_type=args.index_type,
+        nlist=settings.VECTORSTORE_NLIST,
+        pq_m=settings.VECTORSTORE_PQ_M,
+        hnsw_m=settings.VECTORSTORE_HNSW_M,
+        nprobe=args.nprobe,
+        ef_search=args.ef_search,
+        auto_threshold=settings.VECTORSTORE_AUTO_ANN_THRESHOLD
+    ),
+    seed=args.seed,
+    top_k=args.top_k,
+    mode=args.mode
+)
+
+report = {
+    "created_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+    "environment": environment(),
+    "config": vars(args),
+    "results": {},
+}
+
+try:
+    if args.files > 0:
+        report["results"]["ingestion"] = benchmark.ingestion(args.files, args.pages)
+        print("ingestion:", report["results"]["ingestion"])
+
+    report["results"]["embedding"] = benchmark.embedding()
+    print("embedding:", report["results"]["embedding"])
+
+    report["results"]["index"] = benchmark.index_build(lexical=args.mode == "hybrid")
+    print("index:", report["results"]["index"])
+
+    report["results"]["retrieval"] = benchmark.retrieval(
+        args.queries,
+        [int(level) for level in args.concurrency.split(",")],
+        nprobe=args.nprobe,
+        ef_search=args.ef_search
+    )
+    for level in report["results"]["retrieval"]:
+        print("retrieval:", level)
+
+finally:
+    if args.workdir is None:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+with open(args.output, "w", encoding="utf-8") as f:
+    json.dump(report, f, indent=2)
+
+print(f"Report written to {args.output}")
+
+# app/scripts/benchmark.py
@@ -0,0 +1,46 @@
+import argparse
+import time
+
+from app.jobs.bulk_ingest import BulkIngestor
+from app.vectorstore.faiss_store import FAISSVectorStore
+from app.config import settings
+
+
+parser = argparse.ArgumentParser(
+    description="Ingest every PDF/DOCX below a directory. Re-running resumes an interrupted import."
+)
+parser.add_argument("directory")
+parser.add_argument("--manifest", default=None, help="completed-files manifest (default: per directory)")
+parser.add_argument("--workers", type=int, default=settings.INGESTION_PARSE_WORKERS)
+parser.add_argument("--batch-size", type=int, default=settings.INGESTION_BATCH_SIZE)
+args = parser.parse_args()
+
+vector_store = FAISSVectorStore.from_settings()
+
+# Only a missing index means starting empty; any load error must stop the import
+if vector_store.index_exists():
+    vector_store.load_index()
+
+ingestor = BulkIngestor(
+    vector_store,
+    workers=args.workers,
+    batch_size=args.batch_size
+)
+
+start = time.perf_counter()
+
+try:
+    job = ingestor.run(args.directory, manifest_path=args.manifest)
+finally:
+    vector_store.embeddings.close()
+
+elapsed = time.perf_counter() - start
+
+print(f"Files: {job.files_total} total, {job.files_completed} ingested, "
+      f"{job.files_skipped} skipped, {job.files_failed} failed")
+print(f"Pages: {job.pages_parsed}, chunks: {job.chunks_embedded} in {elapsed:.1f}s")
+
+if job.error:
+    print(f"Last error: {job.error}")
+
+# app/scripts/bulk_ingest.py
@@ -0,0 +1,88 @@
+import argparse
+import json
+import shutil
+import tempfile
+
+from app.evaluation.evaluator import load_dataset
+from app.evaluation.sweep import RetrievalSweep, format_table, pareto_front
+from app.vectorstore.faiss_store import FAISSVectorStore
+from app.vectorstore.index_factory import IndexConfig
+from app.config import settings
+
+
+def int_list(value: str):
+    return [int(item) for item in value.split(",")]
+
+
+def float_list(value: str):
+    return [float(item) for item in value.split(",")]
+
+
+parser = argparse.ArgumentParser(
+    description="Retrieval quality vs latency over a labelled dataset, swept across configurations."
+)
+parser.add_argument("dataset", help="JSONL/JSON of {question, relevant: [{source, page, text}]}")
+parser.add_argument("--documents", default=None,
+                    help="directory to re-chunk per chunk size/overlap (default: evaluate the saved index)")
+parser.add_argument("--chunk-sizes", type=int_list, default=[settings.CHUNK_SIZE])
+parser.add_argument("--overlaps", type=int_list, default=[settings.CHUNK_OVERLAP])
+parser.add_argument("--k", type=int_list, default=[settings.TOP_K])
+parser.add_argument("--nprobe", type=int_list, default=[settings.VECTORSTORE_NPROBE])
+parser.add_argument("--thresholds", type=float_list, default=[settings.SCORE_THRESHOLD])
+parser.add_argument("--index-type", default=settings.VECTORSTORE_INDEX_TYPE)
+parser.add_argument("--workers", type=int, default=4, help="parallel queries")
+parser.add_argument("--stub-embeddings", action="store_true", help="offline hashing embedder for --documents smoke runs")
+parser.add_argument("--quality", default="recall", choices=["recall", "hit_rate", "mrr", "ndcg"])
+parser.add_argument("--output", default=None, help="JSON report path")
+args = parser.parse_args()
+
+dataset = load_dataset(args.dataset)
+
+embeddings = None
+if args.stub_embeddings:
+    from app.benchmark.stubs import HashingEmbeddingEngine
+    embeddings = HashingEmbeddingEngine()
+
+vector_store = None
+if args.documents is None:
+    vector_store = FAISSVectorStore.from_settings()
+    vector_store.load_index()
+
+workdir = tempfile.mkdtemp(prefix="rag-sweep-")
+
+try:
+    sweep = RetrievalSweep(
+        dataset,
+        workdir,
+        embeddings=embeddings,
+        index_config=IndexConfig(
+            index_type=args.index_type,
+            nlist=settings.VECTORSTORE_NLIST,
+            pq_m=settings.VECTORSTORE_PQ_M,
+            hnsw_m=settings.VECTORSTORE_HNSW_M,
+            nprobe=settings.VECTORSTORE_NPROBE,
+            ef_search=settings.VECTORSTORE_EF_SEARCH,
+            auto_threshold=settings.VECTORSTORE_AUTO_ANN_THRESHOLD
+        ),
+        documents_dir=args.documents,
+        vector_store=vector_store,
+        workers=args.workers
+    )
+
+    rows = sweep.run(args.chunk_sizes, args.overlaps, args.k, args.nprobe, args.thresholds)
+
+finally:
+    shutil.rmtree(workdir, ignore_errors=True)
+
+rows = pareto_front(rows, quality=args.quality)
+
+print(format_table(rows, [
+    "pareto", "chunk_size", "chunk_overlap", "k", "nprobe", "threshold", "index_type",
+    "recall", "hit_rate", "mrr", "ndcg", "p50_ms", "p95_ms", "p99_ms", "qps"
+]))
+
+if args.output:
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump({"config": vars(args), "results": rows}, f, indent=2)
+
+# app/scripts/evaluate_retrieval.py
@@ -0,0 +1,161 @@
+import argparse
+import asyncio
+import json
+import re
+import time
+import uuid
+
+import httpx
+
+from app.benchmark.stats import latency_summary
+from app.config import settings
+
+
+DEFAULT_QUESTIONS = [
+    "What is the termination clause?",
+    "What is the payment schedule?",
+    "What are the penalties for late delivery?",
+    "Who are the parties to the agreement?",
+    "How long is the contract term?",
+    "What are the confidentiality obligations?",
+    "How can the contract be renewed?",
+    "Which law governs the agreement?",
+]
+
+RSS_PATTERN = re.compile(r"^process_resident_memory_bytes (\S+)$", re.MULTILINE)
+
+
+parser = argparse.ArgumentParser(
+    description="Drive /ask or /ask-stream with concurrent sessions. Start the server with "
+                "LLM_PROVIDER=stub to measure capacity without LLM quota; disable "
+                "ANSWER_CACHE_ENABLED / COALESCE_REQUESTS to measure uncached generation."
+)
+parser.add_argument("--url", default="http://localhost:8000")
+parser.add_argument("--api-key", default=settings.RAG_API_KEY)
+parser.add_argument("--endpoint", default="ask-stream", choices=["ask", "ask-stream"])
+parser.add_argument("--sessions", type=int, default=10, help="concurrent sessions")
+parser.add_argument("--duration", type=float, default=60, help="seconds")
+parser.add_argument("--questions", default=None, help="file with one question per line")
+parser.add_argument("--sample-interval", type=float, default=5, help="seconds between memory samples")
+parser.add_argument("--timeout", type=float, default=120)
+parser.add_argument("--output", default=None, help="JSON report path")
+args = parser.parse_args()
+
+if args.questions:
+    with open(args.questions, "r", encoding="utf-8") as f:
+        questions = [line.strip() for line in f if line.strip()]
+else:
+    questions = DEFAULT_QUESTIONS
+
+
+class Results:
+
+    def __init__(self):
+        self.latencies = []
+        self.first_tokens = []
+        self.errors = 0
+        self.memory = []
+
+
+async def session(client: httpx.AsyncClient, number: int, deadline: float, results: Results) -> None:
+    session_id = f"load-{uuid.uuid4().hex[:8]}"
+    turn = number
+
+    while time.perf_counter() < deadline:
+        payload = {"question": questions[turn % len(questions)], "session_id": session_id}
+        turn += 1
+        start = time.perf_counter()
+
+        try:
+            if args.endpoint == "ask":
+                response = await client.post("/ask", json=payload)
+                response.raise_for_status()
+            else:
+                first_token = None
+
+                async with client.stream("POST", "/ask-stream", json=payload) as response:
+                    response.raise_for_status()
+
+                    async for text in response.aiter_text():
+                        if text and first_token is None:
+                            first_token = time.perf_counter() - start
+
+                if first_token is not None:
+                    results.first_tokens.append(first_token)
+
+        except httpx.HTTPError:
+            results.errors += 1
+            continue
+
+        results.latencies.append(time.perf_counter() - start)
+
+
+async def sample_memory(client: httpx.AsyncClient, started: float, deadline: float, results: Results) -> None:
+    """
+    Server RSS from /metrics, alongside requests completed so far.
+    """
+    while True:
+        try:
+            response = await client.get("/metrics")
+            match = RSS_PATTERN.search(response.text)
+
+            if match:
+                results.memory.append({
+                    "elapsed_s": round(time.perf_counter() - started, 1),
+                    "rss_mb": round(float(match.group(1)) / 2 ** 20, 1),
+                    "completed": len(results.latencies),
+                })
+        except httpx.HTTPError:
+            pass
+
+        if time.perf_counter() >= deadline:
+            return
+
+        await asyncio.sleep(min(args.sample_interval, max(deadline - time.perf_counter(), 0)))
+
+
+async def main() -> dict:
+    results = Results()
+    limits = httpx.Limits(max_connections=args.sessions + 1)
+
+    async with httpx.AsyncClient(
+        base_url=args.url,
+        headers={"X-API-Key": args.api_key},
+        timeout=args.timeout,
+        limits=limits
+    ) as client:
+        started = time.perf_counter()
+        deadline = started + args.duration
+
+        await asyncio.gather(
+            sample_memory(client, started, deadline, results),
+            *(session(client, i, deadline, results) for i in range(args.sessions))
+        )
+
+        elapsed = time.perf_counter() - started
+
+    memory = results.memory
+
+    return {
+        "endpoint": args.endpoint,
+        "sessions": args.sessions,
+        "duration_s": round(elapsed, 1),
+        "requests": len(results.latencies),
+        "errors": results.errors,
+        "throughput_rps": round(len(results.latencies) / elapsed, 2) if elapsed else 0.0,
+        "latency": latency_summary(results.latencies),
+        "time_to_first_token": latency_summary(results.first_tokens) if args.endpoint == "ask-stream" else None,
+        "memory": memory,
+        "memory_growth_mb": round(memory[-1]["rss_mb"] - memory[0]["rss_mb"], 1) if len(memory) > 1 else None,
+    }
+
+
+report = asyncio.run(main())
+
+print(json.dumps(report, indent=2))
+
+if args.output:
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+
+# app/scripts/load_test.py
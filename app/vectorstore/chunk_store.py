@@ -0,0 +1,231 @@
+import json
+import mmap
+from threading import Lock
+from typing import Dict, List, Optional, Tuple, Union
+
+import numpy as np
+from langchain_core.documents import Document
+from langchain_community.docstore.base import AddableMixin, Docstore
+
+
+class LabelIdMap(dict):
+    """
+    FAISS label -> docstore id mapping.
+    Docstore ids are the labels themselves, so lookups are computed
+    instead of holding one dict entry per chunk.
+    """
+
+    def __missing__(self, label: int) -> str:
+        return str(label)
+
+
+class ChunkRecord:
+    """
+    Compact in-memory chunk, held only until its segment is saved.
+    """
+
+    __slots__ = ("page_content", "metadata")
+
+    def __init__(self, page_content: str, metadata: dict):
+        self.page_content = page_content
+        self.metadata = metadata
+
+    def to_document(self) -> Document:
+        return Document(page_content=self.page_content, metadata=dict(self.metadata))
+
+
+class _SegmentFile:
+
+    __slots__ = ("path", "file", "data", "_lock")
+
+    def __init__(self, path: str):
+        self.path = path
+        self.file = None
+        self.data = None
+        self._lock = Lock()
+
+    def _open(self) -> mmap.mmap:
+        # Mapped on the first read, so segments nobody searches cost nothing
+        with self._lock:
+            if self.data is None:
+                self.file = open(self.path, "rb")
+                self.data = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+            return self.data
+
+    def read(self, offset: int) -> dict:
+        data = self.data if self.data is not None else self._open()
+        end = data.find(b"\n", offset)
+        return json.loads(data[offset:end if end != -1 else len(data)])
+
+    def close(self) -> None:
+        with self._lock:
+            if self.data is not None:
+                self.data.close()
+                self.file.close()
+            self.data = None
+            self.file = None
+
+
+class ChunkStore(Docstore, AddableMixin):
+    """
+    Offset-indexed chunk store over the segment docs files.
+
+    Persisted chunks stay on disk (memory-mapped on first use) and are
+    parsed only when a search hits them; RAM holds three sorted numpy
+    arrays (label, file, offset) instead of one Document per chunk.
+    Chunks added since the last save live in memory as ChunkRecords.
+    """
+
+    def __init__(self, sources: Optional[List[Tuple[str, np.ndarray, np.ndarray]]] = None):
+        self._segments: List[_SegmentFile] = []
+
+        self._labels = np.empty(0, dtype="int64")
+        self._file_ids = np.empty(0, dtype="int32")
+        self._offsets = np.empty(0, dtype="int64")
+
+        self._memory: Dict[int, ChunkRecord] = {}
+
+        # Deleted labels that are, or will be once saved, in a segment
+        self._deleted = set()
+
+        self.add_segments(sources or [])
+
+    def __len__(self) -> int:
+        deleted = np.fromiter(self._deleted, dtype="int64", count=len(self._deleted))
+        return len(self._labels) + len(self._memory) - int(self._persisted(deleted).sum())
+
+    def _persisted(self, labels: np.ndarray) -> np.ndarray:
+        # Mask of the labels found in the segment lookup arrays
+        if not len(self._labels) or not len(labels):
+            return np.zeros(len(labels), dtype=bool)
+
+        positions = np.minimum(np.searchsorted(self._labels, labels), len(self._labels) - 1)
+        return self._labels[positions] == labels
+
+    # Persisted Segments
+
+    def add_segments(self, sources: List[Tuple[str, np.ndarray, np.ndarray]]) -> None:
+        """
+        Attach saved segment files; their chunks are dropped from memory.
+        """
+        attached = {segment.path for segment in self._segments}
+        sources = [source for source in sources if source[0] not in attached]
+
+        if not sources:
+            return
+
+        labels = [self._labels]
+        file_ids = [self._file_ids]
+        offsets = [self._offsets]
+
+        for path, segment_labels, segment_offsets in sources:
+            file_id = len(self._segments)
+            self._segments.append(_SegmentFile(path))
+
+            segment_labels = np.asarray(segment_labels, dtype="int64")
+            labels.append(segment_labels)
+            file_ids.append(np.full(len(segment_labels), file_id, dtype="int32"))
+            offsets.append(np.asarray(segment_offsets, dtype="int64"))
+
+            for label in segment_labels.tolist():
+                self._memory.pop(label, None)
+
+        self._set_lookup(np.concatenate(labels), np.concatenate(file_ids), np.concatenate(offsets))
+
+    def replace_segments(self, paths: List[str], source: Tuple[str, np.ndarray, np.ndarray]) -> None:
+        """
+        Swap compacted segment files for their merged replacement,
+        closing them; labels dropped by the merge stop being tracked.
+        """
+        dropped = [i for i, segment in enumerate(self._segments) if segment.path in paths]
+
+        if not dropped:
+            return
+
+        for i in dropped:
+            self._segments[i].close()
+
+        # Renumber the remaining files
+        kept = [i for i in range(len(self._segments)) if i not in dropped]
+        renumber = np.full(len(self._segments), -1, dtype="int32")
+        renumber[kept] = np.arange(len(kept), dtype="int32")
+
+        keep = renumber[self._file_ids] != -1
+        self._segments = [self._segments[i] for i in kept]
+        self._labels = self._labels[keep]
+        self._file_ids = renumber[self._file_ids[keep]]
+        self._offsets = self._offsets[keep]
+
+        newest = int(self._labels.max()) if len(self._labels) else -1
+        self.add_segments([source])
+        newest = max(newest, int(self._labels.max()) if len(self._labels) else -1)
+
+        # Deleted labels no segment holds any more; newer ones are still unsaved
+        deleted = np.fromiter(self._deleted, dtype="int64", count=len(self._deleted))
+        stale = ~self._persisted(deleted) & (deleted <= newest)
+        self._deleted.difference_update(deleted[stale].tolist())
+
+    def _set_lookup(self, labels: np.ndarray, file_ids: np.ndarray, offsets: np.ndarray) -> None:
+        # New segments hold newer labels, so the arrays usually stay sorted as appended
+        if len(labels) > 1 and not np.all(labels[1:] > labels[:-1]):
+            order = np.argsort(labels, kind="stable")
+            labels, file_ids, offsets = labels[order], file_ids[order], offsets[order]
+
+        # Sorted label -> (file, offset) lookup arrays
+        self._labels = labels
+        self._file_ids = file_ids
+        self._offsets = offsets
+
+    def labels(self) -> np.ndarray:
+        """
+        Labels of all live chunks, persisted and in memory.
+        """
+        labels = np.concatenate([
+            self._labels,
+            np.fromiter(self._memory.keys(), dtype="int64", count=len(self._memory))
+        ])
+
+        if self._deleted:
+            labels = labels[~np.isin(labels, list(self._deleted))]
+
+        return labels
+
+    # Docstore interface
+
+    def add(self, texts: Dict[str, Document]) -> None:
+        for _id, doc in texts.items():
+            self._memory[int(_id)] = ChunkRecord(doc.page_content, doc.metadata)
+
+    def delete(self, ids: List) -> None:
+        for _id in ids:
+            self._memory.pop(int(_id), None)
+            self._deleted.add(int(_id))
+
+    def search(self, search: str) -> Union[str, Document]:
+        label = int(search)
+
+        if label in self._deleted:
+            return f"ID {search} not found."
+
+        record = self._memory.get(label)
+        if record is not None:
+            return record.to_document()
+
+        position = int(np.searchsorted(self._labels, label))
+
+        if position >= len(self._labels) or self._labels[position] != label:
+            return f"ID {search} not found."
+
+        segment = self._segments[self._file_ids[position]]
+        data = segment.read(int(self._offsets[position]))
+
+        return Document(
+            page_content=data["page_content"],
+            metadata=data["metadata"]
+        )
+
+    def close(self) -> None:
+        for segment in self._segments:
+            segment.close()
+
+# app/vectorstore/chunk_store.py
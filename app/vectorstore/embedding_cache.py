@@ -0,0 +1,169 @@
+import hashlib
+import os
+import sqlite3
+import time
+from threading import Lock
+from typing import Dict, List
+
+import numpy as np
+
+
+class EmbeddingCache:
+    """
+    Persistent, content-addressed embedding cache backed by SQLite.
+    Keys are hash(model + chunk text), so unchanged chunks of a
+    re-uploaded or revised document are never embedded twice.
+    Least recently used entries are evicted beyond max_entries.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        model_name: str,
+        max_entries: int = 500000
+    ):
+        self.path = path
+        self.model_name = model_name
+        self.max_entries = max_entries
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings ("
+            " key TEXT PRIMARY KEY,"
+            " vector BLOB NOT NULL,"
+            " last_used REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_embeddings_last_used ON embeddings (last_used)"
+        )
+        self._conn.commit()
+
+        # Running row count, so inserts need not count the whole table
+        self._count = self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+
+        self._lock = Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def key(self, text: str) -> str:
+        digest = hashlib.sha256()
+        digest.update(self.model_name.encode("utf-8"))
+        digest.update(b"\0")
+        digest.update(text.encode("utf-8"))
+        return digest.hexdigest()
+
+    # Lookup
+
+    def get_many(self, keys: List[str]) -> Dict[str, np.ndarray]:
+        """
+        Return cached vectors for the keys that are present.
+        """
+        found: Dict[str, np.ndarray] = {}
+        unique_keys = list(dict.fromkeys(keys))
+
+        with self._lock:
+            # Stay well under SQLite's bound-parameter limit
+            for start in range(0, len(unique_keys), 500):
+                batch = unique_keys[start:start + 500]
+                placeholders = ",".join("?" * len(batch))
+
+                rows = self._conn.execute(
+                    f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders})",
+                    batch
+                ).fetchall()
+
+                for key, blob in rows:
+                    found[key] = np.frombuffer(blob, dtype="float32")
+
+            if found:
+                now = time.time()
+                self._conn.executemany(
+                    "UPDATE embeddings SET last_used = ? WHERE key = ?",
+                    [(now, key) for key in found]
+                )
+                self._conn.commit()
+
+            self.hits += sum(1 for key in keys if key in found)
+            self.misses += sum(1 for key in keys if key not in found)
+
+        return found
+
+    # Insert
+
+    def put_many(self, keys: List[str], vectors: np.ndarray) -> None:
+        """
+        Store vectors for keys, evicting old entries if over capacity.
+        """
+        if not keys:
+            return
+
+        now = time.time()
+        rows = {
+            key: (key, np.asarray(vector, dtype="float32").tobytes(), now)
+            for key, vector in zip(keys, vectors)
+        }
+
+        with self._lock:
+            # Keys already stored are replaced, not added
+            existing = 0
+            unique_keys = list(rows)
+            for start in range(0, len(unique_keys), 500):
+                batch = unique_keys[start:start + 500]
+                placeholders = ",".join("?" * len(batch))
+                existing += self._conn.execute(
+                    f"SELECT COUNT(*) FROM embeddings WHERE key IN ({placeholders})",
+                    batch
+                ).fetchone()[0]
+
+            self._count += len(rows) - existing
+
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (key, vector, last_used) VALUES (?, ?, ?)",
+                list(rows.values())
+            )
+            self._evict()
+            self._conn.commit()
+
+    def _evict(self) -> None:
+        # Caller holds the lock
+        overflow = self._count - self.max_entries
+
+        if overflow <= 0:
+            return
+
+        deleted = self._conn.execute(
+            "DELETE FROM embeddings WHERE key IN ("
+            " SELECT key FROM embeddings ORDER BY last_used ASC LIMIT ?)",
+            (overflow,)
+        ).rowcount
+        self._count -= deleted
+        self.evictions += deleted
+
+    # Metrics
+
+    def stats(self) -> Dict:
+        with self._lock:
+            entries = self._count
+            lookups = self.hits + self.misses
+
+            return {
+                "entries": entries,
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+                "evictions": self.evictions,
+            }
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+# app/vectorstore/embedding_cache.py
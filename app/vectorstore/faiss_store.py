@@ -1,9 +1,36 @@
 import os
-from typing import List, Optional
+import time
+from threading import RLock, Thread
+from typing import Dict, List, Optional, Tuple
 
+import faiss
+import numpy as np
 from langchain_core.documents import Document
 from langchain_community.vectorstores import FAISS
-from langchain_community.embeddings import HuggingFaceEmbeddings
+
+from app.vectorstore.embeddings import EmbeddingEngine
+from app.vectorstore.embedding_cache import EmbeddingCache
+from app.vectorstore.persistence import SegmentStore, page_number
+from app.vectorstore.chunk_store import ChunkStore, LabelIdMap
+from app.vectorstore.lexical_index import BM25Index
+from app.vectorstore.locks import ReadWriteLock
+from app.monitoring.logger import get_logger
+from app.monitoring.metrics import INGESTION_STAGES
+from app.config import settings
+from app.vectorstore.index_factory import (
+    FLAT,
+    HNSW,
+    IVF_FLAT,
+    IVF_PQ,
+    IndexConfig,
+    build_index,
+    id_selector,
+    index_kind,
+    search_parameters
+)
+
+
+logger = get_logger(__name__)
 
 
 class FAISSVectorStore:
@@ -11,64 +38,1061 @@ class FAISSVectorStore:
     Manages FAISS index lifecycle:
     - Create
     - Load
-    - Save
+    - Save (incremental, append-only segments)
     - Add documents
+    - Delete / replace documents
     - Provide retriever
+
+    Chunk text lives in an offset-indexed ChunkStore and is read
+    from disk only for search hits.
     """
 
     def __init__(
         self,
         embedding_model_name: str = "sentence-transformers/all-MiniLM-L6-v2",
-        persist_path: str = "data/vectorstore"
+        persist_path: str = "data/vectorstore",
+        embeddings: Optional[EmbeddingEngine] = None,
+        embedding_cache_path: Optional[str] = None,
+        embedding_cache_max_entries: int = 500000,
+        max_segments: int = 16,
+        index_config: Optional[IndexConfig] = None,
+        snapshot_interval: int = 100000,
+        mmap: bool = False,
+        lexical_index: bool = False
     ):
         self.persist_path = persist_path
 
         # Ensure persistence directory exists
         os.makedirs(self.persist_path, exist_ok=True)
 
-        # Initialize embedding model
-        self.embeddings = HuggingFaceEmbeddings(
+        # Initialize embedding engine
+        self.embeddings = embeddings or EmbeddingEngine(
             model_name=embedding_model_name
         )
 
+        # Content-addressed cache, keyed per model and normalization
+        self.embedding_cache: Optional[EmbeddingCache] = None
+
+        if embedding_cache_path:
+            model_key = self.embeddings.model_name
+            if self.embeddings.normalize:
+                model_key += ":normalized"
+
+            self.embedding_cache = EmbeddingCache(
+                path=embedding_cache_path,
+                model_name=model_key,
+                max_entries=embedding_cache_max_entries
+            )
+
+        # Flat / IVF / PQ / HNSW selection and search defaults
+        self.index_config = index_config or IndexConfig()
+        self._promoting = False
+
         self.index: Optional[FAISS] = None
 
+        # Index writes (ingestion jobs, deletes, promotion) are exclusive;
+        # searches share the read side, since faiss does not support
+        # searching an index while vectors are added or removed
+        self.lock = ReadWriteLock()
+
+        # Bumped on every index change; lets caches detect stale entries
+        self.version = 0
+
+        # Incremental persistence: unsaved entries are flushed as one segment
+        self.segments = SegmentStore(
+            persist_path,
+            max_segments=max_segments,
+            on_merge=self._segments_merged
+        )
+        self._save_lock = RLock()
+        self._next_label = 0
+        self._pending: List[Tuple[np.ndarray, np.ndarray, List[Document]]] = []
+        self._replace_on_save = False
+
+        # Full index snapshots spare trained indexes a rebuild on load
+        self.snapshot_interval = snapshot_interval
+        self._snapshot_dirty = False
+
+        # Memory-mapped, read-only snapshot loading shared across workers
+        self.mmap = mmap
+        self._mmap_source: Optional[str] = None
+
+        # doc_id -> {"content_hash", "source", "tags", "ingested_at", "ranges"};
+        # labels are allocated contiguously per batch, so a document is
+        # a few [start, end) ranges. Doubles as the id map for filters.
+        # A version still being ingested is kept apart under "pending"
+        # ({"content_hash", "ranges"}) until commit_document.
+        self._documents: Dict[str, dict] = {}
+
+        # label -> page (-1 unknown), for page filters without reading chunks
+        self._label_pages = np.full(0, -1, dtype="int32")
+        self._documents_dirty = False
+        self._pending_deletes: List[np.ndarray] = []
+
+        # Bumped when vectors are removed; aborts an in-flight promotion
+        self._structure_changes = 0
+
+        # BM25 over chunk text for hybrid retrieval, same labels as the index
+        self.lexical: Optional[BM25Index] = (
+            BM25Index(os.path.join(persist_path, "lexical")) if lexical_index else None
+        )
+
+    @classmethod
+    def from_settings(cls) -> "FAISSVectorStore":
+        """
+        Vector store configured from application settings.
+        """
+        return cls(
+            embedding_model_name=settings.EMBEDDING_MODEL,
+            persist_path=settings.VECTORSTORE_PATH,
+            embedding_cache_path=settings.EMBEDDING_CACHE_PATH if settings.EMBEDDING_CACHE_ENABLED else None,
+            embedding_cache_max_entries=settings.EMBEDDING_CACHE_MAX_ENTRIES,
+            max_segments=settings.VECTORSTORE_MAX_SEGMENTS,
+            snapshot_interval=settings.VECTORSTORE_SNAPSHOT_INTERVAL,
+            mmap=settings.VECTORSTORE_MMAP,
+            lexical_index=settings.LEXICAL_INDEX_ENABLED or settings.RETRIEVAL_MODE == "hybrid",
+            index_config=IndexConfig(
+                index_type=settings.VECTORSTORE_INDEX_TYPE,
+                nlist=settings.VECTORSTORE_NLIST,
+                pq_m=settings.VECTORSTORE_PQ_M,
+                hnsw_m=settings.VECTORSTORE_HNSW_M,
+                nprobe=settings.VECTORSTORE_NPROBE,
+                ef_search=settings.VECTORSTORE_EF_SEARCH,
+                auto_threshold=settings.VECTORSTORE_AUTO_ANN_THRESHOLD
+            )
+        )
+
+    # Embedding
+
+    @INGESTION_STAGES.time("embed")
+    def embed_documents(self, documents: List[Document]) -> np.ndarray:
+        """
+        Embed document contents in batches through the embedding engine.
+        Chunks already in the embedding cache are not re-embedded.
+        """
+        texts = [doc.page_content for doc in documents]
+
+        if self.embedding_cache is None or not texts:
+            return self.embeddings.embed(texts)
+
+        keys = [self.embedding_cache.key(text) for text in texts]
+        cached = self.embedding_cache.get_many(keys)
+
+        # Each distinct missing text is embedded once
+        missing = {}
+        for key, text in zip(keys, texts):
+            if key not in cached:
+                missing.setdefault(key, text)
+
+        if missing:
+            fresh = self.embeddings.embed(list(missing.values()))
+            self.embedding_cache.put_many(list(missing.keys()), fresh)
+            cached.update(zip(missing.keys(), fresh))
+
+        return np.vstack([cached[key] for key in keys]).astype("float32", copy=False)
+
     # Index Creation
 
     def create_index(self, documents: List[Document]) -> None:
         """
         Create new FAISS index from documents.
+        Trained index types are trained on these documents right away.
         """
-        self.index = FAISS.from_documents(
-            documents=documents,
-            embedding=self.embeddings
+        vectors = self.embed_documents(documents)
+
+        with self.lock:
+            labels = self._allocate_labels(len(documents))
+
+            raw = build_index(
+                self.index_config,
+                self.index_config.target_type(len(documents)),
+                vectors.shape[1],
+                vectors,
+                labels
+            )
+
+            self.index = self._wrap(raw)
+            self._documents = {}
+            self._label_pages = np.full(0, -1, dtype="int32")
+            if self.lexical is not None:
+                self.lexical.clear()
+            self._register_documents(labels, documents)
+
+            # The next save replaces everything previously persisted
+            self._pending = [(labels, vectors, documents)]
+            self._pending_deletes = []
+            self._replace_on_save = True
+            self._snapshot_dirty = index_kind(raw) != FLAT
+            self.version += 1
+
+    def _wrap(self, raw: faiss.Index, docstore=None) -> FAISS:
+        # Stable int64 ids double as docstore ids, so persisted segments
+        # map straight back into the index without a per-chunk id dict.
+        # A freshly wrapped index is never the memory-mapped snapshot.
+        # Caller holds the lock, so no search still reads the old chunks.
+        self._mmap_source = None
+
+        if self.index is not None and self.index.docstore is not docstore:
+            self.index.docstore.close()
+
+        return FAISS(
+            embedding_function=self.embeddings,
+            index=raw,
+            docstore=docstore if docstore is not None else ChunkStore(),
+            index_to_docstore_id=LabelIdMap()
         )
 
+    def _new_index(self, dimension: int) -> FAISS:
+        return self._wrap(build_index(
+            self.index_config,
+            self.index_config.target_type(0),
+            dimension
+        ))
+
+    def _allocate_labels(self, count: int) -> np.ndarray:
+        # Caller holds the lock
+        labels = np.arange(self._next_label, self._next_label + count, dtype="int64")
+        self._next_label += count
+        return labels
+
+    def _register_documents(self, labels: np.ndarray, documents: List[Document]) -> None:
+        # Caller holds the lock
+        ids = [str(label) for label in labels.tolist()]
+
+        self.index.docstore.add(dict(zip(ids, documents)))
+
+        for label, doc in zip(labels.tolist(), documents):
+            self._track(label, doc.metadata)
+
+        self._set_pages(labels, [page_number(doc.metadata) for doc in documents])
+
+        if self.lexical is not None:
+            self.lexical.add(labels, [doc.page_content for doc in documents])
+
+    def _track(self, label: int, metadata: dict) -> None:
+        # Caller holds the lock
+        doc_id = metadata.get("doc_id") or os.path.basename(str(metadata.get("source", "")))
+
+        entry = self._documents.setdefault(doc_id, {
+            "content_hash": None,
+            "source": metadata.get("source"),
+            "tags": [],
+            "ingested_at": time.time(),
+            "ranges": [],
+        })
+
+        # Chunks of a version begun with begin_document
+        pending = entry.get("pending")
+        in_progress = pending is not None and metadata.get("content_hash") == pending["content_hash"]
+
+        # A new version of the document
+        if not in_progress and metadata.get("content_hash") and metadata["content_hash"] != entry["content_hash"]:
+            entry["content_hash"] = metadata["content_hash"]
+            entry["ingested_at"] = time.time()
+
+        if entry["source"] is None:
+            entry["source"] = metadata.get("source")
+
+        if metadata.get("tags"):
+            entry["tags"] = list(metadata["tags"])
+
+        _extend_ranges(entry["ranges"], label)
+
+        if in_progress:
+            _extend_ranges(pending["ranges"], label)
+
+    def _set_pages(self, labels: np.ndarray, pages: List[int]) -> None:
+        # Caller holds the lock
+        if not len(labels):
+            return
+
+        needed = int(np.max(labels)) + 1
+
+        if needed > len(self._label_pages):
+            grown = np.full(max(needed, 2 * len(self._label_pages)), -1, dtype="int32")
+            grown[:len(self._label_pages)] = self._label_pages
+            self._label_pages = grown
+
+        self._label_pages[labels] = pages
+
+    def _load_pages(self) -> None:
+        # Caller holds the lock
+        self._label_pages = np.full(0, -1, dtype="int32")
+
+        for labels, pages in self.segments.page_map():
+            self._set_pages(labels, pages)
+
+    # Documents
+
+    def list_documents(self) -> List[dict]:
+        with self.lock.read():
+            return [
+                {
+                    "doc_id": doc_id,
+                    "source": entry["source"],
+                    "content_hash": entry["content_hash"],
+                    "tags": entry.get("tags", []),
+                    "ingested_at": entry.get("ingested_at"),
+                    "chunks": sum(end - start for start, end in entry["ranges"]),
+                }
+                for doc_id, entry in self._documents.items()
+            ]
+
+    def select_labels(
+        self,
+        sources: Optional[List[str]] = None,
+        tags: Optional[List[str]] = None,
+        page_min: Optional[int] = None,
+        page_max: Optional[int] = None,
+        uploaded_after: Optional[float] = None,
+        uploaded_before: Optional[float] = None
+    ) -> Optional[np.ndarray]:
+        """
+        Sorted labels of the chunks matching a metadata filter, resolved
+        from the document map and page array (no chunk is read).
+        None means no filter. Sources match doc ids or file names;
+        a document matches tags if it has any of them.
+        """
+        document_level = sources or tags or uploaded_after is not None or uploaded_before is not None
+        page_level = page_min is not None or page_max is not None
+
+        if not (document_level or page_level):
+            return None
+
+        with self.lock.read():
+            if document_level:
+                sources = set(sources or ())
+                tags = set(tags or ())
+                ranges = []
+
+                for doc_id, entry in self._documents.items():
+                    source_name = os.path.basename(str(entry.get("source") or ""))
+
+                    if sources and doc_id not in sources and source_name not in sources:
+                        continue
+                    if tags and not tags.intersection(entry.get("tags", ())):
+                        continue
+
+                    ingested_at = entry.get("ingested_at") or 0
+                    if uploaded_after is not None and ingested_at < uploaded_after:
+                        continue
+                    if uploaded_before is not None and ingested_at > uploaded_before:
+                        continue
+
+                    ranges.extend(entry["ranges"])
+
+                labels = _range_labels(ranges)
+            else:
+                labels = np.arange(len(self._label_pages), dtype="int64")
+
+            if page_level:
+                labels = labels[labels < len(self._label_pages)]
+                pages = self._label_pages[labels]
+
+                mask = np.ones(len(labels), dtype=bool)
+                if page_min is not None:
+                    mask &= pages >= page_min
+                if page_max is not None:
+                    mask &= pages <= page_max
+
+                labels = labels[mask]
+
+        return np.unique(labels)
+
+    def find_document_by_hash(self, content_hash: str) -> Optional[str]:
+        """
+        Id of an indexed document with the given content hash, if any.
+        Versions still being ingested (see begin_document) do not count.
+        """
+        with self.lock.read():
+            for doc_id, entry in self._documents.items():
+                if entry["content_hash"] == content_hash:
+                    return doc_id
+
+        return None
+
+    def document_ranges(self, doc_id: str) -> List[List[int]]:
+        with self.lock.read():
+            entry = self._documents.get(doc_id)
+            return [list(r) for r in entry["ranges"]] if entry else []
+
+    def delete_document(self, doc_id: str, ranges: Optional[List[List[int]]] = None) -> int:
+        """
+        Remove a document's vectors and chunks from the index.
+        With ranges, only those label ranges are removed (the rest
+        of the document, e.g. a newer version, is kept).
+        Returns the number of chunks removed. Persisted by the next save.
+        """
+        with self.lock:
+            entry = self._documents.get(doc_id)
+
+            if entry is None or self.index is None:
+                return 0
+
+            ranges = entry["ranges"] if ranges is None else ranges
+            labels = _range_labels(ranges)
+
+            if not len(labels):
+                return 0
+
+            self._ensure_writable()
+
+            self.index.index = self._without_labels(self.index.index, labels)
+            self.index.docstore.delete(labels.tolist())
+
+            if self.lexical is not None:
+                self.lexical.delete(labels)
+
+            self._pending_deletes.append(labels)
+
+            remaining = _subtract_ranges(entry["ranges"], ranges)
+            if remaining:
+                entry["ranges"] = remaining
+                if entry.get("pending"):
+                    entry["pending"]["ranges"] = _subtract_ranges(entry["pending"]["ranges"], ranges)
+            else:
+                del self._documents[doc_id]
+
+            # A snapshot still holds the removed vectors
+            if self.segments.snapshot() is not None:
+                self._snapshot_dirty = True
+
+            self._structure_changes += 1
+            self.version += 1
+
+            return len(labels)
+
+    def replace_document(self, doc_id: str, documents: List[Document]) -> int:
+        """
+        Swap a document's chunks for new ones in a single index update,
+        so searches never see it missing or duplicated.
+        Returns the number of chunks removed.
+        """
+        for doc in documents:
+            doc.metadata["doc_id"] = doc_id
+
+        vectors = self.embed_documents(documents) if documents else None
+
+        with self.lock:
+            old_ranges = self.document_ranges(doc_id)
+
+            if documents:
+                if self.index is None:
+                    self.index = self._new_index(vectors.shape[1])
+
+                self._add_embedded(documents, vectors)
+
+            return self.delete_document(doc_id, old_ranges)
+
+    def begin_document(self, doc_id: str, content_hash: str) -> None:
+        """
+        Start ingesting a version of a document. Its chunks are searchable
+        as they are added, but the version only counts as indexed once
+        commit_document is called: until then find_document_by_hash
+        ignores it, and a store loaded from a save made in between drops
+        its chunks. Leftovers of an earlier unfinished attempt are removed.
+        """
+        with self.lock:
+            self._discard_pending(doc_id)
+
+            entry = self._documents.setdefault(doc_id, {
+                "content_hash": None,
+                "source": None,
+                "tags": [],
+                "ingested_at": time.time(),
+                "ranges": [],
+            })
+            entry["pending"] = {"content_hash": content_hash, "ranges": []}
+            self._documents_dirty = True
+
+    def commit_document(self, doc_id: str, replaces: Optional[List[List[int]]] = None) -> int:
+        """
+        Mark the version begun by begin_document as fully indexed,
+        removing the replaced ranges (the previous version) in the
+        same index update. Returns the number of chunks removed.
+        Persisted by the next save.
+        """
+        with self.lock:
+            removed = self.delete_document(doc_id, replaces) if replaces else 0
+            entry = self._documents.get(doc_id)
+
+            if entry is None:
+                return removed
+
+            pending = entry.pop("pending", None)
+
+            if pending is not None:
+                entry["content_hash"] = pending["content_hash"]
+                entry["ingested_at"] = time.time()
+                self._documents_dirty = True
+
+            if not entry["ranges"]:
+                del self._documents[doc_id]
+
+            return removed
+
+    def abort_document(self, doc_id: str) -> int:
+        """
+        Remove the chunks of an unfinished version begun by begin_document;
+        the previous version, if any, is kept. Returns the number removed.
+        """
+        with self.lock:
+            return self._discard_pending(doc_id)
+
+    def _discard_pending(self, doc_id: str) -> int:
+        # Caller holds the lock
+        entry = self._documents.get(doc_id)
+
+        if entry is None or entry.get("pending") is None:
+            return 0
+
+        ranges = entry.pop("pending")["ranges"]
+        self._documents_dirty = True
+
+        removed = self.delete_document(doc_id, ranges) if ranges else 0
+
+        if doc_id in self._documents and not entry["ranges"]:
+            del self._documents[doc_id]
+
+        return removed
+
+    def _discard_incomplete(self) -> None:
+        # Caller holds the lock; versions saved before their commit,
+        # left behind by an ingestion that did not finish
+        for doc_id in [d for d, entry in self._documents.items() if entry.get("pending") is not None]:
+            self._discard_pending(doc_id)
+
+    def _without_labels(self, raw: faiss.Index, labels: np.ndarray) -> faiss.Index:
+        # Caller holds the lock
+        if index_kind(raw) != HNSW:
+            raw.remove_ids(np.ascontiguousarray(labels, dtype="int64"))
+            return raw
+
+        # HNSW graphs do not support removal; rebuild without the labels
+        all_labels, vectors = self._export_vectors(raw)
+        keep = ~np.isin(all_labels, labels)
+
+        self._snapshot_dirty = True
+
+        return build_index(self.index_config, HNSW, raw.d, vectors[keep], all_labels[keep])
+
+    def _rebuild_documents(self, tombstones: np.ndarray) -> None:
+        # Caller holds the lock; one-off scan for stores saved without a registry
+        self._documents = {}
+        deleted = set(tombstones.tolist())
+
+        for label in np.sort(self.index.docstore.labels()).tolist():
+            if label in deleted:
+                continue
+
+            doc = self.index.docstore.search(str(label))
+
+            if isinstance(doc, Document):
+                self._track(label, doc.metadata)
+
+        self._documents_dirty = True
+
+    # ANN Promotion
+
+    def _maybe_promote(self) -> None:
+        """
+        Rebuild a flat index as the configured ANN type once the
+        corpus is large enough to train it, and retrain an IVF index
+        once the corpus has outgrown its nlist. Runs in the background;
+        searches keep using the current index until the swap.
+        """
+        # Caller holds the lock
+        raw = self.index.index
+        kind = index_kind(raw)
+        target = self.index_config.target_type(raw.ntotal)
+
+        if self._promoting or target == FLAT:
+            return
+
+        if kind != FLAT:
+            if kind != target or kind not in (IVF_FLAT, IVF_PQ):
+                return
+
+            if not self.index_config.should_retrain(faiss.extract_index_ivf(raw).nlist, raw.ntotal):
+                return
+
+        self._promoting = True
+
+        Thread(
+            target=self._promote,
+            args=(raw, target),
+            name="index-promotion",
+            daemon=True
+        ).start()
+
+    def wait_for_promotion(self, timeout: Optional[float] = None) -> bool:
+        """
+        Block until a background promotion (if any) has finished.
+        Returns False on timeout.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        while self._promoting:
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            time.sleep(0.05)
+
+        return True
+
+    def _promote(self, current: faiss.Index, target: str) -> None:
+        try:
+            # Saves are held off while vectors are collected, so each one
+            # is either pending or in a segment
+            with self._save_lock:
+                with self.lock:
+                    if self.index is None or self.index.index is not current:
+                        return
+
+                    structure_changes = self._structure_changes
+                    pending = list(self._pending)
+
+                    if index_kind(current) == FLAT:
+                        labels, vectors = self._export_vectors(current)
+                    else:
+                        labels = faiss.vector_to_array(current.id_map).astype("int64")
+                        vectors = None
+
+                if vectors is None:
+                    vectors = self._original_vectors(labels, pending, current.d)
+
+            # Training and bulk add happen outside the lock
+            promoted = build_index(
+                self.index_config,
+                target,
+                current.d,
+                vectors,
+                labels
+            )
+
+            with self.lock:
+                if self.index is None or self.index.index is not current:
+                    return
+
+                # Removals reorder the index; retry on a later add
+                if self._structure_changes != structure_changes:
+                    return
+
+                # Catch up on vectors added while training
+                if current.ntotal > len(labels):
+                    if index_kind(current) == FLAT:
+                        new_labels, new_vectors = self._export_vectors(current, start=len(labels))
+                    else:
+                        new_labels = faiss.vector_to_array(current.id_map)[len(labels):].astype("int64")
+                        new_vectors = self._original_vectors(new_labels, self._pending, current.d)
+
+                    promoted.add_with_ids(new_vectors, new_labels)
+
+                self.index.index = promoted
+                self._mmap_source = None
+                self._snapshot_dirty = True
+                self.version += 1
+
+        finally:
+            self._promoting = False
+
+    @staticmethod
+    def _export_vectors(index: faiss.Index, start: int = 0) -> Tuple[np.ndarray, np.ndarray]:
+        # Flat and HNSW indexes store full vectors and can reconstruct them
+        inner = faiss.downcast_index(index.index)
+        vectors = inner.reconstruct_n(start, inner.ntotal - start)
+        labels = faiss.vector_to_array(index.id_map)[start:].astype("int64")
+        return labels, vectors
+
+    def _original_vectors(
+        self,
+        labels: np.ndarray,
+        pending: List[Tuple[np.ndarray, np.ndarray, List[Document]]],
+        dimension: int
+    ) -> np.ndarray:
+        """
+        Vectors of the given labels as they were added, for retraining
+        an IVF index (PQ codes cannot be reconstructed exactly):
+        unsaved ones from pending adds, the rest from the segments.
+        """
+        vectors = np.empty((len(labels), dimension), dtype="float32")
+        found = np.zeros(len(labels), dtype=bool)
+
+        if not len(labels):
+            return vectors
+
+        order = np.argsort(labels)
+        sorted_labels = labels[order]
+
+        def fill(source_labels: np.ndarray, source_vectors: np.ndarray) -> None:
+            positions = np.minimum(np.searchsorted(sorted_labels, source_labels), len(labels) - 1)
+            hits = sorted_labels[positions] == source_labels
+            rows = order[positions[hits]]
+            vectors[rows] = source_vectors[hits]
+            found[rows] = True
+
+        for batch_labels, batch_vectors, _ in pending:
+            fill(batch_labels, batch_vectors)
+
+        if not found.all():
+            for _, segment_labels, segment_vectors in self.segments.load():
+                fill(segment_labels, segment_vectors)
+
+        if not found.all():
+            raise ValueError(f"{int((~found).sum())} indexed vectors are neither pending nor saved.")
+
+        return vectors
+
     # Load Existing Index
 
+    def index_exists(self) -> bool:
+        """
+        Whether a saved index (segments or the old single-file format) is on disk.
+        """
+        return self.segments.exists() or os.path.exists(os.path.join(self.persist_path, "index.faiss"))
+
     def load_index(self) -> None:
         """
         Load FAISS index from disk if exists.
+        Indexes saved in the old single-file format are migrated
+        to segments on first load.
+        """
+        # Compaction cannot remove segment files before the new docstore is attached
+        with self._save_lock:
+            if self.segments.exists():
+                if not (self.mmap and self._load_mmap()):
+                    self._load_segments()
+
+                    if self.mmap:
+                        self._write_load_snapshot()
+                return
+
+        if os.path.exists(os.path.join(self.persist_path, "index.faiss")):
+            self._load_legacy()
+        else:
+            raise FileNotFoundError("No saved vector index found.")
+
+    def _write_load_snapshot(self) -> None:
+        """
+        Publish a snapshot of the index just replayed from segments, so
+        later starts can memory-map it instead of replaying again.
+        Of several workers starting together, one writes it.
+        """
+        # Caller holds the save lock
+        if self.index is None or not self._snapshot_dirty:
+            return
+
+        with self.segments.exclusive("snapshot.lock") as acquired:
+            if acquired and not self.segments.snapshot_current():
+                self.save_index()
+
+    def _load_mmap(self) -> bool:
+        """
+        Memory-map the index snapshot read-only and read documents lazily,
+        so startup does no deserialization and workers share the page cache.
+        Only possible when the snapshot covers every segment.
+        """
+        # Segments or deletions saved after the snapshot need a writable index
+        if not self.segments.snapshot_current():
+            return False
+
+        path, _, _ = self.segments.snapshot()
+        manifest = self.segments.read_manifest()
+
+        try:
+            raw = faiss.read_index(path, faiss.IO_FLAG_MMAP | faiss.IO_FLAG_READ_ONLY)
+        except RuntimeError as e:
+            # Index types faiss cannot map are loaded into memory instead
+            logger.warning("Memory-mapping %s failed, loading it into memory: %s", path, e)
+            return False
+
+        docstore = ChunkStore(self.segments.document_sources())
+        docstore.delete(self.segments.tombstones().tolist())
+
+        with self.lock:
+            self.index = self._wrap(raw, docstore)
+            self._mmap_source = path
+            self._next_label = manifest.get("next_label", 0)
+            self._pending = []
+            self._pending_deletes = []
+            self._replace_on_save = False
+            self._snapshot_dirty = False
+            self._load_documents(manifest)
+            self._load_pages()
+            self._load_lexical(manifest)
+            self._discard_incomplete()
+            self.version += 1
+
+        return True
+
+    def _load_documents(self, manifest: dict) -> None:
+        # Caller holds the lock
+        registry = manifest.get("registry")
+        self._documents_dirty = False
+
+        if registry is None:
+            self._rebuild_documents(self.segments.tombstones())
+        else:
+            self._documents = registry
+
+    def _ensure_writable(self) -> None:
+        """
+        A memory-mapped index is read-only; the first write in this
+        process loads a private in-memory copy of the snapshot.
+        """
+        # Caller holds the lock
+        if self._mmap_source is None:
+            return
+
+        self.index.index = faiss.read_index(self._mmap_source)
+        self._mmap_source = None
+
+    def _load_segments(self) -> None:
+        manifest = self.segments.read_manifest()
+        snapshot = self.segments.snapshot()
+
+        tombstones = self.segments.tombstones()
+
+        raw = None
+        covered = set()
+        applied = 0
+
+        if snapshot is not None:
+            path, covers, applied = snapshot
+            raw = faiss.read_index(path)
+            covered = set(covers)
+
+        loaded = []
+        replay_labels, replay_vectors = [], []
+
+        for name, labels, vectors in self.segments.load(skip_vectors=covered):
+            loaded.append(labels)
+
+            # Segments written after the snapshot are replayed on top of it,
+            # minus entries deleted since they were written
+            if name not in covered:
+                keep = ~np.isin(labels, tombstones)
+                replay_labels.append(labels[keep])
+                replay_vectors.append(vectors[keep])
+
+        # Documents stay on disk; only their offsets are loaded
+        docstore = ChunkStore(self.segments.document_sources())
+        docstore.delete(tombstones.tolist())
+
+        with self.lock:
+            self._next_label = manifest.get("next_label", 0)
+            self._pending = []
+            self._pending_deletes = []
+            self._replace_on_save = False
+            self._snapshot_dirty = False
+
+            if raw is None and not loaded:
+                self.index = None
+                self._documents = {}
+                if self.lexical is not None:
+                    self.lexical.clear()
+                self.version += 1
+                return
+
+            if raw is None:
+                vectors = np.vstack(replay_vectors)
+
+                raw = build_index(
+                    self.index_config,
+                    self.index_config.target_type(len(vectors)),
+                    vectors.shape[1],
+                    vectors,
+                    np.concatenate(replay_labels)
+                )
+                self._snapshot_dirty = index_kind(raw) != FLAT
+
+            else:
+                # Deletions saved after the snapshot was written
+                if applied < len(tombstones):
+                    raw = self._without_labels(raw, tombstones)
+                    self._snapshot_dirty = True
+
+                if replay_vectors:
+                    raw.add_with_ids(
+                        np.vstack(replay_vectors),
+                        np.concatenate(replay_labels)
+                    )
+
+            self.index = self._wrap(raw, docstore)
+            self._load_documents(manifest)
+            self._load_pages()
+            self._load_lexical(manifest)
+            self._discard_incomplete()
+
+            # Snapshot the replayed index so the next start can be memory-mapped
+            if self.mmap and (snapshot is None or replay_vectors):
+                self._snapshot_dirty = True
+
+            for labels in loaded:
+                if len(labels):
+                    self._next_label = max(self._next_label, int(labels.max()) + 1)
+
+            self._maybe_promote()
+            self.version += 1
+
+    def _load_lexical(self, manifest: dict) -> None:
         """
-        if not os.path.exists(self.persist_path):
-            raise FileNotFoundError("Vectorstore path does not exist.")
+        Load the BM25 index and index any chunks saved after it
+        (or everything, the first time it is enabled).
+        """
+        # Caller holds the lock
+        if self.lexical is None:
+            return
+
+        tombstones = self.segments.tombstones()
+
+        if (not self.lexical.load(tombstones)
+                or self.lexical.next_label > manifest.get("next_label", 0)):
+            self.lexical.clear()
+
+        labels = np.sort(self.index.docstore.labels())
+        labels = labels[labels >= self.lexical.next_label]
+        labels = labels[~np.isin(labels, tombstones)]
+
+        for start in range(0, len(labels), 10000):
+            batch = labels[start:start + 10000]
+            docs = [self.index.docstore.search(str(label)) for label in batch.tolist()]
 
-        self.index = FAISS.load_local(
+            self.lexical.add(batch, [
+                doc.page_content if isinstance(doc, Document) else "" for doc in docs
+            ])
+
+    def _load_legacy(self) -> None:
+        legacy = FAISS.load_local(
             folder_path=self.persist_path,
             embeddings=self.embeddings,
             allow_dangerous_deserialization=True
         )
 
+        total = legacy.index.ntotal
+        vectors = legacy.index.reconstruct_n(0, total)
+        documents = [
+            legacy.docstore.search(legacy.index_to_docstore_id[i])
+            for i in range(total)
+        ]
+
+        with self.lock:
+            labels = self._allocate_labels(total)
+
+            raw = build_index(
+                self.index_config,
+                self.index_config.target_type(total),
+                legacy.index.d,
+                vectors,
+                labels
+            )
+
+            self.index = self._wrap(raw)
+            self._documents = {}
+            self._label_pages = np.full(0, -1, dtype="int32")
+            if self.lexical is not None:
+                self.lexical.clear()
+            self._register_documents(labels, documents)
+
+            self._pending = [(labels, vectors, documents)]
+            self._pending_deletes = []
+            self._replace_on_save = True
+            self._snapshot_dirty = index_kind(raw) != FLAT
+            self.version += 1
+
+        self.save_index()
+
+    def _segments_merged(self, paths: List[str], source: Tuple[str, np.ndarray, np.ndarray]) -> None:
+        # Compaction thread; saves are held off so every saved segment is attached
+        with self._save_lock, self.lock:
+            if self.index is not None:
+                self.index.docstore.replace_segments(paths, source)
+
     # Save Index
 
+    @INGESTION_STAGES.time("save")
     def save_index(self) -> None:
         """
         Persist FAISS index to disk.
+        Only entries added since the last save are written, as a new
+        append-only segment; the manifest swap makes it atomic.
+        A full index snapshot is written only after training/promotion
+        or once snapshot_interval vectors have accumulated since the last one.
         """
-        if self.index is None:
-            raise ValueError("No FAISS index to save.")
+        with self._save_lock:
+            uncovered = self.segments.uncovered_count()
+
+            with self.lock:
+                if self.index is None:
+                    raise ValueError("No FAISS index to save.")
+
+                pending, self._pending = self._pending, []
+                replace, self._replace_on_save = self._replace_on_save, False
+                deletes, self._pending_deletes = self._pending_deletes, []
+                documents_dirty, self._documents_dirty = self._documents_dirty, False
+                registry = {doc_id: _copy_entry(entry) for doc_id, entry in self._documents.items()}
+                next_label = self._next_label
+                dimension = self.index.index.d
+
+                pending_count = sum(len(p[0]) for p in pending)
+                docstore = self.index.docstore
+
+                blob = None
+                if self._snapshot_dirty or uncovered + pending_count >= self.snapshot_interval:
+                    # Serialized while holding the lock, so it matches the segments exactly
+                    blob = faiss.serialize_index(self.index.index)
+                    self._snapshot_dirty = False
+
+            lexical_dirty = self.lexical is not None and self.lexical.dirty
 
-        self.index.save_local(self.persist_path)
+            if not (pending or replace or deletes or documents_dirty or lexical_dirty) and blob is None:
+                return
+
+            try:
+                if pending or replace or deletes or documents_dirty:
+                    if pending:
+                        labels = np.concatenate([p[0] for p in pending])
+                        vectors = np.vstack([p[1] for p in pending])
+                        documents = [doc for p in pending for doc in p[2]]
+                    else:
+                        labels = np.empty(0, dtype="int64")
+                        vectors = np.empty((0, dimension), dtype="float32")
+                        documents = []
+
+                    name = self.segments.append(
+                        labels,
+                        vectors,
+                        documents,
+                        replace=replace,
+                        deleted=np.concatenate(deletes) if deletes else None,
+                        next_label=next_label,
+                        dimension=dimension,
+                        registry=registry
+                    )
+
+                    # Saved chunks are served from disk from now on
+                    if name is not None:
+                        source = self.segments.document_source(name)
+
+                        with self.lock:
+                            if self.index is not None and self.index.docstore is docstore:
+                                docstore.add_segments([source])
+
+                if blob is not None:
+                    self.segments.write_snapshot(blob)
+
+            except Exception:
+                # Keep unsaved entries for the next attempt
+                with self.lock:
+                    self._pending = pending + self._pending
+                    self._pending_deletes = deletes + self._pending_deletes
+                    self._replace_on_save = self._replace_on_save or replace
+                    self._documents_dirty = self._documents_dirty or documents_dirty
+                    self._snapshot_dirty = self._snapshot_dirty or blob is not None
+                raise
+
+            # Written after the segments; a lagging BM25 index catches up on load
+            if lexical_dirty or (self.lexical is not None and self.lexical.dirty):
+                self.lexical.save()
 
     # Add Documents
 
@@ -79,7 +1103,175 @@ class FAISSVectorStore:
         if self.index is None:
             raise ValueError("Index not initialized.")
 
-        self.index.add_documents(documents)
+        vectors = self.embed_documents(documents)
+
+        with self.lock, INGESTION_STAGES.time("index_add"):
+            self._add_embedded(documents, vectors)
+
+    def index_documents(self, documents: List[Document]) -> None:
+        """
+        Add documents, creating the index on first use.
+        Embedding runs outside the write lock so concurrent
+        ingestion jobs only serialize on the index update.
+        """
+        if not documents:
+            return
+
+        vectors = self.embed_documents(documents)
+
+        with self.lock, INGESTION_STAGES.time("index_add"):
+            if self.index is None:
+                self.index = self._new_index(vectors.shape[1])
+
+            self._add_embedded(documents, vectors)
+
+    def _add_embedded(self, documents: List[Document], vectors: np.ndarray) -> None:
+        # Caller holds the lock
+        self._ensure_writable()
+
+        labels = self._allocate_labels(len(documents))
+
+        self.index.index.add_with_ids(np.ascontiguousarray(vectors, dtype="float32"), labels)
+        self._register_documents(labels, documents)
+
+        self._pending.append((labels, vectors, documents))
+        self._maybe_promote()
+        self.version += 1
+
+    # Search
+
+    def embed_query(self, query: str) -> np.ndarray:
+        return self.embeddings.embed([query])[0]
+
+    def embed_queries(self, queries: List[str]) -> np.ndarray:
+        return self.embeddings.embed(queries)
+
+    def search_labels(
+        self,
+        vectors: np.ndarray,
+        k: int = 4,
+        nprobe: Optional[int] = None,
+        ef_search: Optional[int] = None,
+        labels: Optional[np.ndarray] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Raw (distances, labels) of the k nearest vectors per query;
+        missing results have label -1.
+        nprobe (IVF) and ef_search (HNSW) override the defaults per call.
+        labels (see select_labels) restricts the search to those ids.
+        """
+        queries = np.ascontiguousarray(np.atleast_2d(vectors), dtype="float32")
+
+        if labels is not None and not len(labels):
+            return (
+                np.full((len(queries), k), np.inf, dtype="float32"),
+                np.full((len(queries), k), -1, dtype="int64")
+            )
+
+        selector = id_selector(labels) if labels is not None else None
+
+        with self.lock.read():
+            if self.index is None:
+                raise ValueError("Index not initialized.")
+
+            raw = self.index.index
+            params = search_parameters(
+                raw,
+                nprobe=nprobe or self.index_config.nprobe,
+                ef_search=ef_search or self.index_config.ef_search,
+                selector=selector
+            )
+
+            return raw.search(queries, k, params=params)
+
+    def get_documents(self, labels: List[int]) -> List[Optional[Document]]:
+        """
+        Chunks for the given labels; None for labels no longer stored.
+        """
+        documents = []
+
+        with self.lock.read():
+            index = self.index
+
+            if index is None:
+                raise ValueError("Index not initialized.")
+
+            for label in labels:
+                doc = index.docstore.search(index.index_to_docstore_id[label])
+                documents.append(doc if isinstance(doc, Document) else None)
+
+        return documents
+
+    def search_by_vectors(
+        self,
+        vectors: np.ndarray,
+        k: int = 4,
+        nprobe: Optional[int] = None,
+        ef_search: Optional[int] = None,
+        labels: Optional[np.ndarray] = None
+    ) -> List[List[Tuple[Document, float]]]:
+        """
+        Return the k nearest documents with their L2 scores for each query vector.
+        """
+        results = []
+
+        # Hits are resolved to chunks before a delete can remove them
+        with self.lock.read():
+            distances, hit_labels = self.search_labels(
+                vectors, k, nprobe=nprobe, ef_search=ef_search, labels=labels
+            )
+
+            for row_distances, row_labels in zip(distances, hit_labels):
+                hits = [
+                    (distance, label)
+                    for distance, label in zip(row_distances.tolist(), row_labels.tolist())
+                    if label != -1
+                ]
+
+                docs = self.get_documents([label for _, label in hits])
+                results.append([(doc, distance) for doc, (distance, _) in zip(docs, hits) if doc is not None])
+
+        return results
+
+    def lexical_search(
+        self,
+        query: str,
+        k: int = 10,
+        labels: Optional[np.ndarray] = None
+    ) -> List[Tuple[int, float]]:
+        """
+        Top-k (label, BM25 score) pairs; empty when the lexical index is disabled.
+        """
+        if self.lexical is None:
+            return []
+
+        with self.lock.read():
+            return self.lexical.search(query, k, allowed=labels)
+
+    def similarity_search_by_vector(
+        self,
+        vector: np.ndarray,
+        k: int = 4,
+        nprobe: Optional[int] = None,
+        ef_search: Optional[int] = None,
+        labels: Optional[np.ndarray] = None
+    ) -> List[Tuple[Document, float]]:
+        """
+        Return the k nearest documents with their L2 scores.
+        """
+        return self.search_by_vectors(vector, k, nprobe=nprobe, ef_search=ef_search, labels=labels)[0]
+
+    def index_info(self) -> dict:
+        index = self.index
+
+        return {
+            "type": index_kind(index.index) if index is not None else None,
+            "configured_type": self.index_config.index_type,
+            "vectors": index.index.ntotal if index is not None else 0,
+            "memory_mapped": self._mmap_source is not None,
+            "version": self.version,
+            "lexical": self.lexical.stats() if self.lexical is not None else None,
+        }
 
     # Get Retriever
 
@@ -93,6 +1285,58 @@ class FAISSVectorStore:
         return self.index.as_retriever(
             search_kwargs={"k": k}
         )
-    
-    
+
+
+def _copy_entry(entry: dict) -> dict:
+    copy = dict(entry, ranges=[list(r) for r in entry["ranges"]])
+
+    if entry.get("pending") is not None:
+        copy["pending"] = dict(entry["pending"], ranges=[list(r) for r in entry["pending"]["ranges"]])
+
+    return copy
+
+
+def _extend_ranges(ranges: List[List[int]], label: int) -> None:
+    if ranges and ranges[-1][1] == label:
+        ranges[-1][1] = label + 1
+    else:
+        ranges.append([label, label + 1])
+
+
+def _range_labels(ranges: List[List[int]]) -> np.ndarray:
+    if not ranges:
+        return np.empty(0, dtype="int64")
+
+    return np.concatenate([np.arange(start, end, dtype="int64") for start, end in ranges])
+
+
+def _subtract_ranges(ranges: List[List[int]], removed: List[List[int]]) -> List[List[int]]:
+    """
+    [start, end) label ranges minus the removed ones.
+    """
+    result = []
+
+    for start, end in ranges:
+        pieces = [[start, end]]
+
+        for r_start, r_end in removed:
+            next_pieces = []
+
+            for p_start, p_end in pieces:
+                if r_end <= p_start or r_start >= p_end:
+                    next_pieces.append([p_start, p_end])
+                    continue
+
+                if p_start < r_start:
+                    next_pieces.append([p_start, r_start])
+                if r_end < p_end:
+                    next_pieces.append([r_end, p_end])
+
+            pieces = next_pieces
+
+        result.extend(pieces)
+
+    return result
+
+
 # app/vectorstore/faiss_store.py
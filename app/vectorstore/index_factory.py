@@ -0,0 +1,230 @@
+import math
+from typing import Optional
+
+import faiss
+import numpy as np
+
+
+FLAT = "flat"
+IVF_FLAT = "ivf_flat"
+IVF_PQ = "ivf_pq"
+HNSW = "hnsw"
+AUTO = "auto"
+
+INDEX_TYPES = (FLAT, IVF_FLAT, IVF_PQ, HNSW, AUTO)
+
+# FAISS warns below ~39 training points per IVF list
+MIN_POINTS_PER_LIST = 39
+
+# 8-bit PQ codebooks need at least 256 training points
+MIN_PQ_TRAINING_POINTS = 256
+
+# Upper bound on the sample used to train IVF/PQ
+MAX_TRAINING_POINTS_PER_LIST = 256
+
+
+class IndexConfig:
+    """
+    FAISS index type and build/search parameters.
+
+    - flat:     exact search, no training
+    - hnsw:     graph index, built incrementally, no training
+    - ivf_flat: inverted lists, trained once enough vectors exist
+    - ivf_pq:   inverted lists with product-quantized codes
+    - auto:     flat, promoted to ivf_flat past auto_threshold vectors
+
+    IVF indexes are retrained as the corpus outgrows their nlist.
+    """
+
+    def __init__(
+        self,
+        index_type: str = AUTO,
+        nlist: int = 0,
+        pq_m: int = 16,
+        hnsw_m: int = 32,
+        nprobe: int = 16,
+        ef_search: int = 64,
+        auto_threshold: int = 100000
+    ):
+        if index_type not in INDEX_TYPES:
+            raise ValueError(f"Unsupported index type: {index_type}")
+
+        self.index_type = index_type
+        self.nlist = nlist
+        self.pq_m = pq_m
+        self.hnsw_m = hnsw_m
+        self.nprobe = nprobe
+        self.ef_search = ef_search
+        self.auto_threshold = auto_threshold
+
+    def choose_nlist(self, n_vectors: int) -> int:
+        """
+        Configured nlist, or ~4*sqrt(n) when nlist is 0,
+        capped so every list gets enough training points.
+        """
+        nlist = self.nlist or int(4 * math.sqrt(max(n_vectors, 1)))
+        return max(1, min(nlist, n_vectors // MIN_POINTS_PER_LIST))
+
+    def min_training_size(self, index_type: str) -> int:
+        """
+        Vectors needed to train the target nlist: the configured one,
+        or, when nlist is 0, the size n at which 4*sqrt(n) lists get
+        MIN_POINTS_PER_LIST points each.
+        """
+        if self.nlist:
+            size = MIN_POINTS_PER_LIST * self.nlist
+        else:
+            size = (4 * MIN_POINTS_PER_LIST) ** 2
+
+        if index_type == IVF_PQ:
+            return max(MIN_PQ_TRAINING_POINTS, size)
+
+        return size
+
+    def should_retrain(self, nlist: int, n_vectors: int) -> bool:
+        """
+        Whether an IVF index trained with nlist lists has outgrown them;
+        with nlist 0 that is after ~4x growth (twice the lists).
+        """
+        return self.choose_nlist(n_vectors) >= 2 * nlist
+
+    def target_type(self, n_vectors: int) -> str:
+        """
+        Index type to use for a corpus of n_vectors.
+        Trained types fall back to flat until there is enough data.
+        """
+        if self.index_type == AUTO:
+            threshold = max(self.auto_threshold, self.min_training_size(IVF_FLAT))
+            return IVF_FLAT if n_vectors >= threshold else FLAT
+
+        if self.index_type in (IVF_FLAT, IVF_PQ):
+            if n_vectors < self.min_training_size(self.index_type):
+                return FLAT
+
+        return self.index_type
+
+
+def _pq_subquantizers(dimension: int, pq_m: int) -> int:
+    # PQ needs m to divide the dimension
+    for m in range(min(pq_m, dimension), 0, -1):
+        if dimension % m == 0:
+            return m
+
+    return 1
+
+
+def factory_string(config: IndexConfig, index_type: str, dimension: int, n_vectors: int) -> str:
+    if index_type == FLAT:
+        return "IDMap2,Flat"
+
+    if index_type == HNSW:
+        return f"IDMap2,HNSW{config.hnsw_m}"
+
+    nlist = config.choose_nlist(n_vectors)
+
+    if index_type == IVF_PQ:
+        return f"IDMap2,IVF{nlist},PQ{_pq_subquantizers(dimension, config.pq_m)}"
+
+    return f"IDMap2,IVF{nlist},Flat"
+
+
+def build_index(
+    config: IndexConfig,
+    index_type: str,
+    dimension: int,
+    vectors: Optional[np.ndarray] = None,
+    labels: Optional[np.ndarray] = None
+) -> faiss.Index:
+    """
+    Build an IDMap2-wrapped index, training it on the given vectors
+    when the index type requires it, then add them.
+    """
+    n_vectors = 0 if vectors is None else len(vectors)
+
+    index = faiss.index_factory(
+        dimension,
+        factory_string(config, index_type, dimension, n_vectors),
+        faiss.METRIC_L2
+    )
+
+    if not index.is_trained:
+        sample = vectors
+
+        nlist = config.choose_nlist(n_vectors)
+        max_sample = nlist * MAX_TRAINING_POINTS_PER_LIST
+
+        if n_vectors > max_sample:
+            rng = np.random.default_rng(0)
+            sample = vectors[rng.choice(n_vectors, size=max_sample, replace=False)]
+
+        index.train(np.ascontiguousarray(sample, dtype="float32"))
+
+    if n_vectors:
+        index.add_with_ids(np.ascontiguousarray(vectors, dtype="float32"), labels)
+
+    return index
+
+
+def index_kind(index: faiss.Index) -> str:
+    """
+    Report the index type of an (IDMap-wrapped) FAISS index.
+    """
+    index = faiss.downcast_index(index)
+    inner = faiss.downcast_index(index.index) if hasattr(index, "id_map") else index
+
+    if isinstance(inner, faiss.IndexHNSW):
+        return HNSW
+
+    if isinstance(inner, faiss.IndexIVFPQ):
+        return IVF_PQ
+
+    if isinstance(inner, faiss.IndexIVF):
+        return IVF_FLAT
+
+    return FLAT
+
+
+def id_selector(labels: np.ndarray) -> faiss.IDSelector:
+    """
+    Selector restricting a search to the given sorted, unique labels.
+    A contiguous run (e.g. one document) needs no id set at all.
+    """
+    if len(labels) and int(labels[-1]) - int(labels[0]) + 1 == len(labels):
+        return faiss.IDSelectorRange(int(labels[0]), int(labels[-1]) + 1)
+
+    # The batch selector copies the ids into its own hash set
+    labels = np.ascontiguousarray(labels, dtype="int64")
+    return faiss.IDSelectorBatch(len(labels), faiss.swig_ptr(labels))
+
+
+def search_parameters(
+    index: faiss.Index,
+    nprobe: Optional[int] = None,
+    ef_search: Optional[int] = None,
+    selector: Optional[faiss.IDSelector] = None
+) -> Optional[faiss.SearchParameters]:
+    """
+    Per-query search parameters for the given index, so nprobe/efSearch
+    can be tuned per request without mutating the shared index.
+    A selector restricts the search to matching ids inside the index
+    scan itself (IDMap indexes translate it to internal ids).
+    """
+    kind = index_kind(index)
+
+    if kind in (IVF_FLAT, IVF_PQ) and (nprobe or selector is not None):
+        params = faiss.SearchParametersIVF(nprobe=nprobe) if nprobe else faiss.SearchParametersIVF()
+    elif kind == HNSW and (ef_search or selector is not None):
+        params = faiss.SearchParametersHNSW(efSearch=ef_search) if ef_search else faiss.SearchParametersHNSW()
+    elif selector is not None:
+        params = faiss.SearchParameters()
+    else:
+        return None
+
+    if selector is not None:
+        # SWIG does not keep the selector alive through params.sel
+        params.sel = selector
+        params.referenced_selector = selector
+
+    return params
+
+# app/vectorstore/index_factory.py
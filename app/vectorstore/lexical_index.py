@@ -0,0 +1,425 @@
+import json
+import math
+import os
+import re
+from collections import Counter
+from threading import Lock
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from app.vectorstore.persistence import _fsync_replace
+
+
+MANIFEST_FILE = "manifest.json"
+VOCAB_FILE = "vocab.txt"
+
+# Words, plus dotted/dashed identifiers such as clause numbers ("12.3.1")
+TOKEN_PATTERN = re.compile(r"\w+(?:[./\-]\w+)*")
+
+
+def tokenize(text: str) -> List[str]:
+    return TOKEN_PATTERN.findall(text.casefold())
+
+
+def _csr(
+    labels: np.ndarray,
+    lengths: np.ndarray,
+    terms: np.ndarray,
+    docs: np.ndarray,
+    tfs: np.ndarray
+) -> "_PostingsBlock":
+    # Sort (term, doc) pairs and compress the term column into offsets
+    order = np.lexsort((docs, terms))
+    terms = terms[order]
+
+    term_ids, starts = np.unique(terms, return_index=True)
+    offsets = np.append(starts, len(terms)).astype("int64")
+
+    return _PostingsBlock(
+        labels=labels.astype("int64"),
+        lengths=lengths.astype("int32"),
+        alive=np.ones(len(labels), dtype=bool),
+        term_ids=term_ids.astype("int32"),
+        offsets=offsets,
+        docs=docs[order].astype("int32"),
+        tfs=tfs[order].astype("int32")
+    )
+
+
+class _PostingsBlock:
+    """
+    Immutable CSR postings for a run of chunks: postings of term_ids[i]
+    are docs/tfs[offsets[i]:offsets[i + 1]], docs being positions into
+    labels/lengths. Only the alive bits change after creation.
+    """
+
+    __slots__ = ("labels", "lengths", "alive", "term_ids", "offsets", "docs", "tfs", "name")
+
+    def __init__(self, labels, lengths, alive, term_ids, offsets, docs, tfs, name=None):
+        self.labels = labels
+        self.lengths = lengths
+        self.alive = alive
+        self.term_ids = term_ids
+        self.offsets = offsets
+        self.docs = docs
+        self.tfs = tfs
+        self.name = name
+
+    def __len__(self) -> int:
+        return len(self.labels)
+
+    def postings(self, term_id: int) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        i = int(np.searchsorted(self.term_ids, term_id))
+
+        if i >= len(self.term_ids) or self.term_ids[i] != term_id:
+            return None
+
+        start, end = self.offsets[i], self.offsets[i + 1]
+        return self.docs[start:end], self.tfs[start:end]
+
+    def positions(self, labels: np.ndarray) -> np.ndarray:
+        # Positions of the given (sorted) labels present in this block
+        pos = np.searchsorted(self.labels, labels)
+        valid = pos < len(self.labels)
+        pos = pos[valid]
+        return pos[self.labels[pos] == labels[valid]]
+
+    def arrays(self) -> Dict[str, np.ndarray]:
+        return {name: getattr(self, name) for name in self.__slots__ if name != "name"}
+
+
+class BM25Index:
+    """
+    In-process BM25 index over chunk text, kept alongside the vector index.
+
+    Postings live in compact CSR blocks of numpy arrays (no Python object
+    per posting). Each add creates a block and blocks are merged
+    geometrically, so there are O(log n) of them. Deletions clear an
+    alive bit; merges drop deleted chunks for good.
+
+    Persisted under path/ (only blocks written since the last save):
+        manifest.json   covered labels, vocabulary size, live blocks
+        vocab.txt       one term per line, append-only
+        block-N.npz     postings block
+    """
+
+    def __init__(self, path: Optional[str] = None, k1: float = 1.2, b: float = 0.75):
+        self.path = path
+        self.k1 = k1
+        self.b = b
+
+        # Serializes writers; searches read a snapshot of the block list
+        self._lock = Lock()
+        self._generation = 0
+        self.clear()
+
+    def clear(self) -> None:
+        self._vocab: Dict[str, int] = {}
+        self._terms: List[str] = []
+        self._terms_saved = 0
+        self._vocab_bytes = 0
+
+        self._blocks: List[_PostingsBlock] = []
+        self._doc_count = 0
+        self._total_length = 0
+
+        # Every label below this has been indexed
+        self.next_label = 0
+        self._dirty = True
+
+    def __len__(self) -> int:
+        return self._doc_count
+
+    # Updates
+
+    def add(self, labels: np.ndarray, texts: List[str]) -> None:
+        """
+        Index chunks; labels must be ascending and above all indexed ones.
+        """
+        if not len(labels):
+            return
+
+        with self._lock:
+            terms, docs, tfs, lengths = [], [], [], []
+
+            for position, text in enumerate(texts):
+                counts = Counter(tokenize(text))
+                lengths.append(sum(counts.values()))
+
+                for term, tf in counts.items():
+                    term_id = self._vocab.get(term)
+
+                    if term_id is None:
+                        term_id = self._vocab[term] = len(self._terms)
+                        self._terms.append(term)
+
+                    terms.append(term_id)
+                    docs.append(position)
+                    tfs.append(tf)
+
+            block = _csr(
+                np.asarray(labels, dtype="int64"),
+                np.asarray(lengths, dtype="int32"),
+                np.asarray(terms, dtype="int32"),
+                np.asarray(docs, dtype="int32"),
+                np.asarray(tfs, dtype="int32")
+            )
+
+            # Merge while the previous block is not much larger than the last
+            blocks = self._blocks + [block]
+            while len(blocks) > 1 and len(blocks[-2]) <= 2 * len(blocks[-1]):
+                blocks = blocks[:-2] + [self._merge(blocks[-2:])]
+
+            self._blocks = blocks
+            self._doc_count += len(labels)
+            self._total_length += int(sum(lengths))
+            self.next_label = max(self.next_label, int(np.max(labels)) + 1)
+            self._dirty = True
+
+    def delete(self, labels: np.ndarray) -> None:
+        labels = np.unique(np.asarray(labels, dtype="int64"))
+
+        if not len(labels):
+            return
+
+        with self._lock:
+            for block in self._blocks:
+                pos = block.positions(labels)
+                pos = pos[block.alive[pos]]
+
+                if len(pos):
+                    block.alive[pos] = False
+                    self._doc_count -= len(pos)
+                    self._total_length -= int(block.lengths[pos].sum())
+
+    @staticmethod
+    def _merge(blocks: List[_PostingsBlock]) -> _PostingsBlock:
+        labels, lengths, terms, docs, tfs = [], [], [], [], []
+        base = 0
+
+        for block in blocks:
+            keep = block.alive
+            new_positions = np.cumsum(keep) - 1 + base
+
+            block_terms = np.repeat(block.term_ids, np.diff(block.offsets))
+            live = keep[block.docs]
+
+            terms.append(block_terms[live])
+            docs.append(new_positions[block.docs[live]])
+            tfs.append(block.tfs[live])
+            labels.append(block.labels[keep])
+            lengths.append(block.lengths[keep])
+
+            base += int(keep.sum())
+
+        return _csr(*(np.concatenate(parts) for parts in (labels, lengths, terms, docs, tfs)))
+
+    # Search
+
+    def search(
+        self,
+        query: str,
+        k: int = 10,
+        allowed: Optional[np.ndarray] = None
+    ) -> List[Tuple[int, float]]:
+        """
+        Top-k (label, BM25 score) pairs for the query,
+        optionally restricted to the allowed (sorted) labels.
+        """
+        term_ids = [self._vocab.get(term) for term in set(tokenize(query))]
+        term_ids = [term_id for term_id in term_ids if term_id is not None]
+
+        blocks = self._blocks
+        n_docs = self._doc_count
+
+        if not term_ids or not n_docs or k <= 0:
+            return []
+
+        if allowed is not None and not len(allowed):
+            return []
+
+        avgdl = max(self._total_length / n_docs, 1e-9)
+
+        # postings[t][b] for every query term and block
+        postings = [[block.postings(term_id) for block in blocks] for term_id in term_ids]
+
+        idfs = []
+        for term_postings in postings:
+            df = sum(len(p[0]) for p in term_postings if p is not None)
+            idfs.append(math.log(1 + (n_docs - df + 0.5) / (df + 0.5)))
+
+        hit_labels, hit_scores = [], []
+
+        for b, block in enumerate(blocks):
+            block_docs, block_scores = [], []
+
+            for t, idf in enumerate(idfs):
+                p = postings[t][b]
+                if p is None:
+                    continue
+
+                docs, tfs = p
+                tf = tfs.astype("float32")
+                norm = self.k1 * (1 - self.b + self.b * block.lengths[docs] / avgdl)
+
+                block_docs.append(docs)
+                block_scores.append(idf * tf * (self.k1 + 1) / (tf + norm))
+
+            if not block_docs:
+                continue
+
+            # Sum per chunk over the matched terms only, never over the whole block
+            docs, inverse = np.unique(np.concatenate(block_docs), return_inverse=True)
+            scores = np.bincount(inverse, weights=np.concatenate(block_scores))
+
+            live = block.alive[docs]
+            if allowed is not None:
+                live &= np.isin(block.labels[docs], allowed)
+            docs, scores = docs[live], scores[live]
+
+            if len(docs) > k:
+                top = np.argpartition(-scores, k - 1)[:k]
+                docs, scores = docs[top], scores[top]
+
+            hit_labels.append(block.labels[docs])
+            hit_scores.append(scores)
+
+        if not hit_labels:
+            return []
+
+        labels = np.concatenate(hit_labels)
+        scores = np.concatenate(hit_scores)
+        order = np.argsort(-scores, kind="stable")[:k]
+
+        return list(zip(labels[order].tolist(), scores[order].tolist()))
+
+    def stats(self) -> dict:
+        blocks = self._blocks
+
+        return {
+            "chunks": self._doc_count,
+            "terms": len(self._terms),
+            "blocks": len(blocks),
+            "postings": int(sum(len(block.docs) for block in blocks)),
+        }
+
+    # Persistence
+
+    @property
+    def dirty(self) -> bool:
+        return self._dirty
+
+    def save(self) -> None:
+        if self.path is None:
+            return
+
+        os.makedirs(self.path, exist_ok=True)
+
+        with self._lock:
+            blocks = list(self._blocks)
+            new_terms = self._terms[self._terms_saved:]
+            term_count = len(self._terms)
+            next_label = self.next_label
+            self._dirty = False
+
+        try:
+            for block in blocks:
+                if block.name is not None:
+                    continue
+
+                self._generation += 1
+                name = f"block-{self._generation:06d}.npz"
+                path = os.path.join(self.path, name)
+
+                with open(path + ".tmp", "wb") as f:
+                    np.savez(f, **block.arrays())
+                    f.flush()
+                    os.fsync(f.fileno())
+                _fsync_replace(path + ".tmp", path)
+
+                block.name = name
+
+            # Terms past the last published size are overwritten, so a
+            # crash between vocab and manifest writes leaves no garbage
+            vocab_path = os.path.join(self.path, VOCAB_FILE)
+            with open(vocab_path, "r+b" if os.path.exists(vocab_path) else "wb") as f:
+                f.seek(self._vocab_bytes)
+                f.truncate()
+                f.write("".join(term + "\n" for term in new_terms).encode("utf-8"))
+                f.flush()
+                os.fsync(f.fileno())
+                vocab_bytes = f.tell()
+
+            manifest = {
+                "next_label": next_label,
+                "vocab_size": term_count,
+                "vocab_bytes": vocab_bytes,
+                "generation": self._generation,
+                "blocks": [block.name for block in blocks],
+            }
+
+            manifest_path = os.path.join(self.path, MANIFEST_FILE)
+            with open(manifest_path + ".tmp", "w", encoding="utf-8") as f:
+                json.dump(manifest, f)
+                f.flush()
+                os.fsync(f.fileno())
+            _fsync_replace(manifest_path + ".tmp", manifest_path)
+
+        except Exception:
+            self._dirty = True
+            raise
+
+        self._terms_saved = term_count
+        self._vocab_bytes = vocab_bytes
+
+        live = set(manifest["blocks"])
+        for file_name in os.listdir(self.path):
+            if file_name.startswith("block-") and file_name not in live:
+                try:
+                    os.remove(os.path.join(self.path, file_name))
+                except OSError:
+                    pass
+
+    def load(self, tombstones: Optional[np.ndarray] = None) -> bool:
+        """
+        Load the persisted index; returns False if there is none.
+        Deleted labels (tombstones) are applied after loading.
+        """
+        manifest_path = os.path.join(self.path or "", MANIFEST_FILE)
+
+        if self.path is None or not os.path.exists(manifest_path):
+            return False
+
+        with open(manifest_path, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+
+        with open(os.path.join(self.path, VOCAB_FILE), "rb") as f:
+            terms = f.read(manifest["vocab_bytes"]).decode("utf-8").split("\n")[:manifest["vocab_size"]]
+
+        blocks = []
+        for name in manifest["blocks"]:
+            with np.load(os.path.join(self.path, name)) as data:
+                blocks.append(_PostingsBlock(name=name, **{key: data[key] for key in data.files}))
+
+        with self._lock:
+            self.clear()
+
+            self._terms = terms
+            self._vocab = {term: i for i, term in enumerate(terms)}
+            self._terms_saved = len(terms)
+            self._vocab_bytes = manifest["vocab_bytes"]
+
+            self._blocks = blocks
+            self._doc_count = int(sum(block.alive.sum() for block in blocks))
+            self._total_length = int(sum(block.lengths[block.alive].sum() for block in blocks))
+            self.next_label = manifest["next_label"]
+            self._generation = max(self._generation, manifest["generation"])
+            self._dirty = False
+
+        if tombstones is not None:
+            self.delete(tombstones)
+
+        return True
+
+# app/vectorstore/lexical_index.py
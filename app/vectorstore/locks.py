@@ -0,0 +1,107 @@
+import threading
+from contextlib import contextmanager
+from typing import Iterator
+
+
+class ReadWriteLock:
+    """
+    Many concurrent readers or one writer.
+    - Writers are reentrant and may also take the read side
+    - Readers are reentrant per thread
+    - A waiting writer blocks new readers, so a steady stream
+      of searches cannot starve ingestion
+
+    Used as a context manager it takes the write side, so it can
+    stand in for a plain RLock.
+    """
+
+    def __init__(self):
+        self._cond = threading.Condition(threading.Lock())
+        self._readers = 0
+        self._writer = None
+        self._write_depth = 0
+        self._waiting_writers = 0
+        self._local = threading.local()
+
+    # Write side
+
+    def acquire(self) -> None:
+        me = threading.get_ident()
+
+        with self._cond:
+            if self._writer == me:
+                self._write_depth += 1
+                return
+
+            self._waiting_writers += 1
+            try:
+                while self._writer is not None or self._readers:
+                    self._cond.wait()
+            finally:
+                self._waiting_writers -= 1
+
+            self._writer = me
+            self._write_depth = 1
+
+    def release(self) -> None:
+        with self._cond:
+            if self._writer != threading.get_ident():
+                raise RuntimeError("Write lock released by a thread that does not hold it")
+
+            self._write_depth -= 1
+
+            if not self._write_depth:
+                self._writer = None
+                self._cond.notify_all()
+
+    def __enter__(self) -> "ReadWriteLock":
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.release()
+
+    # Read side
+
+    def acquire_read(self) -> None:
+        depth = getattr(self._local, "depth", 0)
+
+        if depth:
+            self._local.depth = depth + 1
+            return
+
+        # A read under this thread's own write lock needs no slot
+        counted = self._writer != threading.get_ident()
+
+        if counted:
+            with self._cond:
+                while self._writer is not None or self._waiting_writers:
+                    self._cond.wait()
+
+                self._readers += 1
+
+        self._local.depth = 1
+        self._local.counted = counted
+
+    def release_read(self) -> None:
+        depth = self._local.depth - 1
+        self._local.depth = depth
+
+        if depth or not self._local.counted:
+            return
+
+        with self._cond:
+            self._readers -= 1
+
+            if not self._readers:
+                self._cond.notify_all()
+
+    @contextmanager
+    def read(self) -> Iterator[None]:
+        self.acquire_read()
+        try:
+            yield
+        finally:
+            self.release_read()
+
+# app/vectorstore/locks.py
@@ -0,0 +1,561 @@
+import json
+import os
+import shutil
+from contextlib import contextmanager
+from threading import Lock, Thread
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+from langchain_core.documents import Document
+
+
+MANIFEST_FILE = "manifest.json"
+FORMAT_VERSION = 1
+
+
+def page_number(metadata: dict) -> int:
+    # Page of a chunk for filtering; -1 when unknown (e.g. DOCX)
+    try:
+        return int(metadata.get("page", -1))
+    except (TypeError, ValueError):
+        return -1
+
+
+def _fsync_replace(tmp_path: str, path: str) -> None:
+    # Atomically publish a fully written file
+    os.replace(tmp_path, path)
+
+    if hasattr(os, "O_DIRECTORY"):
+        fd = os.open(os.path.dirname(path) or ".", os.O_DIRECTORY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+
+class SegmentStore:
+    """
+    Append-only, segment-based persistence for the vector store.
+
+    Each save writes only the new vectors and documents as an immutable
+    segment; a small manifest listing the live segments is swapped in
+    atomically, so a crash never leaves a half-written index behind.
+    Segments are periodically merged by background compaction.
+
+    A serialized FAISS index snapshot can be published alongside the
+    segments, so trained indexes need not be rebuilt on load; segments
+    written after the snapshot are replayed on top of it.
+
+    Layout:
+        manifest.json
+        index-000002.faiss      optional index snapshot
+        seg-000001.labels.npy   int64 ids
+        seg-000001.vectors.npy  float32 vectors
+        seg-000001.docs.jsonl   one document per line
+        seg-000001.offsets.npy  int64 byte offset of each line
+        seg-000001.pages.npy    int32 page of each document (-1 unknown)
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_segments: int = 16,
+        on_merge: Optional[Callable[[List[str], Tuple[str, np.ndarray, np.ndarray]], None]] = None
+    ):
+        self.path = path
+        self.max_segments = max_segments
+
+        # Called with (merged docs files, document_source of the merged
+        # segment) after a merge is published, before the files are removed
+        self.on_merge = on_merge
+
+        os.makedirs(self.path, exist_ok=True)
+
+        # Guards manifest reads/writes; segment writes happen outside it
+        self._lock = Lock()
+        self._generation = self.read_manifest()["generation"]
+        self._compaction_thread: Optional[Thread] = None
+
+    # Manifest
+
+    @property
+    def manifest_path(self) -> str:
+        return os.path.join(self.path, MANIFEST_FILE)
+
+    def exists(self) -> bool:
+        return os.path.exists(self.manifest_path)
+
+    def read_manifest(self) -> Dict:
+        if not self.exists():
+            return {
+                "format": FORMAT_VERSION,
+                "generation": 0,
+                "segments": [],
+            }
+
+        with open(self.manifest_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def _write_manifest(self, manifest: Dict) -> None:
+        tmp_path = self.manifest_path + ".tmp"
+
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+
+        _fsync_replace(tmp_path, self.manifest_path)
+
+    def _next_segment_name(self) -> str:
+        # Caller holds the lock
+        self._generation += 1
+        return f"seg-{self._generation:06d}"
+
+    # Segment Files
+
+    def _segment_file(self, name: str, kind: str) -> str:
+        extension = "docs.jsonl" if kind == "docs" else f"{kind}.npy"
+        return os.path.join(self.path, f"{name}.{extension}")
+
+    def _write_arrays(self, name: str, **arrays: np.ndarray) -> None:
+        for kind, array in arrays.items():
+            path = self._segment_file(name, kind)
+            with open(path + ".tmp", "wb") as f:
+                np.save(f, array)
+                f.flush()
+                os.fsync(f.fileno())
+            _fsync_replace(path + ".tmp", path)
+
+    def _write_segment(
+        self,
+        name: str,
+        labels: np.ndarray,
+        vectors: np.ndarray,
+        documents: List[Document]
+    ) -> None:
+        # Byte offset of every document line, for lazy random access
+        offsets = np.empty(len(documents), dtype="int64")
+
+        path = self._segment_file(name, "docs")
+        with open(path + ".tmp", "wb") as f:
+            position = 0
+            for i, (label, doc) in enumerate(zip(labels.tolist(), documents)):
+                line = json.dumps({
+                    "id": label,
+                    "page_content": doc.page_content,
+                    "metadata": doc.metadata,
+                }, default=str).encode("utf-8") + b"\n"
+
+                offsets[i] = position
+                position += len(line)
+                f.write(line)
+            f.flush()
+            os.fsync(f.fileno())
+        _fsync_replace(path + ".tmp", path)
+
+        pages = np.asarray([page_number(doc.metadata) for doc in documents], dtype="int32")
+
+        self._write_arrays(name, labels=labels, vectors=vectors, offsets=offsets, pages=pages)
+
+    def _read_vectors(self, name: str) -> Tuple[np.ndarray, np.ndarray]:
+        labels = np.load(self._segment_file(name, "labels"))
+        vectors = np.load(self._segment_file(name, "vectors"))
+        return labels, vectors
+
+    def _remove_segment(self, name: str) -> None:
+        for kind in ("labels", "vectors", "offsets", "pages", "docs"):
+            try:
+                os.remove(self._segment_file(name, kind))
+            except OSError:
+                # Missing, or still mapped by a lazy docstore on Windows
+                pass
+
+    # Public API
+
+    def append(
+        self,
+        labels: np.ndarray,
+        vectors: np.ndarray,
+        documents: List[Document],
+        replace: bool = False,
+        deleted: Optional[np.ndarray] = None,
+        **manifest_fields
+    ) -> Optional[str]:
+        """
+        Persist new entries as one segment and publish it, together
+        with any newly deleted labels (tombstones).
+        With replace=True the new segment supersedes all existing ones.
+        Returns the new segment name, or None if there were no entries.
+        """
+        with self._lock:
+            name = self._next_segment_name()
+            tombstone_name = f"tombstones-{self._generation:06d}.npy"
+
+        if len(labels):
+            self._write_segment(name, labels, vectors, documents)
+
+        # Tombstones are small; each change rewrites the whole set
+        tombstones = None
+        if deleted is not None and len(deleted):
+            tombstones = deleted if replace else np.union1d(self.tombstones(), deleted)
+            path = os.path.join(self.path, tombstone_name)
+            with open(path + ".tmp", "wb") as f:
+                np.save(f, tombstones.astype("int64"))
+                f.flush()
+                os.fsync(f.fileno())
+            _fsync_replace(path + ".tmp", path)
+
+        obsolete_files = []
+
+        with self._lock:
+            manifest = self.read_manifest()
+            obsolete = [seg["name"] for seg in manifest["segments"]] if replace else []
+
+            if replace:
+                manifest["segments"] = []
+
+                # The snapshot described the replaced index
+                if manifest.get("snapshot"):
+                    obsolete_files.append(manifest["snapshot"]["file"])
+                manifest["snapshot"] = None
+
+            if replace or tombstones is not None:
+                if manifest.get("tombstones"):
+                    obsolete_files.append(manifest["tombstones"]["file"])
+                manifest["tombstones"] = None
+
+            if tombstones is not None:
+                manifest["tombstones"] = {"file": tombstone_name, "count": int(len(tombstones))}
+
+            if len(labels):
+                manifest["segments"].append({"name": name, "count": int(len(labels))})
+
+            manifest["generation"] = max(manifest["generation"], self._generation)
+            manifest.update(manifest_fields)
+
+            self._write_manifest(manifest)
+
+        for old in obsolete:
+            self._remove_segment(old)
+
+        for file_name in obsolete_files:
+            self._remove_file(file_name)
+
+        if len(manifest["segments"]) > self.max_segments:
+            self.compact_async()
+
+        return name if len(labels) else None
+
+    def load(self, skip_vectors=()) -> Iterator[Tuple[str, np.ndarray, Optional[np.ndarray]]]:
+        """
+        Yield (name, labels, vectors) for every live segment.
+        Vectors are None for segments named in skip_vectors.
+        Documents are not loaded; see document_sources.
+        """
+        with self._lock:
+            manifest = self.read_manifest()
+
+        for segment in manifest["segments"]:
+            name = segment["name"]
+
+            if name in skip_vectors:
+                yield name, np.load(self._segment_file(name, "labels")), None
+            else:
+                yield (name,) + self._read_vectors(name)
+
+    def document_sources(self) -> List[Tuple[str, np.ndarray, np.ndarray]]:
+        """
+        Return (docs file, labels, line offsets) per live segment,
+        for reading documents lazily instead of loading them.
+        """
+        with self._lock:
+            manifest = self.read_manifest()
+
+        return [self.document_source(seg["name"]) for seg in manifest["segments"]]
+
+    def document_source(self, name: str) -> Tuple[str, np.ndarray, np.ndarray]:
+        labels = np.load(self._segment_file(name, "labels"), mmap_mode="r")
+        offsets_path = self._segment_file(name, "offsets")
+
+        if os.path.exists(offsets_path):
+            offsets = np.load(offsets_path, mmap_mode="r")
+        else:
+            offsets = self._scan_offsets(name)
+
+        return self._segment_file(name, "docs"), labels, offsets
+
+    def segment_pages(self, name: str) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Return (labels, pages) of a segment, for page filters.
+        """
+        labels = np.load(self._segment_file(name, "labels"))
+        pages_path = self._segment_file(name, "pages")
+
+        if os.path.exists(pages_path):
+            return labels, np.load(pages_path)
+
+        # Segments written before pages files existed
+        with open(self._segment_file(name, "docs"), "rb") as f:
+            pages = [page_number(json.loads(line)["metadata"]) for line in f if line.strip()]
+
+        return labels, np.asarray(pages, dtype="int32")
+
+    def page_map(self) -> List[Tuple[np.ndarray, np.ndarray]]:
+        with self._lock:
+            manifest = self.read_manifest()
+
+        return [self.segment_pages(seg["name"]) for seg in manifest["segments"]]
+
+    def _scan_offsets(self, name: str) -> np.ndarray:
+        # Segments written before offsets files existed
+        offsets = []
+        position = 0
+
+        with open(self._segment_file(name, "docs"), "rb") as f:
+            for line in f:
+                offsets.append(position)
+                position += len(line)
+
+        return np.asarray(offsets, dtype="int64")
+
+    def uncovered_count(self) -> int:
+        """
+        Number of persisted vectors not yet included in the index snapshot.
+        """
+        with self._lock:
+            manifest = self.read_manifest()
+
+        covered = set((manifest.get("snapshot") or {}).get("covers", []))
+
+        return sum(seg["count"] for seg in manifest["segments"] if seg["name"] not in covered)
+
+    # Index Snapshot
+
+    def write_snapshot(self, blob: np.ndarray) -> None:
+        """
+        Publish a serialized FAISS index covering every live segment.
+        Callers must not append segments concurrently.
+        """
+        with self._lock:
+            # Another process may have published since this store was opened
+            self._generation = max(self._generation, self.read_manifest()["generation"]) + 1
+            file_name = f"index-{self._generation:06d}.faiss"
+
+        path = os.path.join(self.path, file_name)
+
+        with open(path + ".tmp", "wb") as f:
+            f.write(blob.tobytes())
+            f.flush()
+            os.fsync(f.fileno())
+        _fsync_replace(path + ".tmp", path)
+
+        with self._lock:
+            manifest = self.read_manifest()
+            previous = manifest.get("snapshot")
+
+            # Deletions are applied to the index before it is serialized
+            manifest["snapshot"] = {
+                "file": file_name,
+                "covers": [seg["name"] for seg in manifest["segments"]],
+                "tombstones": (manifest.get("tombstones") or {}).get("count", 0),
+            }
+            manifest["generation"] = max(manifest["generation"], self._generation)
+            self._write_manifest(manifest)
+
+        if previous:
+            self._remove_file(previous["file"])
+
+    def snapshot(self) -> Optional[Tuple[str, List[str], int]]:
+        """
+        Return (path, covered segment names, tombstones applied)
+        of the index snapshot, if any.
+        """
+        with self._lock:
+            snapshot = self.read_manifest().get("snapshot")
+
+        if not snapshot:
+            return None
+
+        return (
+            os.path.join(self.path, snapshot["file"]),
+            snapshot["covers"],
+            snapshot.get("tombstones", 0),
+        )
+
+    def snapshot_current(self) -> bool:
+        """
+        Whether the snapshot covers every live segment and deletion,
+        i.e. it can be memory-mapped as the whole index.
+        """
+        with self._lock:
+            manifest = self.read_manifest()
+
+        snapshot = manifest.get("snapshot")
+
+        if not snapshot:
+            return False
+
+        if any(seg["name"] not in snapshot["covers"] for seg in manifest["segments"]):
+            return False
+
+        return snapshot.get("tombstones", 0) >= (manifest.get("tombstones") or {}).get("count", 0)
+
+    @contextmanager
+    def exclusive(self, name: str) -> Iterator[bool]:
+        """
+        Non-blocking lock on a file in the store directory, shared by all
+        processes using the store; yields False if another one holds it.
+        Without flock (Windows) it is always acquired.
+        """
+        try:
+            import fcntl
+        except ImportError:
+            yield True
+            return
+
+        with open(os.path.join(self.path, name), "a") as f:
+            try:
+                fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                yield False
+                return
+
+            try:
+                yield True
+            finally:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+    # Tombstones
+
+    def tombstones(self) -> np.ndarray:
+        """
+        Sorted labels of deleted entries that may still sit in segments.
+        """
+        with self._lock:
+            tombstones = self.read_manifest().get("tombstones")
+
+        if not tombstones:
+            return np.empty(0, dtype="int64")
+
+        return np.load(os.path.join(self.path, tombstones["file"]))
+
+    def _remove_file(self, file_name: str) -> None:
+        try:
+            os.remove(os.path.join(self.path, file_name))
+        except OSError:
+            pass
+
+    # Compaction
+
+    def compact(self) -> None:
+        """
+        Merge segments, keeping those covered by the index snapshot
+        apart from newer ones so the snapshot stays valid.
+        Appends that land while compaction runs are preserved.
+        """
+        with self._lock:
+            manifest = self.read_manifest()
+
+        covered = set((manifest.get("snapshot") or {}).get("covers", []))
+        names = [seg["name"] for seg in manifest["segments"]]
+
+        for group in (
+            [name for name in names if name in covered],
+            [name for name in names if name not in covered],
+        ):
+            if len(group) > 1:
+                self._merge(group)
+
+    def _merge(self, merged: List[str]) -> None:
+        with self._lock:
+            name = self._next_segment_name()
+
+        all_labels, all_vectors, all_offsets, all_pages = [], [], [], []
+        tombstones = self.tombstones()
+
+        # Documents are copied byte for byte; only their offsets shift.
+        # Deleted entries are dropped for good.
+        path = self._segment_file(name, "docs")
+        with open(path + ".tmp", "wb") as out:
+            for segment_name in merged:
+                labels, vectors = self._read_vectors(segment_name)
+                _, _, offsets = self.document_source(segment_name)
+                offsets = np.asarray(offsets, dtype="int64")
+                keep = ~np.isin(labels, tombstones)
+
+                with open(self._segment_file(segment_name, "docs"), "rb") as f:
+                    if keep.all():
+                        all_offsets.append(offsets + out.tell())
+                        shutil.copyfileobj(f, out)
+                    else:
+                        kept_offsets = []
+                        for offset in offsets[keep].tolist():
+                            f.seek(offset)
+                            kept_offsets.append(out.tell())
+                            out.write(f.readline())
+                        all_offsets.append(np.asarray(kept_offsets, dtype="int64"))
+
+                all_labels.append(labels[keep])
+                all_vectors.append(vectors[keep])
+                all_pages.append(self.segment_pages(segment_name)[1][keep])
+
+            out.flush()
+            os.fsync(out.fileno())
+        _fsync_replace(path + ".tmp", path)
+
+        labels = np.concatenate(all_labels)
+
+        self._write_arrays(
+            name,
+            labels=labels,
+            vectors=np.concatenate(all_vectors),
+            offsets=np.concatenate(all_offsets),
+            pages=np.concatenate(all_pages)
+        )
+
+        with self._lock:
+            manifest = self.read_manifest()
+            live = [seg["name"] for seg in manifest["segments"]]
+
+            # The index was replaced while merging; the merged copy is stale
+            if not set(merged) <= set(live):
+                self._remove_segment(name)
+                return
+
+            # Put the merged segment where the first merged one was
+            position = live.index(merged[0])
+            remaining = [seg for seg in manifest["segments"] if seg["name"] not in merged]
+            remaining.insert(position, {"name": name, "count": int(len(labels))})
+            manifest["segments"] = remaining
+
+            snapshot = manifest.get("snapshot")
+            if snapshot and merged[0] in snapshot["covers"]:
+                snapshot["covers"] = [n for n in snapshot["covers"] if n not in merged] + [name]
+
+            manifest["generation"] = max(manifest["generation"], self._generation)
+            self._write_manifest(manifest)
+
+        if self.on_merge is not None:
+            self.on_merge(
+                [self._segment_file(old, "docs") for old in merged],
+                self.document_source(name)
+            )
+
+        for old in merged:
+            self._remove_segment(old)
+
+    def compact_async(self) -> None:
+        """
+        Run compaction in a background thread, one at a time.
+        """
+        if self._compaction_thread is not None and self._compaction_thread.is_alive():
+            return
+
+        self._compaction_thread = Thread(
+            target=self.compact,
+            name="segment-compaction",
+            daemon=True
+        )
+        self._compaction_thread.start()
+
+# app/vectorstore/persistence.py
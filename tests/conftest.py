@@ -0,0 +1,59 @@
+import zlib
+from threading import Lock
+from typing import List
+
+import numpy as np
+import pytest
+
+from app.vectorstore.embeddings import EmbeddingEngine
+
+
+class WordHashEmbeddings(EmbeddingEngine):
+    """
+    Deterministic embedder for tests: a text's vector is the normalized
+    sum of fixed random vectors of its words. No model download.
+    """
+
+    def __init__(self, dimension: int = 16, buckets: int = 1024):
+        # The model-loading parent constructor is deliberately not called
+        self.model_name = f"test-word-hash-{dimension}"
+        self.batch_size = 64
+        self.normalize = True
+        self.num_workers = 1
+        self.model = None
+
+        self._dimension = dimension
+        self._buckets = buckets
+        self._table = np.random.default_rng(0).standard_normal((buckets, dimension)).astype("float32")
+
+        self._pool = None
+        self._pool_lock = Lock()
+
+        self._stats_lock = Lock()
+        self._total_texts = 0
+        self._total_seconds = 0.0
+        self._last_throughput = 0.0
+
+    @property
+    def dimension(self) -> int:
+        return self._dimension
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        vectors = np.zeros((len(texts), self._dimension), dtype="float32")
+
+        for row, text in enumerate(texts):
+            for word in text.casefold().split():
+                vectors[row] += self._table[zlib.crc32(word.encode("utf-8")) % self._buckets]
+
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.maximum(norms, 1e-12)
+
+    def close(self) -> None:
+        pass
+
+
+@pytest.fixture
+def embeddings():
+    return WordHashEmbeddings()
+
+# tests/conftest.py
@@ -0,0 +1,83 @@
+from unittest import mock
+
+import numpy as np
+from langchain_core.documents import Document
+
+from app.llm.answer_cache import SemanticAnswerCache, context_key
+
+
+Q = np.array([1.0, 0.0, 0.0])
+NEAR = np.array([0.99, 0.1, 0.0])
+FAR = np.array([0.0, 1.0, 0.0])
+
+
+def at(seconds: float):
+    return mock.patch("app.llm.answer_cache.time.monotonic", return_value=seconds)
+
+
+def test_similar_question_same_context_hits():
+    cache = SemanticAnswerCache(max_size=10, ttl_seconds=60, threshold=0.95)
+    cache.put("ctx", Q, 1, {"answer": "42"})
+
+    assert cache.get("ctx", NEAR * 3, 1) == {"answer": "42"}
+    assert cache.get("ctx", FAR, 1) is None
+    assert cache.get("other", Q, 1) is None
+    assert (cache.hits, cache.misses) == (1, 2)
+
+
+def test_returned_value_is_a_copy():
+    cache = SemanticAnswerCache(max_size=10, ttl_seconds=60, threshold=0.95)
+    cache.put("ctx", Q, 1, {"sources": ["a"]})
+
+    cache.get("ctx", Q, 1)["sources"].append("b")
+    assert cache.get("ctx", Q, 1) == {"sources": ["a"]}
+
+
+def test_entries_expire_after_ttl():
+    cache = SemanticAnswerCache(max_size=10, ttl_seconds=30, threshold=0.95)
+
+    with at(100.0):
+        cache.put("ctx", Q, 1, "answer")
+    with at(129.0):
+        assert cache.get("ctx", Q, 1) == "answer"
+    with at(130.0):
+        assert cache.get("ctx", Q, 1) is None
+
+    assert cache.expired == 1
+    assert len(cache) == 0
+
+
+def test_index_version_change_drops_everything():
+    cache = SemanticAnswerCache(max_size=10, ttl_seconds=60, threshold=0.95)
+    cache.put("ctx", Q, 1, "old")
+    cache.put("other", FAR, 1, "old")
+
+    assert cache.get("ctx", Q, 2) is None
+    assert len(cache) == 0
+
+    cache.put("ctx", Q, 2, "new")
+    assert cache.get("ctx", Q, 2) == "new"
+
+
+def test_least_recently_used_is_evicted():
+    cache = SemanticAnswerCache(max_size=2, ttl_seconds=60, threshold=0.95)
+    cache.put("a", Q, 1, "a")
+    cache.put("b", Q, 1, "b")
+
+    cache.get("a", Q, 1)
+    cache.put("c", Q, 1, "c")
+
+    assert cache.get("b", Q, 1) is None
+    assert cache.get("a", Q, 1) == "a"
+    assert cache.evictions == 1
+
+
+def test_context_key_tracks_chunks_and_history():
+    docs = [Document(page_content="text", metadata={"doc_id": "a", "page": 1})]
+    moved = [Document(page_content="text", metadata={"doc_id": "a", "page": 2})]
+
+    assert context_key(docs) == context_key(list(docs))
+    assert context_key(docs) != context_key(moved)
+    assert context_key(docs, "User: hi") != context_key(docs)
+
+# tests/test_answer_cache.py
@@ -0,0 +1,112 @@
+import os
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+import pymupdf
+import pytest
+
+import app.jobs.bulk_ingest as bulk_ingest
+from app.jobs.bulk_ingest import BulkIngestor, BulkManifest
+from app.vectorstore.faiss_store import FAISSVectorStore
+
+
+def write_pdf(path, text: str) -> None:
+    doc = pymupdf.open()
+    doc.new_page().insert_text((72, 72), text)
+    doc.save(str(path))
+    doc.close()
+
+
+@pytest.fixture
+def corpus(tmp_path):
+    directory = tmp_path / "docs"
+    directory.mkdir()
+
+    for name, text in (("a.pdf", "alpha contract"), ("b.pdf", "beta invoice"), ("c.pdf", "gamma report")):
+        write_pdf(directory / name, text)
+
+    return directory
+
+
+def ingest(store, directory, manifest_path):
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        ingestor = BulkIngestor(store, workers=1, batch_size=1, flush_chunks=1, executor=executor)
+        return ingestor.run(str(directory), str(manifest_path))
+
+
+def doc_ids(store) -> list:
+    return sorted(doc["doc_id"] for doc in store.list_documents())
+
+
+def test_interrupted_run_resumes_from_manifest(tmp_path, corpus, embeddings):
+    store = FAISSVectorStore(persist_path=str(tmp_path / "index"), embeddings=embeddings)
+    manifest_path = tmp_path / "manifest.jsonl"
+    index_documents = store.index_documents
+    calls = []
+
+    def fail_on_second(documents):
+        calls.append(documents)
+        if len(calls) == 2:
+            raise RuntimeError("killed")
+        index_documents(documents)
+
+    with mock.patch.object(store, "index_documents", fail_on_second):
+        with pytest.raises(RuntimeError):
+            ingest(store, corpus, manifest_path)
+
+    # Only the file saved before the failure is recorded
+    recorded = [path for path, _, _ in BulkManifest(str(manifest_path))._completed]
+
+    store = FAISSVectorStore(persist_path=str(tmp_path / "index"), embeddings=embeddings)
+    store.load_index()
+    assert len(recorded) == 1
+    assert doc_ids(store) == recorded
+
+    job = ingest(store, corpus, manifest_path)
+
+    assert job.files_skipped == 1
+    assert job.files_completed == 2
+    assert doc_ids(store) == ["a.pdf", "b.pdf", "c.pdf"]
+    assert store.index.index.ntotal == 3
+
+    # A finished directory is skipped entirely
+    job = ingest(store, corpus, manifest_path)
+    assert job.files_skipped == 3
+    assert store.index.index.ntotal == 3
+
+
+def test_copy_is_recorded_with_its_original(tmp_path, corpus, embeddings):
+    shutil.copy(corpus / "a.pdf", corpus / "d.pdf")
+    store = FAISSVectorStore(persist_path=str(tmp_path / "index"), embeddings=embeddings)
+    manifest_path = tmp_path / "manifest.jsonl"
+
+    job = ingest(store, corpus, manifest_path)
+
+    assert job.files_completed == 3
+    assert job.files_skipped == 1
+    assert doc_ids(store) == ["a.pdf", "b.pdf", "c.pdf"]
+    assert len(BulkManifest(str(manifest_path))._completed) == 4
+
+
+def test_copy_of_failed_file_is_ingested(tmp_path, corpus, embeddings):
+    shutil.copy(corpus / "a.pdf", corpus / "d.pdf")
+    store = FAISSVectorStore(persist_path=str(tmp_path / "index"), embeddings=embeddings)
+    parse_document = bulk_ingest.parse_document
+
+    def fail_on_a(file_path, *args):
+        if os.path.basename(file_path) == "a.pdf":
+            raise ValueError("unreadable")
+        return parse_document(file_path, *args)
+
+    with mock.patch.object(bulk_ingest, "parse_document", fail_on_a):
+        job = ingest(store, corpus, tmp_path / "manifest.jsonl")
+
+    assert job.files_failed == 1
+    assert job.files_skipped == 0
+    assert doc_ids(store) == ["b.pdf", "c.pdf", "d.pdf"]
+    assert sorted(path for path, _, _ in BulkManifest(str(tmp_path / "manifest.jsonl"))._completed) == [
+        "b.pdf", "c.pdf", "d.pdf"
+    ]
+
+# tests/test_bulk_ingest.py
@@ -0,0 +1,136 @@
+import asyncio
+
+import pytest
+
+from app.llm.coalescing import SingleFlight
+
+
+def test_concurrent_calls_share_one_execution():
+    flight = SingleFlight()
+    runs = []
+
+    async def work():
+        runs.append(1)
+        await asyncio.sleep(0.01)
+        return "answer"
+
+    async def main():
+        return await asyncio.gather(*(flight.do("q", work) for _ in range(5)))
+
+    assert asyncio.run(main()) == ["answer"] * 5
+    assert len(runs) == 1
+    assert flight.stats()["saved"] == 4
+    assert flight.stats()["in_flight"] == 0
+
+
+def test_completed_calls_are_not_reused():
+    flight = SingleFlight()
+    runs = []
+
+    async def work():
+        runs.append(1)
+        return len(runs)
+
+    async def main():
+        return [await flight.do("q", work), await flight.do("q", work)]
+
+    assert asyncio.run(main()) == [1, 2]
+
+
+def test_errors_reach_every_caller():
+    flight = SingleFlight()
+
+    async def work():
+        await asyncio.sleep(0.01)
+        raise ValueError("failed")
+
+    async def main():
+        return await asyncio.gather(*(flight.do("q", work) for _ in range(3)), return_exceptions=True)
+
+    assert [type(result) for result in asyncio.run(main())] == [ValueError] * 3
+
+
+def test_cancelled_caller_does_not_cancel_the_others():
+    flight = SingleFlight()
+    runs = []
+
+    async def work():
+        runs.append(1)
+        await asyncio.sleep(0.05)
+        return "answer"
+
+    async def main():
+        first = asyncio.ensure_future(flight.do("q", work))
+        second = asyncio.ensure_future(flight.do("q", work))
+        await asyncio.sleep(0.01)
+
+        first.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+
+        return await second
+
+    assert asyncio.run(main()) == "answer"
+    assert len(runs) == 1
+
+
+def test_stream_replays_tokens_to_late_subscribers():
+    flight = SingleFlight()
+    runs = []
+
+    async def generate():
+        runs.append(1)
+        for token in ("a", "b", "c"):
+            await asyncio.sleep(0.01)
+            yield token
+
+    async def consume(delay: float):
+        await asyncio.sleep(delay)
+        return [token async for token in flight.stream("q", generate)]
+
+    async def main():
+        return await asyncio.gather(consume(0), consume(0.015))
+
+    assert asyncio.run(main()) == [["a", "b", "c"], ["a", "b", "c"]]
+    assert len(runs) == 1
+
+
+def test_cancelled_stream_subscriber_leaves_the_stream_running():
+    flight = SingleFlight()
+
+    async def generate():
+        for token in ("a", "b", "c"):
+            await asyncio.sleep(0.01)
+            yield token
+
+    async def consume():
+        return [token async for token in flight.stream("q", generate)]
+
+    async def main():
+        first = asyncio.ensure_future(consume())
+        second = asyncio.ensure_future(consume())
+        await asyncio.sleep(0.015)
+
+        first.cancel()
+        return await second
+
+    assert asyncio.run(main()) == ["a", "b", "c"]
+
+
+def test_stream_error_reaches_subscribers_after_tokens():
+    flight = SingleFlight()
+
+    async def generate():
+        yield "a"
+        raise RuntimeError("model failed")
+
+    async def main():
+        tokens = []
+        with pytest.raises(RuntimeError):
+            async for token in flight.stream("q", generate):
+                tokens.append(token)
+        return tokens
+
+    assert asyncio.run(main()) == ["a"]
+
+# tests/test_coalescing.py
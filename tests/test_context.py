@@ -0,0 +1,83 @@
+from langchain_core.documents import Document
+
+from app.llm.context import NO_CONTEXT, NO_HISTORY, ContextBuilder, count_tokens
+
+
+TEXT = " ".join(f"word{i:03d}" for i in range(200))
+
+
+def doc(text: str, page: int = 1, doc_id: str = "a") -> Document:
+    return Document(page_content=text, metadata={"doc_id": doc_id, "source": f"{doc_id}.pdf", "page": page})
+
+
+def test_duplicates_and_contained_chunks_are_dropped():
+    builder = ContextBuilder(max_tokens=10000, max_overlap=200)
+    context, _, used = builder.build([doc(TEXT[:300]), doc(TEXT[:300]), doc(TEXT[50:150])], [])
+
+    assert context == "[Source 1 - Page 1]\n" + TEXT[:300]
+    assert len(used) == 1
+
+
+def test_overlapping_chunks_are_stitched():
+    builder = ContextBuilder(max_tokens=10000, max_overlap=200)
+
+    # Retrieved out of order, overlapping by 100 characters
+    context, _, used = builder.build([doc(TEXT[200:500]), doc(TEXT[:300])], [])
+
+    assert context == "[Source 1 - Page 1]\n" + TEXT[:500]
+    assert len(used) == 2
+
+
+def test_sections_per_page_in_rank_order():
+    builder = ContextBuilder(max_tokens=10000, max_overlap=200)
+    docs = [doc("first hit", page=3), doc("second hit", page=1), doc("third hit", page=3), doc("other", 3, "b")]
+
+    context, _, _ = builder.build(docs, [])
+
+    assert context == (
+        "[Source 1 - Page 3]\nfirst hit\n...\nthird hit\n\n"
+        "[Source 2 - Page 1]\nsecond hit\n\n"
+        "[Source 3 - Page 3]\nother"
+    )
+
+
+def test_budget_drops_history_before_context():
+    builder = ContextBuilder(max_tokens=200, max_overlap=0)
+    history = [
+        {"role": "user", "content": "old question " * 10},
+        {"role": "assistant", "content": "old answer " * 10},
+        {"role": "user", "content": "recent question"},
+    ]
+
+    context, history_text, _ = builder.build([doc(TEXT[:600])], history, reserved_tokens=20)
+
+    assert context.endswith(TEXT[:600].strip())
+    assert history_text == "User: recent question"
+
+    # A truncated section takes the rest of the budget
+    context, history_text, _ = builder.build([doc(TEXT[:600])], history, reserved_tokens=50)
+    assert history_text == NO_HISTORY
+    assert count_tokens(context) <= 150
+
+
+def test_budget_drops_lowest_ranked_then_truncates():
+    builder = ContextBuilder(max_tokens=150, max_overlap=0)
+    docs = [doc(TEXT[:400], page=1), doc(TEXT[400:800], page=2), doc(TEXT[800:1200], page=3)]
+
+    context, _, used = builder.build(docs, [])
+
+    # The first section fits, the second is cut, the third is dropped
+    assert [d.metadata["page"] for d in used] == [1, 2]
+    assert "[Source 2 - Page 2]\n" + TEXT[400:420] in context
+    assert TEXT[800:1200] not in context
+    assert count_tokens(context) <= 150
+
+
+def test_nothing_fits():
+    context, history_text, used = ContextBuilder(max_tokens=100).build(
+        [doc(TEXT)], [{"role": "user", "content": "hi"}], reserved_tokens=100
+    )
+
+    assert (context, history_text, used) == (NO_CONTEXT, NO_HISTORY, [])
+
+# tests/test_context.py
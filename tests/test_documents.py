@@ -0,0 +1,75 @@
+import numpy as np
+from langchain_core.documents import Document
+
+from app.vectorstore.faiss_store import FAISSVectorStore
+
+
+def chunks(doc_id: str, count: int, version: str = "v1") -> list:
+    return [
+        Document(
+            page_content=f"{doc_id} chunk {i} {version}",
+            metadata={"source": f"{doc_id}.pdf", "doc_id": doc_id, "page": i, "content_hash": version}
+        )
+        for i in range(count)
+    ]
+
+
+def open_store(path, embeddings, **kwargs) -> FAISSVectorStore:
+    store = FAISSVectorStore(persist_path=str(path), embeddings=embeddings, **kwargs)
+    store.load_index()
+    return store
+
+
+def texts(store: FAISSVectorStore) -> list:
+    labels = np.sort(store.index.docstore.labels()).tolist()
+    return [doc.page_content for doc in store.get_documents(labels)]
+
+
+def test_replace_swaps_chunks_and_hash(tmp_path, embeddings):
+    store = FAISSVectorStore(persist_path=str(tmp_path), embeddings=embeddings)
+    store.index_documents(chunks("a", 3) + chunks("b", 2))
+
+    assert store.find_document_by_hash("v1") in ("a", "b")
+    assert store.replace_document("a", chunks("a", 2, "v2")) == 3
+
+    assert store.index.index.ntotal == 4
+    assert store.find_document_by_hash("v2") == "a"
+    assert sorted(texts(store)) == ["a chunk 0 v2", "a chunk 1 v2", "b chunk 0 v1", "b chunk 1 v1"]
+
+
+def test_tombstones_replayed_over_snapshot(tmp_path, embeddings):
+    store = FAISSVectorStore(persist_path=str(tmp_path), embeddings=embeddings, mmap=True)
+    store.index_documents(chunks("a", 3) + chunks("b", 3))
+    store.save_index()
+
+    # The snapshot covers both documents; the delete is saved only as a tombstone
+    store.delete_document("a")
+    store.save_index()
+
+    for mmap in (False, True):
+        reloaded = open_store(tmp_path, embeddings, mmap=mmap)
+        assert reloaded.index.index.ntotal == 3
+        assert texts(reloaded) == [f"b chunk {i} v1" for i in range(3)]
+        assert [doc["doc_id"] for doc in reloaded.list_documents()] == ["b"]
+
+
+def test_compaction_replays_into_one_segment(tmp_path, embeddings):
+    store = FAISSVectorStore(persist_path=str(tmp_path), embeddings=embeddings, max_segments=100)
+
+    for doc_id in ("a", "b", "c"):
+        store.index_documents(chunks(doc_id, 2))
+        store.save_index()
+
+    store.replace_document("b", chunks("b", 1, "v2"))
+    store.save_index()
+    store.segments.compact()
+
+    reloaded = open_store(tmp_path, embeddings, max_segments=100)
+    (_, labels, _), = reloaded.segments.load()
+    assert labels.tolist() == [0, 1, 4, 5, 6]
+    assert texts(reloaded) == ["a chunk 0 v1", "a chunk 1 v1", "c chunk 0 v1", "c chunk 1 v1", "b chunk 0 v2"]
+
+    hits = reloaded.similarity_search_by_vector(embeddings.embed(["b chunk 0 v2"])[0], k=1)
+    assert hits[0][0].page_content == "b chunk 0 v2"
+
+# tests/test_documents.py
@@ -0,0 +1,97 @@
+import json
+import math
+
+import pytest
+from langchain_core.documents import Document
+
+from app.evaluation.evaluator import LabelledQuestion, RetrievalEvaluator, load_dataset, ranking_metrics
+
+
+def doc(doc_id: str, page: int, text: str = "") -> Document:
+    return Document(page_content=text, metadata={"doc_id": doc_id, "source": f"/uploads/{doc_id}.pdf", "page": page})
+
+
+class FixedRetriever:
+    """
+    Returns a canned ranking per question.
+    """
+
+    top_k = 3
+
+    def __init__(self, rankings: dict):
+        self.rankings = rankings
+
+    def retrieve_with_scores(self, question: str) -> list:
+        return [(d, 0.0) for d in self.rankings[question]]
+
+
+def test_ranking_metrics():
+    docs = [doc("a", 1), doc("b", 2), doc("c", 3, "Termination clause")]
+    relevant = [{"source": "b.pdf", "page": 2}, {"text": "termination"}, {"source": "z"}]
+
+    metrics = ranking_metrics(docs, relevant, k=3)
+
+    assert metrics["recall"] == pytest.approx(2 / 3)
+    assert metrics["hit"] == 1.0
+    assert metrics["reciprocal_rank"] == 0.5
+    dcg = 1 / math.log2(3) + 1 / math.log2(4)
+    idcg = 1 + 1 / math.log2(3) + 1 / math.log2(4)
+    assert metrics["ndcg"] == pytest.approx(dcg / idcg)
+
+
+def test_chunk_counts_once_and_k_cuts_ranking():
+    docs = [doc("a", 1), doc("a", 1), doc("b", 1)]
+    relevant = [{"source": "a"}, {"source": "b"}]
+
+    # The repeated chunk matches the first item only once
+    assert ranking_metrics(docs, relevant, k=3)["recall"] == 1.0
+    assert ranking_metrics(docs, relevant, k=2)["recall"] == 0.5
+    assert ranking_metrics([], relevant, k=3) == {"recall": 0.0, "hit": 0.0, "reciprocal_rank": 0.0, "ndcg": 0.0}
+
+
+def test_evaluate_labelled_averages_over_questions():
+    retriever = FixedRetriever({
+        "first": [doc("a", 1), doc("b", 1)],
+        "second": [doc("c", 1), doc("d", 1), doc("a", 1)],
+        "third": [],
+    })
+    dataset = [
+        LabelledQuestion("first", [{"source": "a"}]),
+        LabelledQuestion("second", [{"source": "a"}, {"source": "x"}]),
+        LabelledQuestion("third", [{"source": "a"}]),
+    ]
+
+    report = RetrievalEvaluator(retriever).evaluate_labelled(dataset, workers=2)
+
+    assert report["total_questions"] == 3
+    assert report["k"] == 3
+    assert report["recall"] == round((1 + 0.5 + 0) / 3, 4)
+    assert report["hit_rate"] == round(2 / 3, 4)
+    assert report["mrr"] == round((1 + 1 / 3 + 0) / 3, 4)
+    assert report["empty_retrieval_rate"] == round(1 / 3, 3)
+    assert report["p50_ms"] >= 0.0
+
+    # A smaller k drops the third-ranked hit of "second"
+    report = RetrievalEvaluator(retriever).evaluate_labelled(dataset, k=2)
+    assert report["recall"] == round(1 / 3, 4)
+
+
+def test_evaluate_labelled_needs_questions():
+    with pytest.raises(ValueError):
+        RetrievalEvaluator(FixedRetriever({})).evaluate_labelled([])
+
+
+def test_load_dataset_jsonl_and_json(tmp_path):
+    records = [{"question": "q1", "relevant": [{"source": "a", "page": 2}]}]
+
+    jsonl = tmp_path / "questions.jsonl"
+    jsonl.write_text("\n".join(json.dumps(record) for record in records) + "\n\n", encoding="utf-8")
+    listed = tmp_path / "questions.json"
+    listed.write_text(json.dumps(records), encoding="utf-8")
+
+    for path in (jsonl, listed):
+        question, = load_dataset(str(path))
+        assert question.question == "q1"
+        assert question.relevant == [{"source": "a", "page": 2}]
+
+# tests/test_evaluator.py
@@ -0,0 +1,81 @@
+from unittest import mock
+
+import numpy as np
+import pytest
+from langchain_core.documents import Document
+
+from app.vectorstore.faiss_store import FAISSVectorStore
+from app.vectorstore.index_factory import IndexConfig
+
+
+def chunks(doc_id: str, pages: int, tags: list) -> list:
+    return [
+        Document(
+            page_content=f"shared text {doc_id} page {page}",
+            metadata={"source": f"/uploads/{doc_id}.pdf", "doc_id": doc_id, "page": page, "tags": tags}
+        )
+        for page in range(pages)
+    ]
+
+
+def build(tmp_path, embeddings, index_type: str = "flat") -> FAISSVectorStore:
+    store = FAISSVectorStore(
+        persist_path=str(tmp_path),
+        embeddings=embeddings,
+        index_config=IndexConfig(index_type=index_type)
+    )
+
+    # Labels: a -> 0..3, b -> 4..6, c -> 7..8
+    for doc_id, pages, tags, uploaded in (("a", 4, ["nda"], 100.0), ("b", 3, ["msa"], 200.0), ("c", 2, ["nda", "msa"], 300.0)):
+        with mock.patch("app.vectorstore.faiss_store.time.time", return_value=uploaded):
+            store.index_documents(chunks(doc_id, pages, tags))
+
+    return store
+
+
+def test_no_filter_selects_nothing(tmp_path, embeddings):
+    assert build(tmp_path, embeddings).select_labels() is None
+
+
+@pytest.mark.parametrize("filters, expected", [
+    ({"sources": ["b"]}, [4, 5, 6]),
+    ({"sources": ["c.pdf"]}, [7, 8]),
+    ({"tags": ["nda"]}, [0, 1, 2, 3, 7, 8]),
+    ({"tags": ["msa"], "sources": ["a", "b"]}, [4, 5, 6]),
+    ({"page_min": 1, "page_max": 2}, [1, 2, 5, 6, 8]),
+    ({"sources": ["a"], "page_min": 3}, [3]),
+    ({"uploaded_after": 150.0}, [4, 5, 6, 7, 8]),
+    ({"uploaded_before": 150.0, "tags": ["msa"]}, []),
+])
+def test_select_labels(tmp_path, embeddings, filters, expected):
+    assert build(tmp_path, embeddings).select_labels(**filters).tolist() == expected
+
+
+@pytest.mark.parametrize("index_type", ["flat", "hnsw"])
+def test_search_stays_inside_selection(tmp_path, embeddings, index_type):
+    store = build(tmp_path, embeddings, index_type)
+    query = embeddings.embed(["shared text a page 0"])
+
+    # A contiguous run and a scattered id set
+    for filters in ({"sources": ["b"]}, {"page_min": 1, "page_max": 1}):
+        labels = store.select_labels(**filters)
+        hits, = store.search_by_vectors(query, k=5, labels=labels)
+        selected = {(doc.metadata["doc_id"], doc.metadata["page"]) for doc in store.get_documents(labels.tolist())}
+
+        assert hits
+        assert {(doc.metadata["doc_id"], doc.metadata["page"]) for doc, _ in hits} <= selected
+
+    hits, = store.search_by_vectors(query, k=5, labels=np.array([], dtype="int64"))
+    assert hits == []
+
+
+def test_selection_survives_reload(tmp_path, embeddings):
+    store = build(tmp_path, embeddings)
+    store.save_index()
+
+    reloaded = FAISSVectorStore(persist_path=str(tmp_path), embeddings=embeddings)
+    reloaded.load_index()
+
+    assert reloaded.select_labels(tags=["msa"], page_min=1).tolist() == [5, 6, 8]
+
+# tests/test_filters.py
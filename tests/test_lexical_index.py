@@ -0,0 +1,107 @@
+import math
+
+import numpy as np
+import pytest
+
+from app.retrieval.retriever import reciprocal_rank_fusion
+from app.vectorstore.lexical_index import BM25Index
+
+
+TEXTS = [
+    "clause 4.2 termination for convenience",
+    "the supplier shall deliver the goods",
+    "clause 7 limitation of liability",
+    "termination fee payable by the buyer",
+    "governing law and jurisdiction",
+    "the buyer shall pay within thirty days",
+    "clause 4.2 applies to the supplier",
+    "notices must be in writing",
+]
+
+
+def build(texts, block_size: int) -> BM25Index:
+    index = BM25Index()
+
+    for start in range(0, len(texts), block_size):
+        labels = np.arange(start, min(start + block_size, len(texts)))
+        index.add(labels, texts[start:start + block_size])
+
+    return index
+
+
+def as_dict(hits) -> dict:
+    return {label: pytest.approx(score) for label, score in hits}
+
+
+def test_score_matches_bm25_formula():
+    index = build(TEXTS, len(TEXTS))
+    (label, score), = index.search("notices", k=5)
+
+    n, df, tf = len(TEXTS), 1, 1
+    avgdl = sum(len(text.split()) for text in TEXTS) / n
+    norm = index.k1 * (1 - index.b + index.b * 5 / avgdl)
+    expected = math.log(1 + (n - df + 0.5) / (df + 0.5)) * tf * (index.k1 + 1) / (tf + norm)
+
+    assert label == 7
+    assert score == pytest.approx(expected)
+
+
+def test_merged_blocks_score_like_one_block():
+    whole = build(TEXTS, len(TEXTS))
+    merged = build(TEXTS, 1)
+
+    assert merged.stats()["blocks"] < len(TEXTS)
+
+    for query in ("clause 4.2", "termination buyer", "the supplier shall"):
+        assert as_dict(merged.search(query, k=10)) == as_dict(whole.search(query, k=10))
+
+
+def test_deleted_chunks_leave_results_and_merges():
+    index = build(TEXTS, 1)
+    index.delete(np.array([0, 6]))
+
+    assert 0 not in dict(index.search("clause 4.2", k=10))
+    assert 6 not in dict(index.search("clause 4.2", k=10))
+    assert len(index) == len(TEXTS) - 2
+
+    # Later merges drop the deleted postings
+    index.add(np.arange(8, 16), TEXTS)
+    assert sorted(dict(index.search("clause 4.2", k=10))) == [2, 8, 10, 14]
+    assert index.stats()["postings"] < build(TEXTS * 2, 1).stats()["postings"]
+
+
+def test_allowed_labels_restrict_search():
+    index = build(TEXTS, 3)
+
+    assert [label for label, _ in index.search("clause", k=10, allowed=np.array([2, 5]))] == [2]
+    assert index.search("clause", k=10, allowed=np.array([], dtype="int64")) == []
+
+
+def test_save_and_load_with_tombstones(tmp_path):
+    index = build(TEXTS[:4], 2)
+    index.path = str(tmp_path)
+    index.save()
+
+    index.add(np.arange(4, 8), TEXTS[4:])
+    index.save()
+
+    loaded = BM25Index(path=str(tmp_path))
+    assert loaded.load(tombstones=np.array([3]))
+    assert loaded.next_label == 8
+
+    expected = build(TEXTS, 2)
+    expected.delete(np.array([3]))
+
+    for query in ("termination", "the buyer shall", "writing"):
+        assert as_dict(loaded.search(query, k=10)) == as_dict(expected.search(query, k=10))
+
+
+def test_reciprocal_rank_fusion():
+    fused = reciprocal_rank_fusion([[1, 2, 3], [3, 1, 4]], k=60)
+
+    assert [item for item, _ in fused] == [1, 3, 2, 4]
+    assert dict(fused)[1] == pytest.approx(1 / 61 + 1 / 62)
+    assert dict(fused)[4] == pytest.approx(1 / 63)
+    assert reciprocal_rank_fusion([]) == []
+
+# tests/test_lexical_index.py
@@ -0,0 +1,175 @@
+import json
+import os
+
+import faiss
+import numpy as np
+from langchain_core.documents import Document
+
+from app.vectorstore.faiss_store import FAISSVectorStore
+from app.vectorstore.persistence import SegmentStore
+
+
+DIMENSION = 16
+
+
+def chunks(doc_id: str, count: int, content_hash: str = "v1") -> list:
+    return [
+        Document(
+            page_content=f"{doc_id} chunk {i} {content_hash}",
+            metadata={"source": doc_id, "doc_id": doc_id, "page": i, "content_hash": content_hash}
+        )
+        for i in range(count)
+    ]
+
+
+def vectors(count: int) -> np.ndarray:
+    return np.random.default_rng(count).standard_normal((count, DIMENSION)).astype("float32")
+
+
+def open_store(path, embeddings, **kwargs) -> FAISSVectorStore:
+    store = FAISSVectorStore(persist_path=str(path), embeddings=embeddings, **kwargs)
+    store.load_index()
+    return store
+
+
+def texts(store: FAISSVectorStore) -> list:
+    labels = np.sort(store.index.docstore.labels()).tolist()
+    return [doc.page_content for doc in store.get_documents(labels)]
+
+
+def faiss_labels(store: FAISSVectorStore) -> list:
+    return faiss.vector_to_array(store.index.index.id_map).tolist()
+
+
+# SegmentStore
+
+def test_segments_survive_delete_and_compaction(tmp_path):
+    segments = SegmentStore(str(tmp_path), max_segments=100)
+
+    segments.append(np.arange(0, 3), vectors(3), chunks("a", 3))
+    segments.append(np.arange(3, 5), vectors(2), chunks("b", 2), deleted=np.array([1]))
+    segments.append(np.empty(0, dtype="int64"), np.empty((0, DIMENSION), "float32"), [], deleted=np.array([3]))
+
+    reopened = SegmentStore(str(tmp_path))
+    assert reopened.tombstones().tolist() == [1, 3]
+    assert [labels.tolist() for _, labels, _ in reopened.load()] == [[0, 1, 2], [3, 4]]
+
+    reopened.compact()
+
+    reopened = SegmentStore(str(tmp_path))
+    (name, labels, merged), = reopened.load()
+    assert labels.tolist() == [0, 2, 4]
+    assert merged.shape == (3, DIMENSION)
+
+    path, _, offsets = reopened.document_source(name)
+    with open(path, "rb") as f:
+        data = f.read()
+    lines = [data[offset:data.index(b"\n", offset)] for offset in offsets.tolist()]
+    assert [json.loads(line)["page_content"] for line in lines] == ["a chunk 0 v1", "a chunk 2 v1", "b chunk 1 v1"]
+
+    # Compaction removes the merged segments' files
+    assert sorted(f for f in os.listdir(tmp_path) if f.endswith(".docs.jsonl")) == [f"{name}.docs.jsonl"]
+
+
+def test_interrupted_manifest_write_keeps_last_manifest(tmp_path):
+    segments = SegmentStore(str(tmp_path))
+    segments.append(np.arange(0, 2), vectors(2), chunks("a", 2))
+
+    # A crash between writing the temp manifest and swapping it in
+    with open(segments.manifest_path + ".tmp", "w", encoding="utf-8") as f:
+        f.write('{"format": 1, "generation": 9, "segm')
+
+    reopened = SegmentStore(str(tmp_path))
+    assert [labels.tolist() for _, labels, _ in reopened.load()] == [[0, 1]]
+
+    reopened.append(np.arange(2, 3), vectors(1), chunks("b", 1))
+
+    assert not os.path.exists(segments.manifest_path + ".tmp")
+    assert [labels.tolist() for _, labels, _ in SegmentStore(str(tmp_path)).load()] == [[0, 1], [2]]
+
+
+# FAISSVectorStore
+
+def test_save_reload_delete_compact_reload(tmp_path, embeddings):
+    store = FAISSVectorStore(persist_path=str(tmp_path), embeddings=embeddings, max_segments=100)
+
+    for doc_id in ("a", "b", "c"):
+        store.index_documents(chunks(doc_id, 4))
+        store.save_index()
+
+    store = open_store(tmp_path, embeddings, max_segments=100)
+    assert store.index.index.ntotal == 12
+    assert sorted(doc["doc_id"] for doc in store.list_documents()) == ["a", "b", "c"]
+
+    assert store.delete_document("b") == 4
+    store.save_index()
+
+    store = open_store(tmp_path, embeddings, max_segments=100)
+    assert store.segments.tombstones().tolist() == [4, 5, 6, 7]
+    assert len(store.index.docstore) == 8
+
+    store.segments.compact()
+    assert len(store.index.docstore) == 8
+    assert not any("b chunk" in text for text in texts(store))
+
+    store = open_store(tmp_path, embeddings, max_segments=100)
+    assert store.index.index.ntotal == 8
+    assert sorted(faiss_labels(store)) == [0, 1, 2, 3, 8, 9, 10, 11]
+    assert texts(store) == [f"a chunk {i} v1" for i in range(4)] + [f"c chunk {i} v1" for i in range(4)]
+    assert sorted(doc["doc_id"] for doc in store.list_documents()) == ["a", "c"]
+
+    hits = store.similarity_search_by_vector(embeddings.embed(["c chunk 2 v1"])[0], k=1)
+    assert hits[0][0].page_content == "c chunk 2 v1"
+
+
+def test_unfinished_document_is_dropped_on_reload(tmp_path, embeddings):
+    store = FAISSVectorStore(persist_path=str(tmp_path), embeddings=embeddings)
+
+    store.begin_document("a", "v1")
+    store.index_documents(chunks("a", 3, "v1"))
+    store.save_index()
+    store.commit_document("a")
+    store.save_index()
+
+    # A new version, flushed but never committed
+    store.begin_document("a", "v2")
+    store.index_documents(chunks("a", 2, "v2"))
+    store.save_index()
+    assert store.find_document_by_hash("v2") is None
+
+    store = open_store(tmp_path, embeddings)
+    assert store.find_document_by_hash("v1") == "a"
+    assert store.document_ranges("a") == [[0, 3]]
+    assert texts(store) == [f"a chunk {i} v1" for i in range(3)]
+
+
+def test_lexical_index_follows_deletes(tmp_path, embeddings):
+    store = FAISSVectorStore(persist_path=str(tmp_path), embeddings=embeddings, lexical_index=True)
+    store.index_documents(chunks("alpha", 2) + chunks("beta", 2))
+    store.save_index()
+
+    store = open_store(tmp_path, embeddings, lexical_index=True)
+    store.delete_document("beta")
+    store.save_index()
+
+    store = open_store(tmp_path, embeddings, lexical_index=True)
+    assert [label for label, _ in store.lexical_search("beta", k=10)] == []
+    assert sorted(label for label, _ in store.lexical_search("alpha", k=10)) == [0, 1]
+
+
+def test_mmap_load_publishes_snapshot(tmp_path, embeddings):
+    store = FAISSVectorStore(persist_path=str(tmp_path), embeddings=embeddings)
+    store.index_documents(chunks("a", 3))
+    store.save_index()
+    assert store.segments.snapshot() is None
+
+    # The first mmap load replays the segments and writes the snapshot for the next
+    store = open_store(tmp_path, embeddings, mmap=True)
+    assert not store.index_info()["memory_mapped"]
+    assert store.segments.snapshot_current()
+
+    store = open_store(tmp_path, embeddings, mmap=True)
+    assert store.index_info()["memory_mapped"]
+    assert texts(store) == [f"a chunk {i} v1" for i in range(3)]
+
+# tests/test_persistence.py
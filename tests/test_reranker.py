@@ -0,0 +1,110 @@
+import sys
+import types
+from unittest import mock
+
+import pytest
+from langchain_core.documents import Document
+
+from app.retrieval.reranker import CrossEncoderReranker
+
+
+class Clock:
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class FakeCrossEncoder:
+    """
+    Scores a pair by the number in its text; every predict call
+    advances the clock by batch_seconds.
+    """
+
+    clock = None
+    batch_seconds = 0.0
+
+    def __init__(self, model_name, max_length=512):
+        self.batches = []
+
+    def predict(self, pairs, batch_size=32, show_progress_bar=False):
+        self.batches.append(len(pairs))
+        FakeCrossEncoder.clock.now += FakeCrossEncoder.batch_seconds
+        return [float(text.split()[-1]) for _, text in pairs]
+
+
+@pytest.fixture
+def clock():
+    clock = Clock()
+    FakeCrossEncoder.clock = clock
+    module = types.SimpleNamespace(CrossEncoder=FakeCrossEncoder)
+
+    with mock.patch.dict(sys.modules, {"sentence_transformers": module}), \
+            mock.patch("app.retrieval.reranker.time.perf_counter", clock):
+        yield clock
+
+
+def candidates(scores: list) -> list:
+    # Vector order is list order; the cross-encoder score is the trailing number
+    return [(Document(page_content=f"chunk {i} {score}"), float(i)) for i, score in enumerate(scores)]
+
+
+def texts(results: list) -> list:
+    return [doc.page_content for doc, _ in results]
+
+
+def test_reorders_by_cross_encoder_score(clock):
+    FakeCrossEncoder.batch_seconds = 0.001
+    reranker = CrossEncoderReranker(model_name="fake", batch_size=2, budget_ms=1000)
+
+    results = reranker.rerank("query", candidates([0.1, 0.9, 0.5, 0.7]), top_n=3)
+
+    assert texts(results) == ["chunk 1 0.9", "chunk 3 0.7", "chunk 2 0.5"]
+    assert reranker.stats()["over_budget"] == 0
+
+
+def test_budget_keeps_vector_order_for_unscored(clock):
+    # Each batch takes 40ms of a 100ms budget: the third is not started
+    FakeCrossEncoder.batch_seconds = 0.04
+    reranker = CrossEncoderReranker(model_name="fake", batch_size=2, budget_ms=100)
+
+    results = reranker.rerank("query", candidates([0.1, 0.9, 0.5, 0.7, 0.95, 0.99]), top_n=6)
+
+    assert reranker.model.batches == [2, 2]
+    assert texts(results) == [
+        "chunk 1 0.9", "chunk 3 0.7", "chunk 2 0.5", "chunk 0 0.1",
+        "chunk 4 0.95", "chunk 5 0.99",
+    ]
+    assert reranker.stats()["over_budget"] == 1
+    assert reranker.stats()["pairs_scored"] == 4
+
+
+def test_spent_budget_scores_only_the_first_batch(clock):
+    FakeCrossEncoder.batch_seconds = 0.01
+    reranker = CrossEncoderReranker(model_name="fake", batch_size=2, budget_ms=1000)
+
+    results = reranker.rerank("query", candidates([0.1, 0.9, 0.5, 0.7]), top_n=3, budget_ms=0)
+
+    assert reranker.model.batches == [2]
+    assert texts(results) == ["chunk 1 0.9", "chunk 0 0.1", "chunk 2 0.5"]
+
+
+def test_batch_budget_covers_every_query_best_hits(clock):
+    FakeCrossEncoder.batch_seconds = 0.06
+    reranker = CrossEncoderReranker(model_name="fake", batch_size=2, budget_ms=100)
+
+    first, second = reranker.rerank_batch(
+        ["q1", "q2"],
+        [candidates([0.2, 0.8, 0.9]), candidates([0.6, 0.4, 0.1])],
+        top_n=3
+    )
+
+    # One batch fits: the top candidate of both queries is scored
+    assert reranker.model.batches == [2]
+    assert texts(first) == ["chunk 0 0.2", "chunk 1 0.8", "chunk 2 0.9"]
+    assert texts(second) == ["chunk 0 0.6", "chunk 1 0.4", "chunk 2 0.1"]
+    assert reranker.stats()["pairs_scored"] == 2
+
+# tests/test_reranker.py
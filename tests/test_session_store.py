@@ -0,0 +1,80 @@
+from threading import Thread
+from unittest import mock
+
+from app.memory.session_store import SessionStore
+
+
+def test_least_recently_used_session_is_evicted():
+    store = SessionStore(max_sessions=2, ttl_seconds=60, max_history=4)
+
+    a = store.get_or_create("a")
+    store.get_or_create("b")
+
+    # Touching "a" makes "b" the least recently used
+    assert store.get_or_create("a") is a
+    store.get_or_create("c")
+
+    assert "a" in store and "c" in store
+    assert "b" not in store
+    assert store.metrics()["evicted_lru"] == 1
+
+
+def test_idle_sessions_expire():
+    store = SessionStore(max_sessions=10, ttl_seconds=30, max_history=4)
+
+    with mock.patch("app.memory.session_store.time.monotonic", return_value=100.0):
+        store.get_or_create("old")
+    with mock.patch("app.memory.session_store.time.monotonic", return_value=120.0):
+        store.get_or_create("recent")
+
+    with mock.patch("app.memory.session_store.time.monotonic", return_value=140.0):
+        assert store.evict_expired() == 1
+
+    assert "old" not in store
+    assert "recent" in store
+    assert store.metrics()["evicted_ttl"] == 1
+
+
+def test_access_refreshes_expiry():
+    store = SessionStore(max_sessions=10, ttl_seconds=30, max_history=4)
+
+    with mock.patch("app.memory.session_store.time.monotonic", return_value=100.0):
+        store.get_or_create("a")
+    with mock.patch("app.memory.session_store.time.monotonic", return_value=125.0):
+        assert store.get("a") is not None
+    with mock.patch("app.memory.session_store.time.monotonic", return_value=140.0):
+        assert store.evict_expired() == 0
+
+    assert "a" in store
+
+
+def test_history_is_a_ring_buffer():
+    store = SessionStore(max_sessions=10, ttl_seconds=60, max_history=3)
+    memory = store.get_or_create("a")
+
+    for i in range(5):
+        memory.add_user_message(f"message {i}")
+
+    assert [msg["content"] for msg in memory.get_history()] == ["message 2", "message 3", "message 4"]
+
+
+def test_metrics_while_history_grows():
+    store = SessionStore(max_sessions=10, ttl_seconds=60, max_history=1000)
+    memory = store.get_or_create("a")
+    done = False
+
+    def append():
+        while not done:
+            memory.add_user_message("x" * 10)
+
+    writer = Thread(target=append)
+    writer.start()
+
+    try:
+        for _ in range(200):
+            assert store.metrics()["approx_bytes"] > 0
+    finally:
+        done = True
+        writer.join()
+
+# tests/test_session_store.py
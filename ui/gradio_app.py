@@ -1,6 +1,7 @@
 
 import requests
 import gradio as gr
+import time
 import uuid
 
 print("GRADIO FILE LOADED")
@@ -32,9 +33,34 @@ def upload_document(file):
     if response.status_code != 200:
         return f"Error: {response.text}"
 
-    data = response.json()
+    job_id = response.json()["job_id"]
+
+    # Poll the ingestion job until it finishes
+    while True:
+        response = requests.get(
+            f"{API_BASE}/jobs/{job_id}",
+            headers=HEADERS
+        )
+
+        if response.status_code != 200:
+            return f"Error: {response.text}"
+
+        job = response.json()
+
+        if job["status"] == "completed":
+            return (
+                "Document processed successfully.\n"
+                f"Pages: {job['pages_parsed']}\n"
+                f"Total Chunks: {job['total_chunks']}"
+            )
+
+        if job["status"] == "skipped":
+            return "Document already indexed; nothing to do."
+
+        if job["status"] == "failed":
+            return f"Error: {job['error']}"
 
-    return f"{data['message']}\nTotal Chunks: {data['total_chunks']}"
+        time.sleep(1)
 
 
 # Ask